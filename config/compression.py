@@ -0,0 +1,132 @@
+import gzip
+import hashlib
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def config():
+    return getattr(settings, 'COMPRESSION', {})
+
+
+def level(name, default):
+    return config().get('LEVELS', {}).get(name, default)
+
+
+class Gzip:
+    name = 'gzip'
+
+    def compress(self, data):
+        # mtime=0 keeps the output identical for identical bodies.
+        return gzip.compress(data, compresslevel=level(self.name, 6), mtime=0)
+
+    def stream(self, chunks):
+        compressor = zlib.compressobj(level(self.name, 6), zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class Brotli:
+    name = 'br'
+
+    def compress(self, data):
+        return brotli.compress(data, quality=level(self.name, 5))
+
+    def stream(self, chunks):
+        compressor = brotli.Compressor(quality=level(self.name, 5))
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class Zstd:
+    name = 'zstd'
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=level(self.name, 3)).compress(data)
+
+    def stream(self, chunks):
+        compressor = zstandard.ZstdCompressor(level=level(self.name, 3)).compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+CODECS = {codec.name: codec for codec, module in ((Brotli(), brotli), (Zstd(), zstandard), (Gzip(), gzip))
+          if module is not None}
+
+
+def accepted_encodings(header):
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        name, _, value = params.strip().partition('=')
+        if name.strip() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+def negotiate(header):
+    # The client's q-values decide; ties go to the configured order.
+    accepted = accepted_encodings(header)
+    best, best_quality = None, 0.0
+    for name in config().get('ENCODINGS', ('br', 'zstd', 'gzip')):
+        if name not in CODECS:
+            continue
+        quality = accepted.get(name, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = CODECS[name], quality
+    return best
+
+
+def compressible(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return content_type.startswith(tuple(config().get('CONTENT_TYPES', ('application/json', 'text/'))))
+
+
+def get_cache():
+    return caches[config().get('CACHE_ALIAS', 'default')]
+
+
+def variant_key(request, response, codec):
+    # Cached responses carry their response cache key; the rendered body also
+    # depends on the negotiated media type.
+    parts = [response.cache_key, codec.name, response.get('Content-Type'), request.META.get('HTTP_ACCEPT')]
+    return 'compressed:%s' % hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def compress(request, response, codec):
+    if getattr(response, 'cache_key', None) is None:
+        return codec.compress(response.content)
+
+    cache = get_cache()
+    key = variant_key(request, response, codec)
+    compressed = cache.get(key)
+    if compressed is None:
+        compressed = codec.compress(response.content)
+        cache.set(key, compressed, config().get('CACHE_TIMEOUT', 300))
+    return compressed
@@ -0,0 +1,104 @@
+import hashlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.dispatch import receiver
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_replica = ContextVar('database_replica', default=None)
+
+
+def config():
+    return getattr(settings, 'DATABASE_ROUTING', {})
+
+
+def replicas():
+    return [alias for alias in config().get('REPLICAS', ()) if alias in settings.DATABASES]
+
+
+def current():
+    return _replica.get()
+
+
+class ReplicaRouter:
+    # Reads go to the replica picked for the current request, if any; writes,
+    # migrations and reads outside routed requests always use the primary.
+
+    def db_for_read(self, model, **hints):
+        alias = _replica.get()
+        if alias is not None and model._meta.app_label in config().get('APPS', ()):
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replicas():
+            return False
+        return None
+
+
+def client_key(request):
+    identity = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not identity:
+        return None
+    return 'db-pin:%s' % hashlib.sha1(identity.encode()).hexdigest()
+
+
+def pinned(request):
+    key = client_key(request)
+    return key is not None and caches[config().get('CACHE_ALIAS', 'default')].get(key) is not None
+
+
+def pin(request):
+    key = client_key(request)
+    if key is not None and config().get('STICKY_SECONDS'):
+        caches[config().get('CACHE_ALIAS', 'default')].set(key, 1, config()['STICKY_SECONDS'])
+
+
+def view_class(view_func):
+    return getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+
+
+def view_module(view_func):
+    return (view_class(view_func) or view_func).__module__
+
+
+def reads(request, view_func):
+    # Views marked read_only, e.g. multi-gets taking ids in a POST body,
+    # never write whatever the method.
+    return request.method in SAFE_METHODS or getattr(view_class(view_func), 'read_only', False)
+
+
+def routed(request, view_func):
+    return (reads(request, view_func) and view_module(view_func) in config().get('VIEW_MODULES', ())
+            and bool(replicas()) and not pinned(request))
+
+
+def route(request, view_func):
+    request.database_reads = reads(request, view_func)
+    if routed(request, view_func):
+        _replica.set(random.choice(replicas()))
+
+
+@receiver(request_started)
+def check_connections(sender, **kwargs):
+    # Django 4.0 has no CONN_HEALTH_CHECKS; drop broken persistent connections
+    # before the request uses them instead of failing its first query.
+    if not config().get('HEALTH_CHECKS', False):
+        return
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
@@ -0,0 +1,289 @@
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+from rest_framework import serializers, views
+from rest_framework.permissions import IsAdminUser
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_current = ContextVar('request_metrics', default=None)
+
+
+def config():
+    return getattr(settings, 'METRICS', {})
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (name, _escape(value)) for name, value in pairs)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def header(self):
+        return ['# HELP %s %s' % (self.name, self.documentation), '# TYPE %s %s' % (self.name, self.kind)]
+
+
+class CounterMetric(Metric):
+    kind = 'counter'
+
+    def reset(self):
+        with self._lock:
+            self._values = Counter()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[tuple(labels)] += amount
+
+    def collect(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = self.header()
+        for labels, value in values:
+            lines.append('%s%s %s' % (self.name, _labels(self.labels, labels), value))
+        return lines
+
+
+class HistogramMetric(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labels)
+
+    def reset(self):
+        with self._lock:
+            self._values = {}
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(tuple(labels), ([0] * (len(self.buckets) + 1), 0))
+            counts[index] += 1
+            self._values[tuple(labels)] = (counts, total + value)
+
+    def collect(self):
+        with self._lock:
+            values = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+
+        lines = self.header()
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append('%s_bucket%s %s' % (self.name, _labels(self.labels, labels, [('le', bound)]), cumulative))
+            lines.append('%s_sum%s %s' % (self.name, _labels(self.labels, labels), total))
+            lines.append('%s_count%s %s' % (self.name, _labels(self.labels, labels), cumulative))
+        return lines
+
+
+requests_total = CounterMetric('http_requests_total', 'Requests by view, method and status.',
+                               ('view', 'method', 'status'))
+request_duration = HistogramMetric('http_request_duration_seconds', 'Request latency by view.', ('view',))
+request_queries = HistogramMetric('http_request_queries', 'SQL queries per request by view.', ('view',),
+                                  buckets=QUERY_BUCKETS)
+query_duration = HistogramMetric('http_request_query_duration_seconds', 'SQL time per request by view.', ('view',))
+serializer_duration = HistogramMetric('http_request_serializer_duration_seconds',
+                                      'Serializer time per request by view.', ('view',))
+response_size = HistogramMetric('http_response_size_bytes', 'Response body size by view.', ('view',),
+                                buckets=SIZE_BUCKETS)
+repeated_queries = CounterMetric('http_request_repeated_queries_total',
+                                 'Requests where one query shape repeated past the N+1 threshold.', ('view',))
+
+REGISTRY = [requests_total, request_duration, request_queries, query_duration, serializer_duration,
+            response_size, repeated_queries]
+
+
+def reset():
+    for metric in REGISTRY:
+        metric.reset()
+
+
+class RequestMetrics:
+
+    def __init__(self, track_shapes=False):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self.shapes = Counter() if track_shapes else None
+
+
+_IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def query_shape(sql):
+    return _LITERAL.sub('?', _IN_LIST.sub('(...)', sql))
+
+
+def record_query(execute, sql, params, many, context):
+    current = _current.get()
+    if current is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        current.query_time += time.perf_counter() - start
+        current.queries += 1
+        if current.shapes is not None:
+            current.shapes[query_shape(sql)] += 1
+
+
+def install_query_recorder(connection):
+    # Installed once per connection so queries are counted in whichever
+    # thread runs them, e.g. sync_to_async calls made by async views.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    install_query_recorder(connection)
+
+
+@contextmanager
+def serializer_timer():
+    current = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if current is not None:
+            current.serializer_time += time.perf_counter() - start
+
+
+class TimedSerializerMixin:
+    # Times top-level (and many=True item) serialization; nested serializers
+    # are covered by their parent.
+
+    def to_representation(self, instance):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return super().to_representation(instance)
+
+        with serializer_timer():
+            return super().to_representation(instance)
+
+
+def start():
+    for connection in connections.all():
+        install_query_recorder(connection)
+
+    current = RequestMetrics(track_shapes=config().get('N_PLUS_ONE', False))
+    _current.set(current)
+    return current
+
+
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name
+
+
+def observe_size(view, response):
+    if not response.streaming:
+        response_size.observe((view,), len(response.content))
+        return
+
+    def counted(content):
+        size = 0
+        try:
+            for chunk in content:
+                size += len(chunk)
+                yield chunk
+        finally:
+            response_size.observe((view,), size)
+
+    response.streaming_content = counted(response.streaming_content)
+
+
+def finish(request, response, current):
+    _current.set(None)
+    view = view_label(request)
+
+    requests_total.inc((view, request.method, response.status_code))
+    request_duration.observe((view,), time.perf_counter() - current.started)
+    request_queries.observe((view,), current.queries)
+    query_duration.observe((view,), current.query_time)
+    serializer_duration.observe((view,), current.serializer_time)
+    observe_size(view, response)
+
+    if current.shapes:
+        threshold = config().get('N_PLUS_ONE_THRESHOLD', 5)
+        repeated = [(count, shape) for shape, count in current.shapes.items() if count >= threshold]
+        if repeated:
+            repeated_queries.inc((view,))
+            for count, shape in sorted(repeated, reverse=True):
+                logger.warning('Possible N+1 in %s %s (%s): %s queries of shape %s',
+                               request.method, request.path, view, count, shape)
+
+
+def _cache_lines():
+    from user_app.api import authentication
+    from watch.api import cache
+
+    lines = ['# HELP response_cache_requests_total Response cache lookups by view and outcome.',
+             '# TYPE response_cache_requests_total counter']
+    for view, outcomes in sorted(cache.stats().items()):
+        for outcome, count in sorted(outcomes.items()):
+            lines.append('response_cache_requests_total%s %s' % (
+                _labels(('view', 'outcome'), (view, outcome)), count))
+
+    token = authentication.stats.as_dict()
+    lines += ['# HELP token_auth_cache_requests_total Token authentication cache lookups by outcome.',
+              '# TYPE token_auth_cache_requests_total counter',
+              'token_auth_cache_requests_total{outcome="hit"} %s' % token['hits'],
+              'token_auth_cache_requests_total{outcome="miss"} %s' % token['misses']]
+    return lines
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    lines.extend(_cache_lines())
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsView(views.APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,157 @@
+import asyncio
+
+from django.utils.cache import patch_vary_headers
+
+from config import compression, db, metrics
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = metrics.config().get('ENABLED', True)
+        if asyncio.iscoroutinefunction(self.get_response):
+            # Marks __call__ as async, as Django's own MiddlewareMixin does.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        current = metrics.start()
+        response = self.get_response(request)
+        metrics.finish(request, response, current)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        current = metrics.start()
+        response = await self.get_response(request)
+        metrics.finish(request, response, current)
+        return response
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        token = db._replica.set(None)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            db._replica.reset(token)
+            raise
+        if response.streaming:
+            # A streamed body is read after we return, so it keeps the
+            # request's routing until it is consumed or closed.
+            response.streaming_content = self.routed_content(response.streaming_content, token)
+        else:
+            db._replica.reset(token)
+        return self.finish(request, response)
+
+    def routed_content(self, content, token):
+        try:
+            yield from content
+        finally:
+            db._replica.reset(token)
+
+    async def __acall__(self, request):
+        token = db._replica.set(None)
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            db._replica.reset(token)
+            raise
+        # The ASGI handler streams in this request's task and closes the
+        # response from another context, so a streamed body keeps its routing
+        # and the value goes away with the task.
+        if not response.streaming:
+            db._replica.reset(token)
+        return self.finish(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        db.route(request, view_func)
+
+    def finish(self, request, response):
+        # Read-your-writes: after a successful write the same client reads
+        # from the primary until the replicas have had time to catch up.
+        if not getattr(request, 'database_reads', request.method in db.SAFE_METHODS) and response.status_code < 400:
+            db.pin(request)
+        return response
+
+
+class CompressionMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = compression.config().get('ENABLED', True)
+        if asyncio.iscoroutinefunction(self.get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if self.enabled and response.status_code == 304:
+            return self.not_modified(request, response)
+        if not self.enabled or response.has_header('Content-Encoding') or not compression.compressible(response):
+            return response
+        if not response.streaming and len(response.content) < compression.config().get('MIN_SIZE', 1024):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        codec = compression.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if codec is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = codec.stream(response.streaming_content)
+            del response['Content-Length']
+        else:
+            compressed = compression.compress(request, response, codec)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # The body is no longer byte-identical to the uncompressed one.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = codec.name
+        return response
+
+    def not_modified(self, request, response):
+        # A 304 has no body to measure, but a client revalidating with the
+        # weak ETag got the compressed variant; answer with the same validator.
+        etag = response.get('ETag')
+        if not etag or not etag.startswith('"'):
+            return response
+        if compression.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', '')) is None:
+            return response
+        if 'W/' + etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+            patch_vary_headers(response, ('Accept-Encoding',))
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.renderers import _SpecRenderer
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+from rest_framework.response import Response
+from ruamel.yaml import YAML
+
+INFO = openapi.Info(
+    title="Watchlib API",
+    default_version='v1',
+    description="Watch library with DRF",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="truecodelove@gmail.com"),
+    license=openapi.License(name="Test License"),
+)
+
+_lock = threading.Lock()
+_schemas = {}
+_rendered = {}
+
+
+def config():
+    return getattr(settings, 'SCHEMA', {})
+
+
+def get_schema(paths=True):
+    # Generated without a request, so the schema has no host and fits every
+    # host serving it. UI pages only need the info block, as in drf-yasg.
+    if paths not in _schemas:
+        with _lock:
+            if paths not in _schemas:
+                generator = OpenAPISchemaGenerator(INFO, patterns=None if paths else [])
+                _schemas[paths] = generator.get_schema(request=None, public=True)
+    return _schemas[paths]
+
+
+def to_data():
+    return json.loads(OpenAPICodecJson(validators=[]).encode(get_schema()))
+
+
+def dump_artifact(data, fh):
+    yaml = YAML(typ='rt', pure=True)
+    yaml.indent(mapping=2, sequence=4, offset=2)
+    yaml.width = 4096
+    yaml.dump(data, fh)
+
+
+def load_artifact(fh):
+    return YAML(typ='safe', pure=True).load(fh)
+
+
+def clear():
+    with _lock:
+        _schemas.clear()
+        _rendered.clear()
+
+
+def warm():
+    get_schema()
+    get_schema(paths=False)
+
+
+class Rendered:
+
+    def __init__(self, content, content_type):
+        self.content = content
+        self.content_type = content_type
+        self.etag = '"%s"' % hashlib.sha1(content).hexdigest()
+
+    def response(self, request):
+        not_modified = get_conditional_response(request, etag=self.etag)
+        if not_modified is not None:
+            return not_modified
+        response = HttpResponse(self.content, content_type=self.content_type)
+        response['ETag'] = self.etag
+        return response
+
+
+class SchemaView(get_schema_view(INFO, public=True, permission_classes=[permissions.AllowAny])):
+    # Spec formats are rendered once per process and served from memory. The
+    # UI templates embed a CSRF token, so they are rendered per request from
+    # the in-memory schema.
+
+    def get(self, request, version='', format=None):
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, _SpecRenderer):
+            return Response(get_schema(paths=False))
+
+        key = type(renderer).__name__
+        rendered = _rendered.get(key)
+        if rendered is None:
+            content = renderer.render(get_schema(), request.accepted_media_type, self.get_renderer_context())
+            rendered = _rendered.setdefault(key, Rendered(
+                content.encode() if isinstance(content, str) else content,
+                '%s; charset=%s' % (renderer.media_type, renderer.charset)))
+        return rendered.response(request._request)
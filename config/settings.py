@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 import os
+import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 import dj_database_url
@@ -17,6 +19,11 @@ import dj_database_url
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+TESTING = sys.argv[1:2] == ['test']
+
+# The test run is a single process, so process-local caches are safe there.
+SILENCED_SYSTEM_CHECKS = ['user_app.E001', 'watch.E002'] if TESTING else []
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.0/howto/deployment/checklist/
 
@@ -50,6 +57,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'config.middleware.MetricsMiddleware',
+    'config.middleware.ReplicaMiddleware',
+    'config.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -89,13 +99,115 @@ DATABASES = {
     }
 }
 
+CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', default=500))
+
 DATABASE_URL = os.environ.get('DATABASE_URL')
-db_from_env = dj_database_url.config(conn_max_age=500,
+db_from_env = dj_database_url.config(conn_max_age=CONN_MAX_AGE,
                                      default=DATABASE_URL
                                      )
 
 DATABASES['default'].update(db_from_env)
 
+# Read replicas, e.g. DATABASE_REPLICA_URLS="postgres://... postgres://..."
+# or "sqlite:///replica.sqlite3" locally. Tests run them as mirrors of default
+# and read from the primary; the routing tests route to it explicitly.
+for index, url in enumerate(os.environ.get('DATABASE_REPLICA_URLS', default='').split()):
+    DATABASES['replica%s' % index] = dict(dj_database_url.parse(url, conn_max_age=CONN_MAX_AGE),
+                                          TEST={'MIRROR': 'default'})
+
+DATABASE_ROUTERS = ['config.db.ReplicaRouter']
+
+DATABASE_ROUTING = {
+    'REPLICAS': [] if TESTING else [alias for alias in DATABASES if alias != 'default'],
+    'APPS': ('watch',),
+    'VIEW_MODULES': ('watch.api.views', 'watch.api.async_views'),
+    'STICKY_SECONDS': int(os.environ.get('REPLICA_STICKY_SECONDS', default=5)),
+    'HEALTH_CHECKS': bool(int(os.environ.get('DB_HEALTH_CHECKS', default=1))),
+    'CACHE_ALIAS': 'default',
+}
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Revocations only reach other workers through a shared cache, so tokens are
+# checked against it whenever Redis is configured. Without REDIS_URL the cache
+# is off unless TOKEN_AUTH_CACHE=1 is set explicitly for a single-process
+# server (user_app.E001 flags that; the test run is one process).
+TOKEN_AUTH_CACHE = {
+    'ENABLED': bool(int(os.environ.get('TOKEN_AUTH_CACHE') or bool(REDIS_URL) or TESTING)),
+    'CACHE_ALIAS': os.environ.get('TOKEN_AUTH_CACHE_ALIAS') or ('default' if REDIS_URL else None),
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_SIZE', default=10000)),
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', default=60)),
+}
+
+METRICS = {
+    'ENABLED': bool(int(os.environ.get('METRICS', default=1))),
+    'N_PLUS_ONE': bool(int(os.environ.get('METRICS_N_PLUS_ONE', default=0))),
+    'N_PLUS_ONE_THRESHOLD': int(os.environ.get('METRICS_N_PLUS_ONE_THRESHOLD', default=5)),
+}
+
+WATCH_THROTTLE = {
+    'ALGORITHM': os.environ.get('THROTTLE_ALGORITHM', default='sliding'),
+    'CACHE_ALIAS': 'default',
+}
+
+# Cached responses are invalidated by bumping tag generations in the cache,
+# which other gunicorn workers only see through a shared backend. Without
+# REDIS_URL the cache is off unless RESPONSE_CACHE=1 is set explicitly for a
+# single-process server (watch.E002 flags that; the test run is one process).
+WATCH_RESPONSE_CACHE = {
+    'ALIAS': 'default',
+    'ENABLED': bool(int(os.environ.get('RESPONSE_CACHE') or bool(REDIS_URL) or TESTING)),
+    'TIMEOUT': int(os.environ.get('RESPONSE_CACHE_TIMEOUT', default=300)),
+    'WARM_HOSTS': os.environ.get('RESPONSE_CACHE_WARM_HOSTS', default=' '.join(
+        host for host in ALLOWED_HOSTS if '*' not in host and not host.startswith('.'))).split(),
+    'WARM_SCHEME': os.environ.get('RESPONSE_CACHE_WARM_SCHEME', default='https'),
+}
+
+# brotli and zstandard are optional; gzip is always available.
+COMPRESSION = {
+    'ENABLED': bool(int(os.environ.get('COMPRESSION', default=1))),
+    'MIN_SIZE': int(os.environ.get('COMPRESSION_MIN_SIZE', default=1024)),
+    'ENCODINGS': os.environ.get('COMPRESSION_ENCODINGS', default='br zstd gzip').split(),
+    'LEVELS': {'br': 5, 'zstd': 3, 'gzip': 6},
+    'CONTENT_TYPES': ('application/json', 'application/x-ndjson', 'application/msgpack', 'application/openapi',
+                      'application/yaml', 'application/coreapi', 'application/javascript', 'text/'),
+    'CACHE_ALIAS': 'default',
+    'CACHE_TIMEOUT': WATCH_RESPONSE_CACHE['TIMEOUT'],
+}
+
+SCHEMA = {
+    'WARM': bool(int(os.environ.get('SCHEMA_WARM', default=1))),
+    'ARTIFACT': BASE_DIR / 'swagger.yaml',
+}
+
+# The job worker invalidates and warms the response cache from its own
+# process, so JOBS=1 requires a shared backend (REDIS_URL); see watch.E001.
+WATCH_JOBS = {
+    'ENABLED': bool(int(os.environ.get('JOBS', default=0))),
+    'BATCH_SIZE': int(os.environ.get('JOBS_BATCH_SIZE', default=100)),
+    'MAX_ATTEMPTS': int(os.environ.get('JOBS_MAX_ATTEMPTS', default=5)),
+    'RETRY_DELAY': int(os.environ.get('JOBS_RETRY_DELAY', default=10)),
+    'STALE_AFTER': int(os.environ.get('JOBS_STALE_AFTER', default=300)),
+    'POLL_INTERVAL': float(os.environ.get('JOBS_POLL_INTERVAL', default=1)),
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -114,6 +226,25 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# https://docs.djangoproject.com/en/4.0/topics/auth/passwords/
+# argon2 needs argon2-cffi and bcrypt needs bcrypt. md5 is only for tests
+# and load-test environments; the test runner uses it unless told otherwise.
+
+HASHERS = {
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'md5': 'django.contrib.auth.hashers.MD5PasswordHasher',
+}
+
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', default='md5' if TESTING else 'pbkdf2')
+
+# Existing hashes made by the other hashers still verify and are upgraded on login.
+PASSWORD_HASHERS = [HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in HASHERS.items() if name != PASSWORD_HASHER and name != 'md5'
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.0/topics/i18n/
 
@@ -155,13 +286,21 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         # 'rest_framework.authentication.BasicAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        # 'rest_framework.authentication.TokenAuthentication',
+        'user_app.api.authentication.CachedTokenAuthentication',
         # 'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+    # orjson and msgpack are optional: without them JSON falls back to the
+    # stdlib encoder and MessagePack is not offered.
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'watch.api.renderers.ORJSONRenderer',
         # 'rest_framework.renderers.BrowsableAPIRenderer',
-    ],
+    ] + (['watch.api.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
+    'DEFAULT_PARSER_CLASSES': [
+        'watch.api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ] + (['watch.api.parsers.MessagePackParser'] if find_spec('msgpack') else []),
 
     # 'DEFAULT_THROTTLE_CLASSES': [
     #     'rest_framework.throttling.AnonRateThrottle',
@@ -179,6 +318,28 @@ REST_FRAMEWORK = {
     ],
 }
 
+WATCH_PAGINATION = {
+    'PAGE_SIZE': int(os.environ.get('PAGE_SIZE', default=20)),
+    'MAX_PAGE_SIZE': int(os.environ.get('MAX_PAGE_SIZE', default=100)),
+    'NESTED_PAGE_SIZE': int(os.environ.get('NESTED_PAGE_SIZE', default=20)),
+}
+
+WATCH_REVIEW_FEED = {
+    'PER_USER': int(os.environ.get('REVIEW_FEED_PER_USER', default=5)),
+    'MAX_PER_USER': int(os.environ.get('REVIEW_FEED_MAX_PER_USER', default=20)),
+    'MAX_USERS': int(os.environ.get('REVIEW_FEED_MAX_USERS', default=100)),
+}
+
+WATCH_FAST_READ = bool(int(os.environ.get('FAST_READ', default=0)))
+
+WATCH_BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', default=5000))
+
+WATCH_MULTI_GET_MAX_IDS = int(os.environ.get('MULTI_GET_MAX_IDS', default=100))
+
+WATCH_STATISTICS = {
+    'TOP_TITLES': int(os.environ.get('STATISTICS_TOP_TITLES', default=10)),
+}
+
 # SIMPLE_JWT = {
 #     'ROTATE_REFRESH_TOKENS': True,
 # }
@@ -18,29 +18,16 @@ import os
 from django.contrib import admin
 from django.urls import path, include
 
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-   openapi.Info(
-      title="Watchlib API",
-      default_version='v1',
-      description="Watch library with DRF",
-      terms_of_service="https://www.google.com/policies/terms/",
-      contact=openapi.Contact(email="truecodelove@gmail.com"),
-      license=openapi.License(name="Test License"),
-   ),
-   public=True,
-   permission_classes=[permissions.AllowAny],
-)
+from config import schema
+from config.metrics import MetricsView
 
 urlpatterns = [
     path(os.environ.get('ADMIN'), admin.site.urls),
     path('watch/', include('watch.api.urls')),
     path('account/', include('user_app.api.urls')),
-    path('', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('', schema.SchemaView.with_ui('swagger'), name='schema-swagger-ui'),
+    path('redoc/', schema.SchemaView.with_ui('redoc'), name='schema-redoc'),
 
 
     # path('api-auth', include('rest_framework.urls')),
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/4.0/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+if settings.SCHEMA.get('WARM', True):
+    # Generate the OpenAPI schema now rather than on the first request.
+    from config import schema
+
+    schema.warm()
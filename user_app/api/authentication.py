@@ -0,0 +1,145 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+class LocalTokenCache:
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedTokenCache:
+    # Every worker shares token -> (user id, is_active), so a logout or
+    # deactivation on one worker reaches all of them; no user data beyond that
+    # leaves the process. The user objects stay in the local cache, which is
+    # trusted only while the shared entry exists and agrees with it.
+
+    def __init__(self, alias, local, ttl):
+        self.alias = alias
+        self.local = local
+        self.ttl = ttl
+
+    def _key(self, key):
+        return 'auth:token:%s' % key
+
+    def get(self, key):
+        shared = caches[self.alias].get(self._key(key))
+        cached = self.local.get(key) if shared is not None else None
+        if cached is None or (cached[0].pk, cached[0].is_active) != tuple(shared):
+            return None
+        return cached
+
+    def set(self, key, value):
+        user, token = value
+        caches[self.alias].set(self._key(key), (user.pk, user.is_active), self.ttl)
+        self.local.set(key, value)
+
+    def delete_many(self, keys):
+        caches[self.alias].delete_many([self._key(key) for key in keys])
+        self.local.delete_many(keys)
+
+    def clear(self):
+        self.local.clear()
+
+
+class TokenCacheStats:
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def as_dict(self):
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / total if total else 0.0}
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+def _build_cache():
+    config = getattr(settings, 'TOKEN_AUTH_CACHE', {})
+    if not config.get('ENABLED', True):
+        return None
+    local = LocalTokenCache(config.get('MAX_SIZE', 10000), config.get('TTL', 60))
+    if config.get('CACHE_ALIAS'):
+        return SharedTokenCache(config['CACHE_ALIAS'], local, config.get('TTL', 60))
+    return local
+
+
+token_cache = _build_cache()
+stats = TokenCacheStats()
+
+
+def invalidate(*keys):
+    if token_cache is not None:
+        token_cache.delete_many(keys)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    # Keeps token -> (user, token) resolutions so authenticated requests skip
+    # the Token/User join. Entries expire after TOKEN_AUTH_CACHE['TTL'] seconds
+    # and are dropped when the token is deleted or its user is saved.
+
+    def authenticate_credentials(self, key):
+        if token_cache is None:
+            return super().authenticate_credentials(key)
+
+        cached = token_cache.get(key)
+        stats.record(cached is not None)
+
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, (user, token))
+            return user, token
+
+        user, token = copy.deepcopy(cached)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        return user, token
@@ -1,4 +1,6 @@
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.db import transaction
 from rest_framework import serializers
 
 
@@ -12,19 +14,23 @@ class RegistrationSerializer(serializers.ModelSerializer):
             'password': {'write_only': True}
         }
 
-    def save(self, **kwargs):
-
-        password = self.validated_data['password']
-        password2 = self.validated_data['password2']
-
-        if password != password2:
-            return serializers.ValidationError({'error': 'Passwords do not match!'})
-
-        if User.objects.filter(email=self.validated_data['email']).exists():
-            return serializers.ValidationError({'error': 'Email is already in use!'})
-
-        account = User(email=self.validated_data['email'], username=self.validated_data['username'])
-        account.set_password(password)
-        account.save()
-
-        return account
\ No newline at end of file
+    def validate_email(self, value):
+        if User.objects.filter(email=value).exists():
+            raise serializers.ValidationError('Email is already in use!')
+        return value
+
+    def validate(self, attrs):
+        if attrs['password'] != attrs['password2']:
+            raise serializers.ValidationError({'error': 'Passwords do not match!'})
+        return attrs
+
+    def create(self, validated_data):
+        # Hash before opening the transaction so the slow part holds no locks.
+        password = make_password(validated_data['password'])
+
+        with transaction.atomic():
+            # The post_save signal creates the token and caches it on
+            # account.auth_token, so callers need no further query.
+            account = User.objects.create(email=validated_data['email'], username=validated_data['username'],
+                                          password=password)
+        return account
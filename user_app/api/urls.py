@@ -8,6 +8,7 @@ urlpatterns = [
     path('login/', obtain_auth_token, name='login'),
     path('register/', views.registration_view, name='register'),
     path('logout/', views.logout_view, name='logout'),
+    path('auth-cache/stats/', views.auth_cache_stats_view, name='auth-cache-stats'),
 
     # path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     # path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
@@ -1,10 +1,11 @@
 from rest_framework import status
-from rest_framework.authtoken.models import Token
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 # from rest_framework_simplejwt.tokens import RefreshToken
 
 from user_app import models
+from user_app.api import authentication
 from user_app.api.serializers import RegistrationSerializer
 
 
@@ -19,26 +20,26 @@ def logout_view(request):
 def registration_view(request):
     if request.method == 'POST':
         serializer = RegistrationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        account = serializer.save()
+
+        data = {
+            'response': "Registration Successful!",
+            'username': account.username,
+            'email': account.email,
+            'token': account.auth_token.key,
+        }
+
+        # refresh = RefreshToken.for_user(account)
+        # data['token'] = {
+        #     'refresh': str(refresh),
+        #     'access': str(refresh.access_token)
+        # }
 
-        data = {}
-
-        if serializer.is_valid():
-            account = serializer.save()
-
-            data['response'] = "Registration Successful!"
-            data['username'] = account.username
-            data['email'] = account.email
-
-            token = Token.objects.get(user=account).key
-            data['token'] = token
-
-            # refresh = RefreshToken.for_user(account)
-            # data['token'] = {
-            #     'refresh': str(refresh),
-            #     'access': str(refresh.access_token)
-            # }
+        return Response(data, status=status.HTTP_201_CREATED)
 
-        else:
-            data = serializer.errors
 
-        return Response(data, status=status.HTTP_201_CREATED)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def auth_cache_stats_view(request):
+    return Response(authentication.stats.as_dict())
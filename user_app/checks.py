@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def check_token_cache(app_configs, **kwargs):
+    config = getattr(settings, 'TOKEN_AUTH_CACHE', {})
+    alias = config.get('CACHE_ALIAS')
+    backend = settings.CACHES.get(alias, {}).get('BACKEND') if alias else None
+    if config.get('ENABLED', True) and backend in (None, 'django.core.cache.backends.locmem.LocMemCache'):
+        return [Error(
+            'The token cache needs a shared cache backend.',
+            hint='A logout or deactivation only reaches the worker that handled it, and the others keep accepting '
+                 'the token for up to TTL seconds; set REDIS_URL, or silence user_app.E001 when serving from a '
+                 'single process.',
+            id='user_app.E001',
+        )]
+    return []
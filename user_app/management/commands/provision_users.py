@@ -0,0 +1,46 @@
+import csv
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create users with tokens for load testing, optionally writing username,token rows to a CSV file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int)
+        parser.add_argument('--prefix', default='load')
+        parser.add_argument('--password', default='Load@12345')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--output', help='CSV file for the created usernames and tokens.')
+
+    def handle(self, *args, **options):
+        prefix, batch_size = options['prefix'], options['batch_size']
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError('Users with the prefix "%s" already exist.' % prefix)
+
+        # One hash shared by every user: hashing per user would dominate the run.
+        password = make_password(options['password'])
+        tokens = []
+
+        with transaction.atomic():
+            for start in range(0, options['count'], batch_size):
+                usernames = ['%s%s' % (prefix, i) for i in range(start, min(start + batch_size, options['count']))]
+                User.objects.bulk_create([User(username=username, password=password) for username in usernames])
+                users = User.objects.filter(username__in=usernames).values_list('pk', 'username')
+                batch = {username: Token(key=Token.generate_key(), user_id=pk) for pk, username in users}
+                Token.objects.bulk_create(batch.values())
+                tokens.extend((username, token.key) for username, token in batch.items())
+
+        if options['output']:
+            with open(options['output'], 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['username', 'token'])
+                writer.writerows(tokens)
+
+        self.stdout.write(self.style.SUCCESS('Provisioned %s users with tokens.' % len(tokens)))
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    # Registration checks for an existing email on every request.
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX auth_user_email_idx ON auth_user (email)',
+            'DROP INDEX auth_user_email_idx',
+        ),
+    ]
@@ -1,10 +1,24 @@
+import csv
+import io
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.hashers import get_hasher
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError
+from django.test.utils import override_settings
 from django.urls import reverse
 
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework.authtoken.models import Token
 
+from user_app import checks
+from user_app.api import authentication
+
 
 class RegisterTestCase(APITestCase):
 
@@ -37,3 +51,146 @@ class LoginLogoutTestCase(APITestCase):
         self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
         response = self.client.post(reverse('logout'))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TokenCacheTestCase(APITestCase):
+
+    def setUp(self) -> None:
+        authentication.token_cache.clear()
+        authentication.stats.reset()
+        self.user = User.objects.create_user(username="example", password="Example@123")
+        self.token = Token.objects.get(user__username="example")
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def test_cached_lookup(self):
+        self.client.get(reverse('user-review-detail'))
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('user-review-detail'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(authentication.stats.as_dict(), {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    def test_logout_invalidates(self):
+        self.client.get(reverse('user-review-detail'))
+        response = self.client.post(reverse('logout'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse('user-review-detail'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_invalidates(self):
+        self.client.get(reverse('user-review-detail'))
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(reverse('user-review-detail'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_expiry(self):
+        cache = authentication.LocalTokenCache(max_size=2, ttl=-1)
+        cache.set('key', 'value')
+        self.assertIsNone(cache.get('key'))
+
+    def test_lru_eviction(self):
+        cache = authentication.LocalTokenCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+
+    def test_shared_revocation(self):
+        self.addCleanup(cache.clear)
+        workers = [authentication.SharedTokenCache('default', authentication.LocalTokenCache(10, 60), 60)
+                   for _ in range(2)]
+        value = (self.user, self.token)
+        workers[0].set(self.token.key, value)
+        self.assertEqual(cache.get('auth:token:%s' % self.token.key), (self.user.pk, True))
+        self.assertIsNone(workers[1].get(self.token.key))
+
+        workers[1].set(self.token.key, value)
+        self.assertEqual(workers[1].get(self.token.key), value)
+        workers[0].delete_many([self.token.key])
+        self.assertIsNone(workers[1].get(self.token.key))
+
+        workers[1].set(self.token.key, value)
+        cache.set('auth:token:%s' % self.token.key, (self.user.pk, False))
+        self.assertIsNone(workers[1].get(self.token.key))
+
+    def test_disabled_without_shared_cache(self):
+        self.assertEqual(checks.check_token_cache(None)[0].id, 'user_app.E001')
+        with override_settings(TOKEN_AUTH_CACHE={'ENABLED': True, 'CACHE_ALIAS': 'default'}):
+            self.assertEqual(checks.check_token_cache(None)[0].id, 'user_app.E001')
+        with override_settings(TOKEN_AUTH_CACHE={'ENABLED': False}):
+            self.assertEqual(checks.check_token_cache(None), [])
+            self.assertIsNone(authentication._build_cache())
+
+        with mock.patch.object(authentication, 'token_cache', None):
+            self.client.get(reverse('user-review-detail'))
+            with self.assertNumQueries(2):
+                response = self.client.get(reverse('user-review-detail'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(authentication.stats.as_dict()['hits'], 0)
+
+    def test_stats_admin_only(self):
+        response = self.client.get(reverse('auth-cache-stats'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class RegistrationPipelineTestCase(APITestCase):
+
+    def setUp(self) -> None:
+        self.data = {
+            "username": "testcase",
+            "email": "test@case.com",
+            "password": "TestCase@123",
+            "password2": "TestCase@123"
+        }
+
+    def test_returns_created_token(self):
+        response = self.client.post(reverse('register'), self.data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['token'], Token.objects.get(user__username="testcase").key)
+
+    def test_password_mismatch(self):
+        self.data['password2'] = "Other@123"
+        response = self.client.post(reverse('register'), self.data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User.objects.exists())
+
+    def test_duplicate_email(self):
+        User.objects.create_user(username="other", email="test@case.com")
+        response = self.client.post(reverse('register'), self.data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+
+    def test_rolled_back_on_token_failure(self):
+        with mock.patch('user_app.models.Token.objects.create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.client.post(reverse('register'), self.data)
+        self.assertFalse(User.objects.filter(username="testcase").exists())
+
+    def test_configured_hasher(self):
+        self.client.post(reverse('register'), self.data)
+        user = User.objects.get(username="testcase")
+        self.assertTrue(user.password.startswith(get_hasher().algorithm))
+        self.assertTrue(user.check_password("TestCase@123"))
+
+
+class ProvisionUsersTestCase(APITestCase):
+
+    def test_provision(self):
+        with tempfile.NamedTemporaryFile('r', suffix='.csv') as output:
+            call_command('provision_users', 25, prefix='load', password='Load@12345', batch_size=10,
+                         output=output.name, stdout=io.StringIO())
+            rows = list(csv.DictReader(output))
+
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(Token.objects.filter(user__username__startswith='load').count(), 25)
+        for row in rows[:3]:
+            self.assertEqual(Token.objects.get(key=row['token']).user.username, row['username'])
+        self.assertTrue(User.objects.get(username='load0').check_password('Load@12345'))
+
+    def test_refuses_existing_prefix(self):
+        User.objects.create_user(username="load0")
+        with self.assertRaises(CommandError):
+            call_command('provision_users', 5, prefix='load', stdout=io.StringIO())
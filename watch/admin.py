@@ -1,8 +1,10 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import WatchList, StreamPlatform, Review
+from .models import WatchList, StreamPlatform, Review, PlatformStatistics, Job
 
 admin.site.register(WatchList)
 admin.site.register(StreamPlatform)
 admin.site.register(Review)
+admin.site.register(PlatformStatistics)
+admin.site.register(Job)
@@ -0,0 +1,97 @@
+from asgiref.sync import sync_to_async
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import exceptions, generics, response, status, views
+
+from watch.api import pagination, permissions, serializers, sparse, throttling
+from watch.models import WatchList, StreamPlatform, Review
+
+
+def database(func, *args, **kwargs):
+    # Django 4.0 has no async ORM; this is what its later aget()/alist() wrap.
+    return sync_to_async(func)(*args, **kwargs)
+
+
+class AsyncAPIView(views.APIView):
+    # DRF 3.13 and Django 4.0 class-based views are sync only, so these views
+    # are served as plain async function views. Handlers are named a<method>.
+
+    @classmethod
+    def as_async_view(cls, **initkwargs):
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.adispatch(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.csrf_exempt = True
+        return view
+
+    def get_async_handler(self, method):
+        if method == 'head':
+            method = 'get'
+        handler = getattr(self, 'a%s' % method, None)
+        if method not in self.http_method_names or handler is None:
+            raise exceptions.MethodNotAllowed(method.upper())
+        return handler
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Authentication, permissions and throttles may query the database or cache.
+            await database(self.initial, request, *args, **kwargs)
+            handler = self.get_async_handler(request.method.lower())
+            result = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            result = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, result, *args, **kwargs)
+        return self.response
+
+
+class AsyncListAPIView(AsyncAPIView, generics.GenericAPIView):
+
+    def fetch_page(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.paginate_queryset(queryset)
+
+    async def aget(self, request, *args, **kwargs):
+        # Pages are evaluated (with their prefetches) in one database call, so
+        # serialization below runs on the event loop without further queries.
+        page = await database(self.fetch_page)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class WatchDetailAsync(AsyncAPIView):
+    permission_classes = [permissions.IsAdminOrReadOnly]
+
+    async def aget(self, request, pk):
+        item = await database(WatchList.objects.select_related('platform').filter(pk=pk).first)
+        if item is None:
+            return response.Response({'error': 'Item not found'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = serializers.WatchListSerializer(item, context={'request': request})
+        return response.Response(serializer.data)
+
+
+class ReviewListAsync(AsyncListAPIView):
+    throttle_classes = [throttling.ReviewListThrottle, throttling.AnonCounterThrottle]
+    serializer_class = serializers.ReviewSerializer
+    pagination_class = pagination.ReviewCPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['review_user__username', 'active']
+
+    def get_queryset(self):
+        return Review.objects.filter(watchlist=self.kwargs['pk']).select_related('review_user')
+
+
+class StreamPlatformListAsync(sparse.ExpandWatchlistsMixin, AsyncListAPIView):
+    queryset = StreamPlatform.objects.all()
+    serializer_class = serializers.StreamPlatformSerializer
+    permission_classes = [permissions.IsAdminOrReadOnly]
+    pagination_class = pagination.StreamPlatformCPagination
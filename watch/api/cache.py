@@ -0,0 +1,197 @@
+import hashlib
+import io
+import threading
+import uuid
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.urls import resolve
+from rest_framework import response, status
+from rest_framework.settings import api_settings
+
+HIT = 'hit'
+MISS = 'miss'
+
+_counters = Counter()
+_lock = threading.Lock()
+
+
+def _config():
+    return getattr(settings, 'WATCH_RESPONSE_CACHE', {})
+
+
+def get_cache():
+    return caches[_config().get('ALIAS', 'default')]
+
+
+def _tag_key(tag):
+    return 'watch:tag:%s' % tag
+
+
+def _generations(tags):
+    cache = get_cache()
+    keys = [_tag_key(tag) for tag in tags]
+    generations = cache.get_many(keys)
+
+    missing = [key for key in keys if key not in generations]
+    for key in missing:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+    if missing:
+        generations.update(cache.get_many(missing))
+
+    return [generations.get(key, '') for key in keys]
+
+
+def invalidate(*tags):
+    get_cache().set_many({_tag_key(tag): uuid.uuid4().hex for tag in tags}, timeout=None)
+
+
+def invalidate_on_commit(*tags):
+    # Invalidate now for this process and again once the new rows are visible
+    # to everyone, so a concurrent read cannot cache the old state.
+    invalidate(*tags)
+    transaction.on_commit(lambda: invalidate(*tags))
+
+
+def watchlist_tags(watchlist_id, platform_id):
+    return ['watchlist:%s' % watchlist_id, 'watchlists', 'platform:%s' % platform_id, 'platforms']
+
+
+def invalidate_all():
+    invalidate('all')
+
+
+def record(view_name, outcome, count=1):
+    with _lock:
+        _counters[(view_name, outcome)] += count
+
+
+def stats():
+    with _lock:
+        counters = dict(_counters)
+
+    views = {}
+    for (view_name, outcome), count in counters.items():
+        views.setdefault(view_name, {HIT: 0, MISS: 0})[outcome] = count
+    return views
+
+
+def reset_stats():
+    with _lock:
+        _counters.clear()
+
+
+def authenticator_name(request):
+    warming = getattr(request._request, 'warm_authenticator', None)
+    if warming is not None:
+        return warming
+    authenticator = request.successful_authenticator
+    return type(authenticator).__name__ if authenticator else 'anonymous'
+
+
+def _make_key(request, view_name, kwargs, query, generations):
+    parts = [
+        view_name,
+        request.scheme,
+        request.get_host(),
+        sorted((str(key), str(value)) for key, value in kwargs.items()),
+        query,
+        authenticator_name(request),
+        generations,
+    ]
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return 'watch:response:%s:%s' % (view_name, digest)
+
+
+def make_key(request, view_name, tags, kwargs):
+    return _make_key(request, view_name, kwargs, sorted(request.query_params.lists()), _generations(tags))
+
+
+def cache_response(*tags):
+    # Tags are formatted with the URL kwargs, e.g. 'watchlist:{pk}'.
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            config = _config()
+            if not config.get('ENABLED', True):
+                return handler(view, request, *args, **kwargs)
+
+            view_name = request.resolver_match.url_name
+            cache = get_cache()
+            key = make_key(request, view_name, ['all'] + [tag.format(**kwargs) for tag in tags], kwargs)
+
+            cached = cache.get(key)
+            if cached is not None:
+                record(view_name, HIT)
+                result = response.Response(cached)
+                # Lets the compression middleware reuse compressed bodies.
+                result.cache_key = key
+                return result
+
+            record(view_name, MISS)
+            result = handler(view, request, *args, **kwargs)
+            if result.status_code == status.HTTP_200_OK:
+                cache.set(key, result.data, config.get('TIMEOUT', 300))
+                result.cache_key = key
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def cached_items(request, view_name, tag, pks, load, exclude=()):
+    # Per-item cache for multi-gets. Each item uses the key cache_response
+    # gives view_name for that pk, so the batch and the detail view share
+    # entries; only the misses are loaded, with one load(pks) call.
+    if not _config().get('ENABLED', True):
+        return load(pks)
+
+    query = sorted((key, values) for key, values in request.query_params.lists() if key not in exclude)
+    tags = ['all'] + [tag.format(pk=pk) for pk in pks]
+    generations = dict(zip(tags, _generations(tags)))
+    keys = {pk: _make_key(request, view_name, {'pk': pk}, query,
+                          [generations['all'], generations[tag.format(pk=pk)]]) for pk in pks}
+
+    cache = get_cache()
+    cached = cache.get_many(list(keys.values()))
+    items = {pk: cached[key] for pk, key in keys.items() if key in cached}
+    missing = [pk for pk in pks if pk not in items]
+    record(request.resolver_match.url_name, HIT, len(items))
+    record(request.resolver_match.url_name, MISS, len(missing))
+    if missing:
+        loaded = load(missing)
+        cache.set_many({keys[pk]: data for pk, data in loaded.items()}, _config().get('TIMEOUT', 300))
+        items.update(loaded)
+    return items
+
+
+def warm(path):
+    # Renders an anonymous, unthrottled GET of a cached view and stores it
+    # once per host and authenticator, so the next real request is a hit.
+    if not _config().get('ENABLED', True):
+        return
+
+    match = resolve(path)
+    view = match.func.cls.as_view(**dict(match.func.initkwargs, throttle_classes=[]))
+    authenticators = [cls.__name__ for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES] + ['anonymous']
+
+    for host in _config().get('WARM_HOSTS', ()):
+        for authenticator in authenticators:
+            # Bodies hold absolute URLs, so entries are built for the scheme
+            # clients use in production.
+            request = WSGIRequest({
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': path,
+                'HTTP_HOST': host,
+                'wsgi.url_scheme': _config().get('WARM_SCHEME', 'https'),
+                'wsgi.input': io.BytesIO(),
+            })
+            request.resolver_match = match
+            request.warm_authenticator = authenticator
+            view(request, *match.args, **match.kwargs)
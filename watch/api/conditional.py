@@ -0,0 +1,87 @@
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+from watch.api import sparse
+from watch.models import Review, StreamPlatform, WatchList
+
+
+def _latest(*timestamps):
+    timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+    return max(timestamps) if timestamps else None
+
+
+def watchlist_validator(view, request, pk):
+    row = WatchList.objects.filter(pk=pk).values_list('updated', 'platform__updated').first()
+    if row is None:
+        return None, 0
+    return _latest(*row), 1
+
+
+def review_list_validator(view, request, pk):
+    aggregates = Review.objects.filter(watchlist=pk).aggregate(last=Max('update'), count=Count('pk'))
+    return aggregates['last'], aggregates['count']
+
+
+def platform_validator(view, request, pk=None):
+    platforms = StreamPlatform.objects.all()
+    if pk is not None:
+        if not str(pk).isdigit():
+            return None, 0
+        platforms = platforms.filter(pk=pk)
+
+    # Titles are only in the body with ?expand=watchlist; otherwise the
+    # platform table alone decides, without joining the whole catalog.
+    if not sparse.expanded(request, 'watchlist'):
+        aggregates = platforms.aggregate(last=Max('updated'), count=Count('pk'))
+        return aggregates['last'], aggregates['count']
+
+    aggregates = platforms.aggregate(last=Max('updated'), count=Count('pk', distinct=True),
+                                     watchlist_last=Max('watchlist__updated'), watchlist_count=Count('watchlist'))
+    return (_latest(aggregates['last'], aggregates['watchlist_last']),
+            (aggregates['count'], aggregates['watchlist_count']))
+
+
+def make_etag(request, last_modified, fingerprint):
+    parts = [
+        request.get_full_path(),
+        request.accepted_media_type,
+        last_modified.isoformat() if last_modified else None,
+        fingerprint,
+    ]
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def condition(validator, last_modified=True):
+    # The validator returns (last modified, fingerprint) from a cheap aggregate
+    # query, so a 304 is answered without loading or serializing the rows.
+    # Deleting a row does not advance a collection's latest timestamp, so
+    # collections pass last_modified=False and validate on the ETag alone,
+    # whose fingerprint includes the row count.
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            latest, fingerprint = validator(view, request, *args, **kwargs)
+            etag = make_etag(request, latest, fingerprint)
+            timestamp = int(latest.timestamp()) if latest and last_modified else None
+
+            not_modified = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+            if not_modified is not None:
+                not_modified['ETag'] = etag
+                return not_modified
+
+            result = handler(view, request, *args, **kwargs)
+            if result.status_code == status.HTTP_200_OK:
+                result['ETag'] = etag
+                if timestamp is not None:
+                    result['Last-Modified'] = http_date(timestamp)
+            return result
+
+        return wrapper
+
+    return decorator
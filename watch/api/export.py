@@ -0,0 +1,65 @@
+from django.utils.dateparse import parse_datetime
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from watch.api import readers, renderers, serializers
+from watch.models import Review, WatchList
+
+CHUNK_SIZE = 2000
+
+review_reader = readers.ValuesReader(serializers.ReviewSerializer, related={'review_user': 'review_user__username'},
+                                     extra={'watchlist': 'watchlist_id'})
+
+
+class NDJSONRenderer(JSONRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+def parse_since(value):
+    if value is None:
+        return None
+    try:
+        since = parse_datetime(value)
+    except ValueError:
+        since = None
+    if since is None:
+        raise exceptions.ValidationError({'since': 'Expected an ISO 8601 datetime.'})
+    return since
+
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def ndjson_line(data):
+    if renderers.orjson is not None:
+        return renderers.orjson_dumps(data) + b'\n'
+    return _encoder.encode(data) + '\n'
+
+
+def stream_format(renderer):
+    # MessagePack rows are streamed back to back; msgpack.Unpacker reads
+    # them one at a time, just like NDJSON lines.
+    if isinstance(renderer, renderers.MessagePackRenderer):
+        return renderers.msgpack_dumps, renderer.media_type
+    return ndjson_line, NDJSONRenderer.media_type
+
+
+def _rows(queryset, reader, chunk_size, encode):
+    for data in reader.iterator(queryset.order_by('pk'), chunk_size):
+        yield encode(data)
+
+
+def watchlist_rows(since=None, chunk_size=CHUNK_SIZE, encode=ndjson_line):
+    queryset = WatchList.objects.all()
+    if since is not None:
+        queryset = queryset.filter(updated__gt=since)
+    return _rows(queryset, readers.watchlist_reader, chunk_size, encode)
+
+
+def review_rows(since=None, chunk_size=CHUNK_SIZE, encode=ndjson_line):
+    queryset = Review.objects.all()
+    if since is not None:
+        queryset = queryset.filter(update__gt=since)
+    return _rows(queryset, review_reader, chunk_size, encode)
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db.models import OuterRef
+from rest_framework import exceptions
+from rest_framework.pagination import _positive_int
+
+from watch.models import Review
+
+
+def _config():
+    return getattr(settings, 'WATCH_REVIEW_FEED', {})
+
+
+def parse_ids(value, limit):
+    # Accepts "1,2,3" from a query string or [1, 2, 3] from a request body.
+    parts = value if isinstance(value, list) else (value or '').split(',')
+    try:
+        ids = list(dict.fromkeys(int(part) for part in parts if str(part).strip()))
+    except (TypeError, ValueError):
+        raise exceptions.ValidationError({'ids': 'Expected a comma separated list of ids.'})
+    if not ids:
+        raise exceptions.ValidationError({'ids': 'This parameter is required.'})
+    if len(ids) > limit:
+        raise exceptions.ValidationError({'ids': 'At most %s ids per request.' % limit})
+    return ids
+
+
+def parse_user_ids(value):
+    return parse_ids(value, _config().get('MAX_USERS', 100))
+
+
+def parse_limit(value):
+    try:
+        return _positive_int(value, strict=True, cutoff=_config().get('MAX_PER_USER', 20))
+    except (TypeError, ValueError):
+        return _config().get('PER_USER', 5)
+
+
+def recent_reviews(user_ids, limit):
+    # One query for all users: a review is kept when it is among its author's
+    # latest, which the (review_user, created) index answers per author.
+    latest = Review.objects.filter(review_user=OuterRef('review_user')).order_by('-created', '-id').values('pk')
+    return (Review.objects.filter(review_user__in=user_ids, pk__in=latest[:limit])
+            .order_by('review_user', '-created', '-id'))
@@ -1,4 +1,12 @@
-from rest_framework.pagination import PageNumberPagination, LimitOffsetPagination, CursorPagination
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.pagination import (BasePagination, PageNumberPagination, LimitOffsetPagination,
+                                       CursorPagination, _positive_int)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+PAGINATION = getattr(settings, 'WATCH_PAGINATION', {})
 
 
 class WatchListPagination(PageNumberPagination):
@@ -17,6 +25,72 @@ class WatchListLOPagination(LimitOffsetPagination):
 
 
 class WatchListCPagination(CursorPagination):
-    page_size = 5
-    ordering = 'created'
-    cursor_query_param = 'record'
\ No newline at end of file
+    page_size = PAGINATION.get('PAGE_SIZE', 5)
+    max_page_size = PAGINATION.get('MAX_PAGE_SIZE', 100)
+    page_size_query_param = 'size'
+    ordering = ('created', 'id')
+    cursor_query_param = 'record'
+
+
+class StreamPlatformCPagination(WatchListCPagination):
+    ordering = ('id',)
+
+
+class ReviewCPagination(WatchListCPagination):
+    ordering = ('created', 'id')
+
+
+class UserReviewCPagination(WatchListCPagination):
+    ordering = ('-created', '-id')
+
+
+class PlatformStatisticsCPagination(WatchListCPagination):
+    ordering = ('platform_id',)
+
+
+class SearchPagination(BasePagination):
+    page_size = PAGINATION.get('PAGE_SIZE', 5)
+    max_page_size = PAGINATION.get('MAX_PAGE_SIZE', 100)
+    page_size_query_param = 'size'
+    page_query_param = 'p'
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(request.query_params[self.page_size_query_param], strict=True,
+                                 cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def paginate_ids(self, search, query, request):
+        # Ranked results have no stable cursor, so pages are fetched by offset
+        # with one extra row to learn whether a next page exists.
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        try:
+            self.page = _positive_int(request.query_params.get(self.page_query_param, 1), strict=True)
+        except ValueError:
+            self.page = 1
+
+        ids = search(query, limit=self.page_size + 1, offset=(self.page - 1) * self.page_size)
+        self.has_next = len(ids) > self.page_size
+        return ids[:self.page_size]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page + 1)
+
+    def get_previous_link(self):
+        if self.page == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page - 1)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
@@ -0,0 +1,63 @@
+from django.utils.functional import cached_property
+from rest_framework import fields, relations
+
+from config.metrics import serializer_timer
+from watch.api import serializers
+
+# Fields whose to_representation() returns database values of these types unchanged.
+PASSTHROUGH_FIELDS = (fields.BooleanField, fields.CharField, fields.FloatField, fields.IntegerField,
+                      fields.ReadOnlyField, relations.StringRelatedField)
+
+
+class ValuesReader:
+    # Read-only fast path for a ModelSerializer: it projects the serializer's
+    # fields with values() and applies one precompiled getter per field, so
+    # its output matches serializer(..., many=True).data.
+
+    def __init__(self, serializer_class, related=None, extra=None):
+        self.serializer_class = serializer_class
+        self.related = related or {}
+        self.extra = extra or {}
+
+    @cached_property
+    def fields(self):
+        compiled = []
+        for name, field in self.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            column = self.related.get(name, field.source.replace('.', '__'))
+            getter = None if type(field) in PASSTHROUGH_FIELDS else field.to_representation
+            compiled.append((name, column, getter))
+        compiled.extend((name, column, None) for name, column in self.extra.items())
+        return compiled
+
+    @cached_property
+    def columns(self):
+        return [column for name, column, getter in self.fields]
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def to_representation(self, row):
+        data = {}
+        for name, column, getter in self.fields:
+            value = row[column]
+            data[name] = value if getter is None or value is None else getter(value)
+        return data
+
+    def many(self, rows):
+        rows = list(rows)
+        with serializer_timer():
+            return [self.to_representation(row) for row in rows]
+
+    def iterator(self, queryset, chunk_size):
+        fields = self.fields
+        for values in queryset.values_list(*self.columns).iterator(chunk_size=chunk_size):
+            yield {name: value if getter is None or value is None else getter(value)
+                   for (name, column, getter), value in zip(fields, values)}
+
+
+watchlist_reader = ValuesReader(serializers.WatchListSerializer)
+review_reader = ValuesReader(serializers.ReviewSerializer, related={'review_user': 'review_user__username'})
+# The batch feed knows its users up front and fills in usernames itself.
+user_review_reader = ValuesReader(serializers.ReviewSerializer, related={'review_user': 'review_user_id'})
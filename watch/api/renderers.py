@@ -0,0 +1,73 @@
+import json
+import math
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_encoder = JSONEncoder()
+
+
+def default(obj):
+    # Whatever the fast encoders leave to us is converted exactly as DRF's
+    # encoder would: datetimes, Decimal, lazy strings, querysets, ...
+    return _encoder.default(obj)
+
+
+def non_finite(data):
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(non_finite(value) for value in data)
+    return False
+
+
+def orjson_dumps(data, allow_nan=True):
+    content = orjson.dumps(data, default=default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+    if b'null' in content and non_finite(data):
+        # orjson writes NaN and Infinity as null; the json module emits them,
+        # or raises ValueError when they are not allowed, as JSONRenderer does.
+        content = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, allow_nan=allow_nan,
+                             separators=(',', ':')).encode()
+    # Same as JSONRenderer: keep the output a strict JavaScript subset.
+    if b'\xe2\x80' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+def msgpack_dumps(data):
+    return msgpack.packb(data, default=default, use_bin_type=True)
+
+
+class ORJSONRenderer(JSONRenderer):
+    # A drop-in JSONRenderer with the same compact, unescaped output.
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson_dumps(data, allow_nan=not self.strict)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack_dumps(data)
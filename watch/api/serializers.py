@@ -1,9 +1,14 @@
+from django.contrib.auth.models import User
+from django.utils import timezone
 from rest_framework import serializers
 
-from watch.models import WatchList, StreamPlatform, Review
+from config.metrics import TimedSerializerMixin
+from watch.api.sparse import SparseFieldsMixin
 
+from watch.models import WatchList, StreamPlatform, Review, PlatformStatistics
 
-class ReviewSerializer(serializers.ModelSerializer):
+
+class ReviewSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     review_user = serializers.StringRelatedField(read_only=True)
 
     class Meta:
@@ -12,17 +17,20 @@ class ReviewSerializer(serializers.ModelSerializer):
         # fields = '__all__'
 
 
-class WatchListSerializer(serializers.ModelSerializer):
+class WatchListSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     # reviews = ReviewSerializer(many=True, read_only=True)
     platform = serializers.CharField(source='platform.name')
 
     class Meta:
         model = WatchList
         fields = '__all__'
+        read_only_fields = ('avg_rating', 'number_rating', 'rating_sum')
 
 
-class StreamPlatformSerializer(serializers.ModelSerializer):
-    watchlist = WatchListSerializer(many=True, read_only=True)
+class StreamPlatformSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
+    # Filled in by sparse.prefetch_watchlists() with the first page of titles.
+    watchlist = WatchListSerializer(source='limited_watchlist', many=True, read_only=True)
+    expandable_fields = ('watchlist',)
 
     # watchlist = serializers.StringRelatedField(many=True)
     # watchlist = serializers.HyperlinkedIdentityField(many=True, read_only=True, view_name='watch-detail')
@@ -31,3 +39,139 @@ class StreamPlatformSerializer(serializers.ModelSerializer):
         model = StreamPlatform
         fields = '__all__'
 
+
+class PlatformStatisticsSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
+    name = serializers.CharField(source='platform.name')
+
+    class Meta:
+        model = PlatformStatistics
+        fields = ('platform', 'name', 'title_count', 'review_count', 'avg_rating', 'top_titles', 'updated')
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    batch_size = 1000
+
+    def resolve(self, items):
+        pass
+
+    def to_internal_value(self, data):
+        # Look up every related row of the batch once, before the items are
+        # validated one by one against the resolved rows in the context.
+        if isinstance(data, list):
+            self.resolve([item for item in data if isinstance(item, dict)])
+        return super().to_internal_value(data)
+
+
+def _ids(items, key):
+    ids = set()
+    for item in items:
+        try:
+            ids.add(int(item.get(key)))
+        except (TypeError, ValueError):
+            pass
+    return ids
+
+
+class WatchListBulkListSerializer(BulkListSerializer):
+
+    def resolve(self, items):
+        names = {item.get('platform') for item in items if isinstance(item.get('platform'), str)}
+        platforms = StreamPlatform.objects.filter(name__in=names).order_by('-pk')
+        self.context['platforms'] = {platform.name: platform for platform in platforms}
+        if self.instance is not None:
+            self.context['watchlists'] = WatchList.objects.in_bulk(_ids(items, 'id'))
+
+    def create(self, validated_data):
+        watchlists = [WatchList(**attrs) for attrs in validated_data]
+        return WatchList.objects.bulk_create(watchlists, batch_size=self.batch_size)
+
+    def update(self, instance, validated_data):
+        watchlists = self.context['watchlists']
+        updated = timezone.now()
+        fields = {'updated'}
+
+        changed = []
+        for attrs in validated_data:
+            watchlist = watchlists[attrs.pop('id')]
+            for attr, value in attrs.items():
+                setattr(watchlist, attr, value)
+                fields.add(attr)
+            watchlist.updated = updated
+            changed.append(watchlist)
+
+        WatchList.objects.bulk_update(changed, fields, batch_size=self.batch_size)
+        return changed
+
+
+class WatchListBulkSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    platform = serializers.CharField()
+
+    class Meta:
+        model = WatchList
+        fields = ('id', 'title', 'storyline', 'platform', 'active')
+        list_serializer_class = WatchListBulkListSerializer
+
+    def validate_platform(self, value):
+        platforms = self.context.get('platforms')
+        if platforms is None:
+            platform = StreamPlatform.objects.filter(name=value).order_by('pk').first()
+        else:
+            platform = platforms.get(value)
+
+        if platform is None:
+            raise serializers.ValidationError('Platform not found.')
+        return platform
+
+    def validate(self, attrs):
+        watchlists = self.context.get('watchlists')
+        if watchlists is None:
+            if 'id' in attrs:
+                raise serializers.ValidationError({'id': 'Cannot be set when creating.'})
+        elif attrs.get('id') not in watchlists:
+            raise serializers.ValidationError({'id': 'Watchlist not found.'})
+        return attrs
+
+
+class ReviewBulkListSerializer(BulkListSerializer):
+
+    def resolve(self, items):
+        watchlist_ids = _ids(items, 'watchlist')
+        user_ids = _ids(items, 'review_user')
+        self.context['watchlists'] = WatchList.objects.in_bulk(watchlist_ids)
+        self.context['users'] = User.objects.in_bulk(user_ids)
+        self.context['reviewed'] = set(Review.objects.filter(watchlist__in=watchlist_ids, review_user__in=user_ids)
+                                       .values_list('watchlist_id', 'review_user_id'))
+
+    def create(self, validated_data):
+        reviews = [Review(**attrs) for attrs in validated_data]
+        return Review.objects.bulk_create(reviews, batch_size=self.batch_size)
+
+
+class ReviewBulkSerializer(serializers.ModelSerializer):
+    watchlist = serializers.IntegerField()
+    review_user = serializers.IntegerField()
+
+    class Meta:
+        model = Review
+        fields = ('watchlist', 'review_user', 'rating', 'description', 'active')
+        list_serializer_class = ReviewBulkListSerializer
+
+    def validate_watchlist(self, value):
+        watchlist = self.context['watchlists'].get(value)
+        if watchlist is None:
+            raise serializers.ValidationError('Watchlist not found.')
+        return watchlist
+
+    def validate_review_user(self, value):
+        user = self.context['users'].get(value)
+        if user is None:
+            raise serializers.ValidationError('User not found.')
+        return user
+
+    def validate(self, attrs):
+        key = (attrs['watchlist'].pk, attrs['review_user'].pk)
+        if key in self.context['reviewed']:
+            raise serializers.ValidationError('You have already reviewed this!')
+        self.context['reviewed'].add(key)
+        return attrs
@@ -0,0 +1,86 @@
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from django.db.models import Q
+
+from watch.api.pagination import PAGINATION
+from watch.models import WatchList
+
+
+def requested(request, param):
+    value = request.query_params.get(param) if request is not None else None
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def expanded(request, field):
+    return field in (requested(request, 'expand') or ())
+
+
+class SparseFieldsMixin:
+    # On the top-level serializer only: ?fields=a,b keeps just those fields on
+    # reads, and expandable_fields are left out unless named in ?expand=.
+    expandable_fields = ()
+
+    def is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.is_root():
+            return fields
+
+        request = self.context.get('request')
+        for name in self.expandable_fields:
+            if not expanded(request, name):
+                fields.pop(name, None)
+
+        only = requested(request, 'fields')
+        if only and request.method in SAFE_METHODS:
+            for name in list(fields):
+                if name not in only:
+                    fields.pop(name)
+        return fields
+
+
+def prefetch_watchlists(platforms):
+    # Loads the first NESTED_PAGE_SIZE titles of each platform in one query.
+    # Every "id IN (... LIMIT n)" subquery walks the platform index, so the
+    # cost follows the page of platforms, not the size of the catalog.
+    limit = PAGINATION.get('NESTED_PAGE_SIZE', 20)
+    platforms = list(platforms)
+    if not platforms:
+        return platforms
+
+    query = Q()
+    for platform in platforms:
+        query |= Q(pk__in=WatchList.objects.filter(platform=platform.pk).order_by('id').values('pk')[:limit])
+
+    watchlists = {}
+    for watchlist in WatchList.objects.filter(query).order_by('id'):
+        watchlists.setdefault(watchlist.platform_id, []).append(watchlist)
+
+    # Stored like Prefetch(to_attr=...); the serializer reads this attribute.
+    for platform in platforms:
+        platform.limited_watchlist = watchlists.get(platform.pk, [])
+        for watchlist in platform.limited_watchlist:
+            watchlist.platform = platform
+    return platforms
+
+
+class ExpandWatchlistsMixin:
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and expanded(self.request, 'watchlist'):
+            prefetch_watchlists(page)
+        return page
+
+    def get_object(self):
+        platform = super().get_object()
+        if expanded(self.request, 'watchlist'):
+            prefetch_watchlists([platform])
+        return platform
@@ -1,9 +1,98 @@
-from rest_framework.throttling import UserRateThrottle
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle, SimpleRateThrottle, UserRateThrottle
 
+FIXED_WINDOW = 'fixed'
+SLIDING_WINDOW = 'sliding'
 
-class ReviewCreateThrottle(UserRateThrottle):
+
+class CounterRateThrottle(SimpleRateThrottle):
+    # Replaces SimpleRateThrottle's cached list of timestamps with one atomic
+    # counter per window, so each key costs two integers and concurrent
+    # workers sharing the cache cannot overwrite each other's history.
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'WATCH_THROTTLE', {}).get('CACHE_ALIAS', 'default')]
+
+    @property
+    def algorithm(self):
+        return getattr(settings, 'WATCH_THROTTLE', {}).get('ALGORITHM', SLIDING_WINDOW)
+
+    def window_key(self, window):
+        return '%s:%s' % (self.key, window)
+
+    def increment(self, key):
+        for _ in range(2):
+            if self.cache.add(key, 1, self.duration * 2):
+                return 1
+            try:
+                return self.cache.incr(key)
+            except ValueError:
+                # The counter expired between add() and incr(); start it again.
+                continue
+        return 1
+
+    def decrement(self, key, value):
+        try:
+            return self.cache.decr(key)
+        except ValueError:
+            # The counter expired after increment(); re-seed it without this request.
+            self.cache.add(key, value - 1, self.duration * 2)
+            return value - 1
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, offset = divmod(self.now, self.duration)
+        self.elapsed = offset / self.duration
+        self.current_key = self.window_key(int(window))
+
+        self.current = self.increment(self.current_key)
+        self.previous = 0
+        if self.algorithm == SLIDING_WINDOW:
+            self.previous = self.cache.get(self.window_key(int(window) - 1), 0)
+
+        if self.previous * (1 - self.elapsed) + self.current > self.num_requests:
+            # Rejected requests do not use up the allowance.
+            self.current = self.decrement(self.current_key, self.current)
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        remaining = self.duration * (1 - self.elapsed)
+        if self.current >= self.num_requests or not self.previous:
+            return remaining
+
+        # Time until the previous window's weight has decayed enough for one more request.
+        needed = 1 - (self.num_requests - self.current - 1) / self.previous
+        return max(0.0, (needed - self.elapsed) * self.duration)
+
+
+class UserCounterThrottle(UserRateThrottle, CounterRateThrottle):
+    pass
+
+
+class AnonCounterThrottle(AnonRateThrottle, CounterRateThrottle):
+    pass
+
+
+class ScopedCounterThrottle(ScopedRateThrottle, CounterRateThrottle):
+    pass
+
+
+class ReviewCreateThrottle(UserCounterThrottle):
     scope = 'review-create'
 
 
-class ReviewListThrottle(UserRateThrottle):
+class ReviewListThrottle(UserCounterThrottle):
     scope = 'review-list'
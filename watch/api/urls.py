@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from . import views
+from . import async_views, views
 
 router = DefaultRouter()
 router.register('stream', views.StreamPlatformVS, basename='stream-platform')
@@ -9,7 +9,10 @@ router.register('stream', views.StreamPlatformVS, basename='stream-platform')
 urlpatterns = [
     path('list/', views.WatchListAV.as_view(), name='watch-list'),
     path('<int:pk>/', views.WatchDetailAV.as_view(), name='watch-detail'),
+    path('batch/', views.WatchListBatchAV.as_view(), name='watch-batch'),
     path('list2/', views.WatchListGV.as_view(), name='watch-list2'),
+    path('search/', views.WatchListSearchAV.as_view(), name='watch-search'),
+    path('list/bulk/', views.WatchListBulkAV.as_view(), name='watch-list-bulk'),
 
     path('', include(router.urls)),
     # path('stream/', views.StreamPlatformAV.as_view(), name='stream-list'),
@@ -20,4 +23,18 @@ urlpatterns = [
     path('review/<int:pk>/', views.ReviewDetail.as_view(), name='review-detail'),
 
     path('reviews/', views.UserReview.as_view(), name='user-review-detail'),
+    path('reviews/users/', views.UserReviewBatch.as_view(), name='user-review-batch'),
+    path('reviews/bulk/', views.ReviewBulkAV.as_view(), name='review-bulk'),
+
+    path('export/watchlists/', views.WatchListExportAV.as_view(), name='export-watchlists'),
+    path('export/reviews/', views.ReviewExportAV.as_view(), name='export-reviews'),
+
+    path('cache/stats/', views.CacheStatsAV.as_view(), name='cache-stats'),
+
+    path('stats/platforms/', views.PlatformStatisticsList.as_view(), name='platform-stats-list'),
+    path('stats/platforms/<int:pk>/', views.PlatformStatisticsDetail.as_view(), name='platform-stats-detail'),
+
+    path('async/<int:pk>/', async_views.WatchDetailAsync.as_async_view(), name='watch-detail-async'),
+    path('async/<int:pk>/reviews/', async_views.ReviewListAsync.as_async_view(), name='review-list-async'),
+    path('async/stream/', async_views.StreamPlatformListAsync.as_async_view(), name='stream-platform-list-async'),
 ]
\ No newline at end of file
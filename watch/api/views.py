@@ -1,22 +1,81 @@
 from rest_framework import status, filters, generics, viewsets, exceptions, response, views
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle, ScopedRateThrottle
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 
-from watch.api import serializers, pagination, permissions, throttling
-from watch.models import WatchList, StreamPlatform, Review
+from watch import jobs, ratings, search, statistics, tasks
+from watch.api import (cache, conditional, export, feeds, readers, renderers, serializers, pagination, permissions,
+                       sparse, throttling)
+from watch.models import WatchList, StreamPlatform, Review, PlatformStatistics
 
 
-class UserReview(generics.ListAPIView):
+class FastReadMixin:
+    reader = None
+
+    def list(self, request, *args, **kwargs):
+        if self.reader is None or not settings.WATCH_FAST_READ or 'fields' in request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.reader.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.reader.many(page))
+        return response.Response(self.reader.many(queryset))
+
+
+class UserReview(FastReadMixin, generics.ListAPIView):
     serializer_class = serializers.ReviewSerializer
+    reader = readers.review_reader
+    pagination_class = pagination.UserReviewCPagination
 
     # def get_queryset(self):
     #     username = self.kwargs['username']
     #     return Review.objects.filter(review_user__username=username)
 
+    @cached_property
+    def review_user_id(self):
+        # Resolved once, so the feed filters on the (review_user, created)
+        # index instead of joining auth_user on username.
+        params = self.request.query_params
+        if 'user' in params:
+            try:
+                users = User.objects.filter(pk=int(params['user']))
+            except ValueError:
+                raise exceptions.ValidationError({'user': 'Expected a user id.'})
+        else:
+            users = User.objects.filter(username=params.get('username'))
+        return users.values_list('pk', flat=True).first()
+
     def get_queryset(self):
-        username = self.request.query_params.get('username')
-        return Review.objects.filter(review_user__username=username)
+        if getattr(self, 'swagger_fake_view', False) or self.review_user_id is None:
+            return Review.objects.none()
+        return Review.objects.filter(review_user=self.review_user_id).select_related('review_user')
+
+
+class UserReviewBatch(views.APIView):
+    # Recent reviews of many users, e.g. a friends' activity screen, from a
+    # single review query; users are listed in the order they were asked for.
+
+    def get(self, request):
+        user_ids = feeds.parse_user_ids(request.query_params.get('ids'))
+        users = dict(User.objects.filter(pk__in=user_ids).values_list('pk', 'username'))
+        reviews = feeds.recent_reviews(list(users), feeds.parse_limit(request.query_params.get('limit')))
+
+        results = {user_id: {'user': user_id, 'username': users[user_id], 'reviews': []}
+                   for user_id in user_ids if user_id in users}
+        for row in readers.user_review_reader.many(readers.user_review_reader.values(reviews)):
+            entry = results[row['review_user']]
+            row['review_user'] = entry['username']
+            entry['reviews'].append(row)
+
+        return response.Response({
+            'results': list(results.values()),
+            'missing': [user_id for user_id in user_ids if user_id not in users],
+        })
 
 
 class ReviewCreate(generics.CreateAPIView):
@@ -32,55 +91,94 @@ class ReviewCreate(generics.CreateAPIView):
         watchlist = WatchList.objects.get(pk=pk)
 
         review_user = self.request.user
-        review_queryset = Review.objects.filter(watchlist=watchlist, review_user=review_user)
 
-        if review_queryset.exists():
+        try:
+            with transaction.atomic():
+                review = serializer.save(watchlist=watchlist, review_user=review_user)
+                ratings.add_rating(watchlist.pk, review.rating)
+        except IntegrityError:
             raise exceptions.ValidationError('You have already reviewed this!')
 
-        if watchlist.number_rating == 0:
-            watchlist.avg_rating = serializer.validated_data['rating']
-        else:
-            watchlist.avg_rating = (watchlist.avg_rating + serializer.validated_data['rating']) / 2
-
-        watchlist.number_rating = watchlist.number_rating + 1
-        watchlist.save()
 
-        serializer.save(watchlist=watchlist, review_user=review_user)
-
-
-class ReviewList(generics.ListCreateAPIView):
+class ReviewList(FastReadMixin, generics.ListCreateAPIView):
     # permission_classes = [IsAuthenticated]
-    throttle_classes = [throttling.ReviewListThrottle, AnonRateThrottle]
+    throttle_classes = [throttling.ReviewListThrottle, throttling.AnonCounterThrottle]
     serializer_class = serializers.ReviewSerializer
+    reader = readers.review_reader
+    pagination_class = pagination.ReviewCPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['review_user__username', 'active']
 
     def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Review.objects.none()
         pk = self.kwargs['pk']
-        return Review.objects.filter(watchlist=pk)
+        return Review.objects.filter(watchlist=pk).select_related('review_user')
+
+    @conditional.condition(conditional.review_list_validator, last_modified=False)
+    @cache.cache_response('reviews:{pk}')
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
 
 class ReviewDetail(generics.RetrieveUpdateDestroyAPIView):
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [throttling.ScopedCounterThrottle]
     throttle_scope = 'review-detail'
     permission_classes = [permissions.IsReviewUserOrReadOnly]
-    queryset = Review.objects.all()
+    queryset = Review.objects.select_related('review_user')
     serializer_class = serializers.ReviewSerializer
 
-
-class StreamPlatformVS(viewsets.ModelViewSet):
+    def locked_rating(self, instance):
+        # The stored rating under a row lock: a concurrent update or delete of
+        # the same review waits, so each delta is applied exactly once.
+        rating = Review.objects.select_for_update().filter(pk=instance.pk).values_list('rating', flat=True).first()
+        if rating is None:
+            raise exceptions.NotFound()
+        return rating
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            old_rating = self.locked_rating(serializer.instance)
+            review = serializer.save()
+            ratings.change_rating(review.watchlist_id, old_rating, review.rating)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            rating = self.locked_rating(instance)
+            deleted, _ = instance.delete()
+            if deleted:
+                ratings.remove_rating(instance.watchlist_id, rating)
+
+
+class StreamPlatformVS(sparse.ExpandWatchlistsMixin, viewsets.ModelViewSet):
     queryset = StreamPlatform.objects.all()
     serializer_class = serializers.StreamPlatformSerializer
     permission_classes = [permissions.IsAdminOrReadOnly]
+    pagination_class = pagination.StreamPlatformCPagination
+
+    @conditional.condition(conditional.platform_validator, last_modified=False)
+    @cache.cache_response('platforms')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional.condition(conditional.platform_validator, last_modified=False)
+    @cache.cache_response('platform:{pk}')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
 
 class StreamPlatformAV(views.APIView):
     permission_classes = [permissions.IsAdminOrReadOnly]
 
+    @conditional.condition(conditional.platform_validator, last_modified=False)
+    @cache.cache_response('platforms')
     def get(self, request):
-        platform = StreamPlatform.objects.all()
-        serializer = serializers.StreamPlatformSerializer(platform, many=True)
-        return response.Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = pagination.StreamPlatformCPagination()
+        page = paginator.paginate_queryset(StreamPlatform.objects.all(), request, view=self)
+        if sparse.expanded(request, 'watchlist'):
+            sparse.prefetch_watchlists(page)
+        serializer = serializers.StreamPlatformSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = serializers.StreamPlatformSerializer(data=request.data)
@@ -93,12 +191,16 @@ class StreamPlatformAV(views.APIView):
 class StreamPlatformDetailAV(views.APIView):
     permission_classes = [permissions.IsAdminOrReadOnly]
 
+    @conditional.condition(conditional.platform_validator, last_modified=False)
+    @cache.cache_response('platform:{pk}')
     def get(self, request, pk):
         try:
             platform = StreamPlatform.objects.get(pk=pk)
         except StreamPlatform.DoesNotExist:
             return response.Response({'error': 'Platform not found'}, status=status.HTTP_404_NOT_FOUND)
-        serializer = serializers.StreamPlatformSerializer(platform)
+        if sparse.expanded(request, 'watchlist'):
+            sparse.prefetch_watchlists([platform])
+        serializer = serializers.StreamPlatformSerializer(platform, context={'request': request})
         return response.Response(serializer.data)
 
     def put(self, request, pk):
@@ -121,9 +223,10 @@ class StreamPlatformDetailAV(views.APIView):
         return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class WatchListGV(generics.ListAPIView):
-    queryset = WatchList.objects.all()
+class WatchListGV(FastReadMixin, generics.ListAPIView):
+    queryset = WatchList.objects.select_related('platform')
     serializer_class = serializers.WatchListSerializer
+    reader = readers.watchlist_reader
     pagination_class = pagination.WatchListCPagination
 
     # filter_backends = [DjangoFilterBackend]
@@ -136,13 +239,33 @@ class WatchListGV(generics.ListAPIView):
     # ordering_fields  = ['avg_rating']
 
 
+class WatchListSearchAV(views.APIView):
+    permission_classes = [permissions.IsAdminOrReadOnly]
+
+    def get(self, request):
+        paginator = pagination.SearchPagination()
+        ids = paginator.paginate_ids(search.search, request.query_params.get('q', ''), request)
+
+        items = WatchList.objects.select_related('platform').in_bulk(ids)
+        serializer = serializers.WatchListSerializer([items[pk] for pk in ids if pk in items], many=True,
+                                                    context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+
 class WatchListAV(views.APIView):
     permission_classes = [permissions.IsAdminOrReadOnly]
 
+    @cache.cache_response('watchlists')
     def get(self, request):
-        items = WatchList.objects.all()
-        serializer = serializers.WatchListSerializer(items, many=True)
-        return response.Response(serializer.data, status=status.HTTP_200_OK)
+        items = WatchList.objects.select_related('platform')
+        paginator = pagination.WatchListCPagination()
+        if settings.WATCH_FAST_READ and 'fields' not in request.query_params:
+            page = paginator.paginate_queryset(readers.watchlist_reader.values(items), request, view=self)
+            return paginator.get_paginated_response(readers.watchlist_reader.many(page))
+
+        page = paginator.paginate_queryset(items, request, view=self)
+        serializer = serializers.WatchListSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = serializers.WatchListSerializer(data=request.data)
@@ -155,17 +278,19 @@ class WatchListAV(views.APIView):
 class WatchDetailAV(views.APIView):
     permission_classes = [permissions.IsAdminOrReadOnly]
 
+    @conditional.condition(conditional.watchlist_validator)
+    @cache.cache_response('watchlist:{pk}')
     def get(self, request, pk):
         try:
-            item = WatchList.objects.get(pk=pk)
+            item = WatchList.objects.select_related('platform').get(pk=pk)
         except WatchList.DoesNotExist:
             return response.Response({'error': 'Item not found'}, status=status.HTTP_404_NOT_FOUND)
-        serializer = serializers.WatchListSerializer(item)
+        serializer = serializers.WatchListSerializer(item, context={'request': request})
         return response.Response(serializer.data)
 
     def put(self, request, pk):
         try:
-            item = WatchList.objects.get(pk=pk)
+            item = WatchList.objects.select_related('platform').get(pk=pk)
         except WatchList.DoesNotExist:
             return response.Response({'error': 'Movie not found'}, status=status.HTTP_404_NOT_FOUND)
         serializer = serializers.WatchListSerializer(item, data=request.data)
@@ -181,3 +306,138 @@ class WatchDetailAV(views.APIView):
             return response.Response({'error': 'Movie not found'}, status=status.HTTP_404_NOT_FOUND)
         item.delete()
         return response.Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class WatchListBatchAV(views.APIView):
+    # Multi-get for carousels: ?ids=1,2,3 or {"ids": [1, 2, 3]} returns the
+    # titles in the order asked for, each as watch-detail renders it.
+    read_only = True
+
+    def get(self, request):
+        return self.fetch(request, request.query_params.get('ids'))
+
+    def post(self, request):
+        return self.fetch(request, request.data.get('ids') if isinstance(request.data, dict) else request.data)
+
+    def fetch(self, request, ids):
+        pks = feeds.parse_ids(ids, settings.WATCH_MULTI_GET_MAX_IDS)
+
+        def load(pks):
+            items = WatchList.objects.select_related('platform').in_bulk(pks)
+            return {pk: serializers.WatchListSerializer(item, context={'request': request}).data
+                    for pk, item in items.items()}
+
+        items = cache.cached_items(request, 'watch-detail', 'watchlist:{pk}', pks, load, exclude=('ids',))
+        return response.Response({
+            'results': [items[pk] for pk in pks if pk in items],
+            'missing': [pk for pk in pks if pk not in items],
+        })
+
+
+class CacheStatsAV(views.APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return response.Response(cache.stats())
+
+
+class ExportAV(views.APIView):
+    permission_classes = [IsAdminUser]
+    renderer_classes = [export.NDJSONRenderer, renderers.ORJSONRenderer] + (
+        [renderers.MessagePackRenderer] if renderers.msgpack is not None else [])
+    rows = None
+
+    def get(self, request):
+        since = export.parse_since(request.query_params.get('since'))
+        encode, content_type = export.stream_format(request.accepted_renderer)
+        return StreamingHttpResponse(self.rows(since, encode=encode), content_type=content_type)
+
+
+class WatchListExportAV(ExportAV):
+    rows = staticmethod(export.watchlist_rows)
+
+
+class ReviewExportAV(ExportAV):
+    rows = staticmethod(export.review_rows)
+
+
+class BulkAV(views.APIView):
+    permission_classes = [IsAdminUser]
+
+    def get_serializer(self, *args, **kwargs):
+        data = kwargs.get('data')
+        if isinstance(data, list) and len(data) > settings.WATCH_BULK_MAX_ITEMS:
+            raise exceptions.ValidationError('At most %s items per request.' % settings.WATCH_BULK_MAX_ITEMS)
+        return self.serializer_class(*args, many=True, **kwargs)
+
+
+class WatchListBulkAV(BulkAV):
+    serializer_class = serializers.WatchListBulkSerializer
+
+    def save(self, serializer):
+        # Bulk writes skip the model signals, so the platforms a patch moves
+        # titles away from are collected before saving.
+        platform_ids = {watchlist.platform_id for watchlist in serializer.context.get('watchlists', {}).values()}
+
+        with transaction.atomic():
+            watchlists = serializer.save()
+            tags = set()
+            for watchlist in watchlists:
+                tags.update(cache.watchlist_tags(watchlist.pk, watchlist.platform_id))
+                platform_ids.add(watchlist.platform_id)
+            cache.invalidate_on_commit(*tags)
+            statistics.rebuild(platform_ids)
+            if jobs.enabled():
+                tasks.schedule_warm(watchlist.pk for watchlist in watchlists)
+        return serializers.WatchListSerializer(watchlists, many=True).data
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        if serializer.is_valid():
+            return response.Response(self.save(serializer), status=status.HTTP_201_CREATED)
+        return response.Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def patch(self, request):
+        serializer = self.get_serializer([], data=request.data, partial=True)
+        if serializer.is_valid():
+            return response.Response(self.save(serializer))
+        return response.Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ReviewBulkAV(BulkAV):
+    serializer_class = serializers.ReviewBulkSerializer
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return response.Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with transaction.atomic():
+                reviews = serializer.save()
+                watchlists = {review.watchlist.pk: review.watchlist for review in reviews}
+                ratings.recompute_ratings(WatchList.objects.filter(pk__in=watchlists))
+                statistics.rebuild({watchlist.platform_id for watchlist in watchlists.values()})
+
+                tags = set()
+                for watchlist in watchlists.values():
+                    tags.update(cache.watchlist_tags(watchlist.pk, watchlist.platform_id))
+                    tags.add('reviews:%s' % watchlist.pk)
+                cache.invalidate_on_commit(*tags)
+                if jobs.enabled():
+                    tasks.schedule_warm(watchlists)
+        except IntegrityError:
+            raise exceptions.ValidationError('You have already reviewed this!')
+
+        return response.Response(serializers.ReviewSerializer(reviews, many=True).data, status=status.HTTP_201_CREATED)
+
+
+class PlatformStatisticsList(generics.ListAPIView):
+    queryset = PlatformStatistics.objects.select_related('platform')
+    serializer_class = serializers.PlatformStatisticsSerializer
+    pagination_class = pagination.PlatformStatisticsCPagination
+
+
+class PlatformStatisticsDetail(generics.RetrieveAPIView):
+    queryset = PlatformStatistics.objects.select_related('platform')
+    serializer_class = serializers.PlatformStatisticsSerializer
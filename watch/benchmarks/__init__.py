@@ -0,0 +1,61 @@
+import json
+import time
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def percentile(timings, pct):
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def format_ms(seconds):
+    return '%.3f ms' % (seconds * 1000)
+
+
+@contextmanager
+def rollback(keep=False):
+    with transaction.atomic():
+        yield
+        if not keep:
+            transaction.set_rollback(True)
+
+
+def save_baseline(path, name, rows, repeat, results):
+    baseline = {'benchmark': name, 'database': connection.vendor, 'rows': rows, 'repeat': repeat, 'results': results}
+    with open(path, 'w') as fh:
+        json.dump(baseline, fh, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def regressions(baseline, results, threshold):
+    # Latencies may grow by `threshold` (a fraction) before being flagged;
+    # any increase in the query count is a regression.
+    found = []
+    for case, current in sorted(results.items()):
+        previous = baseline.get(case)
+        if previous is None:
+            continue
+        for metric in ('p50', 'p99'):
+            if current[metric] > previous[metric] * (1 + threshold):
+                found.append((case, metric, previous[metric], current[metric]))
+        if current['queries'] > previous['queries']:
+            found.append((case, 'queries', previous['queries'], current['queries']))
+        if current['throughput'] < previous['throughput'] / (1 + threshold):
+            found.append((case, 'throughput', previous['throughput'], current['throughput']))
+    return found
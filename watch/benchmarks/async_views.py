@@ -0,0 +1,68 @@
+import asyncio
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import AsyncClient
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.throttling import SimpleRateThrottle
+
+from watch.benchmarks import format_ms, percentile, rollback, seed
+
+CONCURRENCY = (1, 10, 50)
+UNTHROTTLED = {scope: '1000000/min' for scope in ('anon', 'user', 'review-list')}
+
+
+async def load(url, headers, total, concurrency):
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def request():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(url, **headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise AssertionError('%s returned %s' % (url, response.status_code))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(total)))
+    return latencies, time.perf_counter() - start
+
+
+def run(command, rows, repeat, keep):
+    with rollback(keep), \
+            override_settings(WATCH_RESPONSE_CACHE={'ENABLED': False}), \
+            mock.patch.dict(SimpleRateThrottle.THROTTLE_RATES, UNTHROTTLED):
+        watchlist_ids = seed.seed_catalog(platforms=max(1, min(rows // 10, 1000)), watchlists=rows)
+        user_ids = seed.seed_users(min(rows, 200))
+        seed.seed_reviews(len(user_ids), watchlist_ids[:1], user_ids)
+        seed.analyze()
+
+        user = User.objects.create_user(username='bench-async', password='!')
+        headers = {'AUTHORIZATION': 'Token %s' % Token.objects.get(user=user).key}
+
+        endpoints = [
+            ('watch detail', reverse('watch-detail', args=(watchlist_ids[0],)),
+             reverse('watch-detail-async', args=(watchlist_ids[0],))),
+            ('review list', reverse('review-list', args=(watchlist_ids[0],)),
+             reverse('review-list-async', args=(watchlist_ids[0],))),
+            ('platform list', reverse('stream-platform-list'), reverse('stream-platform-list-async')),
+        ]
+
+        # Requests go through the ASGI handler in-process; the response cache is
+        # off so both variants do the same database work.
+        command.stdout.write('In-process ASGI load, %s requests per run.' % (repeat * 10))
+        command.stdout.write('%-14s %6s %-6s %12s %14s %14s' % ('endpoint', 'conc', 'mode', 'req/s', 'p50', 'p99'))
+        for name, sync_url, async_url in endpoints:
+            for concurrency in CONCURRENCY:
+                for mode, url in (('sync', sync_url), ('async', async_url)):
+                    latencies, elapsed = async_to_sync(load)(url, headers, repeat * 10, concurrency)
+                    command.stdout.write('%-14s %6s %-6s %12.1f %14s %14s' % (
+                        name, concurrency, mode, len(latencies) / elapsed,
+                        format_ms(percentile(latencies, 50)), format_ms(percentile(latencies, 99)),
+                    ))
@@ -0,0 +1,146 @@
+import time
+from statistics import median
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from watch.benchmarks import format_ms, percentile, rollback, seed
+from watch.models import Review, StreamPlatform
+
+UNTHROTTLED = {scope: '1000000/min' for scope in ('anon', 'user', 'review-create', 'review-list', 'review-detail')}
+PASSWORD = 'Bench@12345'
+
+
+def get(name, path, token=None):
+    return name, lambda i: ('get', path, None, token)
+
+
+def read_cases(watchlist_ids, user_ids, tokens, admin):
+    watchlist = watchlist_ids[0]
+    platform = StreamPlatform.objects.order_by('pk').values_list('pk', flat=True)[0]
+    review = Review.objects.filter(review_user=user_ids[0]).order_by('pk').first()
+    owner = tokens[user_ids[0]]
+    query = str(len(watchlist_ids) // 2)
+
+    return [
+        get('watch-list', reverse('watch-list'), owner),
+        get('watch-list2', reverse('watch-list2'), owner),
+        get('watch-detail', reverse('watch-detail', args=(watchlist,)), owner),
+        get('watch-batch', '%s?ids=%s' % (reverse('watch-batch'), ','.join(map(str, watchlist_ids[:50]))), owner),
+        get('watch-detail-async', reverse('watch-detail-async', args=(watchlist,)), owner),
+        get('watch-search', '%s?q=%s' % (reverse('watch-search'), query), owner),
+        get('stream-platform-list', reverse('stream-platform-list'), owner),
+        get('stream-platform-list?expand', reverse('stream-platform-list') + '?expand=watchlist', owner),
+        get('stream-platform-list-async', reverse('stream-platform-list-async'), owner),
+        get('stream-platform-detail', reverse('stream-platform-detail', args=(platform,)), owner),
+        get('review-list', reverse('review-list', args=(watchlist,)), owner),
+        get('review-list-async', reverse('review-list-async', args=(watchlist,)), owner),
+        get('review-detail', reverse('review-detail', args=(review.pk,)), owner),
+        get('user-review-detail', '%s?username=bench0' % reverse('user-review-detail'), owner),
+        get('user-review-batch', '%s?ids=%s' % (reverse('user-review-batch'), ','.join(map(str, user_ids))), owner),
+        get('platform-stats-list', reverse('platform-stats-list'), owner),
+        get('platform-stats-detail', reverse('platform-stats-detail', args=(platform,)), owner),
+        get('export-watchlists', reverse('export-watchlists'), admin),
+        get('export-reviews', reverse('export-reviews'), admin),
+        get('cache-stats', reverse('cache-stats'), admin),
+        get('auth-cache-stats', reverse('auth-cache-stats'), admin),
+    ]
+
+
+def cases(watchlist_ids, user_ids, tokens, admin, writer):
+    review = Review.objects.filter(review_user=user_ids[0]).order_by('pk').first()
+    owner = tokens[user_ids[0]]
+
+    def create_review(i):
+        return 'post', reverse('review-create', args=(watchlist_ids[i % len(watchlist_ids)],)), \
+            {'rating': i % 5 + 1, 'description': 'Benchmark'}, admin
+
+    def update_review(i):
+        return 'put', reverse('review-detail', args=(review.pk,)), {'rating': i % 5 + 1, 'description': 'Edited'}, owner
+
+    def bulk_watchlists(i):
+        data = [{'title': 'Bulk %s-%s' % (i, j), 'storyline': 'Benchmark', 'platform': 'Platform 0'}
+                for j in range(10)]
+        return 'post', reverse('watch-list-bulk'), data, admin
+
+    def bulk_reviews(i):
+        data = [{'watchlist': watchlist_ids[(i * 10 + j) % len(watchlist_ids)], 'review_user': writer, 'rating': 3}
+                for j in range(10)]
+        return 'post', reverse('review-bulk'), data, admin
+
+    def login(i):
+        return 'post', reverse('login'), {'username': 'bench-login', 'password': PASSWORD}, None
+
+    def register(i):
+        return 'post', reverse('register'), {'username': 'bench-register-%s' % i, 'email': 'bench%s@example.com' % i,
+                                             'password': PASSWORD, 'password2': PASSWORD}, None
+
+    def logout(i):
+        user = User.objects.create_user(username='bench-logout-%s' % i, password='!')
+        return 'post', reverse('logout'), None, Token.objects.get(user=user).key
+
+    return read_cases(watchlist_ids, user_ids, tokens, admin) + [
+        ('review-create', create_review),
+        ('review-detail:put', update_review),
+        ('watch-list-bulk', bulk_watchlists),
+        ('review-bulk', bulk_reviews),
+        ('login', login),
+        ('register', register),
+        ('logout', logout),
+    ]
+
+
+def request(client, method, path, data, token):
+    if token:
+        client.credentials(HTTP_AUTHORIZATION='Token %s' % token)
+    else:
+        client.credentials()
+
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = getattr(client, method)(path, data, format='json')
+        if response.streaming:
+            b''.join(response.streaming_content)
+        elapsed = time.perf_counter() - start
+
+    if response.status_code >= 400:
+        raise CommandError('%s %s returned %s' % (method.upper(), path, response.status_code))
+    return elapsed, len(queries)
+
+
+def run(command, rows, repeat, keep):
+    with rollback(keep), mock.patch.dict(SimpleRateThrottle.THROTTLE_RATES, UNTHROTTLED):
+        # Bulk review writes need ten fresh watchlists per run.
+        watchlist_ids, user_ids, tokens = seed.seed_dataset(
+            platforms=max(1, rows // 1000), watchlists=max(rows, repeat * 10), reviews=rows, users=10)
+        admin = Token.objects.get(user=User.objects.create_superuser(username='bench-admin', password=PASSWORD)).key
+        writer = User.objects.create_user(username='bench-writer', password='!').pk
+        User.objects.create_user(username='bench-login', password=PASSWORD)
+
+        client = APIClient()
+        results = {}
+        command.stdout.write('%-28s %10s %14s %14s %8s' % ('endpoint', 'req/s', 'p50', 'p99', 'queries'))
+        for name, prepare in cases(watchlist_ids, user_ids, tokens, admin, writer):
+            timings, queries = [], []
+            for i in range(repeat):
+                elapsed, count = request(client, *prepare(i))
+                timings.append(elapsed)
+                queries.append(count)
+
+            results[name] = {
+                'throughput': len(timings) / sum(timings),
+                'p50': percentile(timings, 50),
+                'p99': percentile(timings, 99),
+                'queries': median(queries),
+            }
+            command.stdout.write('%-28s %10.1f %14s %14s %8s' % (
+                name, results[name]['throughput'], format_ms(results[name]['p50']),
+                format_ms(results[name]['p99']), results[name]['queries']))
+        return results
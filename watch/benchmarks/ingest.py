@@ -0,0 +1,38 @@
+import time
+
+from watch.api import serializers
+from watch.benchmarks import rollback, seed
+
+
+def payload(rows, offset):
+    return [{'title': 'Title %s' % i, 'storyline': 'Storyline of title %s' % i,
+             'platform': 'Platform %s' % (i % 10), 'active': True}
+            for i in range(offset, offset + rows)]
+
+
+def per_item(items):
+    for item in items:
+        serializer = serializers.WatchListBulkSerializer(data=item)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+
+def bulk(items):
+    serializer = serializers.WatchListBulkSerializer(data=items, many=True)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+
+def run(command, rows, repeat, keep):
+    with rollback(keep):
+        seed.seed_catalog(platforms=10, watchlists=0)
+
+        results = {}
+        for label, ingest, offset in (('per-item', per_item, 0), ('bulk', bulk, rows)):
+            items = payload(rows, offset)
+            start = time.perf_counter()
+            ingest(items)
+            results[label] = rows / (time.perf_counter() - start)
+            command.stdout.write('%-10s %12.0f items/s' % (label, results[label]))
+
+        command.stdout.write('speedup    %12.1fx' % (results['bulk'] / results['per-item']))
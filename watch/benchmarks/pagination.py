@@ -0,0 +1,42 @@
+from statistics import median
+
+from rest_framework.pagination import Cursor
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from watch.api import pagination
+from watch.benchmarks import format_ms, measure, rollback, seed
+from watch.models import WatchList
+
+PAGE_SIZE = 20
+
+
+def offset_page(depth):
+    paginator = pagination.WatchListLOPagination()
+    request = Request(APIRequestFactory().get('/', {'start': depth, 'limit': PAGE_SIZE}))
+    queryset = WatchList.objects.order_by('created', 'id')
+    return lambda: paginator.paginate_queryset(queryset, request)
+
+
+def cursor_page(depth):
+    paginator = pagination.WatchListCPagination()
+    paginator.base_url = 'http://testserver/'
+    paginator.page_size = PAGE_SIZE
+
+    created = WatchList.objects.order_by('created', 'id').values_list('created', flat=True)[depth]
+    cursor = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=str(created)))
+    request = Request(APIRequestFactory().get(cursor))
+    return lambda: paginator.paginate_queryset(WatchList.objects.all(), request)
+
+
+def run(command, rows, repeat, keep):
+    with rollback(keep):
+        seed.seed_catalog(platforms=10, watchlists=rows)
+        seed.analyze()
+
+        command.stdout.write('Seeded %s watchlists, %s rows per page.' % (rows, PAGE_SIZE))
+        command.stdout.write('%12s %16s %16s' % ('depth', 'offset', 'cursor'))
+        for depth in sorted({0, rows // 100, rows // 10, rows // 2, max(0, rows - PAGE_SIZE - 1)}):
+            offset = median(measure(offset_page(depth), repeat))
+            cursor = median(measure(cursor_page(depth), repeat))
+            command.stdout.write('%12s %16s %16s' % (depth, format_ms(offset), format_ms(cursor)))
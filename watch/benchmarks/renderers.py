@@ -0,0 +1,46 @@
+from statistics import median
+from unittest import mock
+
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from watch.api import renderers
+from watch.benchmarks import endpoints, format_ms, measure, rollback, seed
+
+
+def available():
+    found = [('json', JSONRenderer())]
+    if renderers.orjson is not None:
+        found.append(('orjson', renderers.ORJSONRenderer()))
+    if renderers.msgpack is not None:
+        found.append(('msgpack', renderers.MessagePackRenderer()))
+    return found
+
+
+def run(command, rows, repeat, keep):
+    with rollback(keep), mock.patch.dict(SimpleRateThrottle.THROTTLE_RATES, endpoints.UNTHROTTLED):
+        watchlist_ids, user_ids, tokens = seed.seed_dataset(
+            platforms=max(1, rows // 1000), watchlists=rows, reviews=rows, users=10)
+        admin = Token.objects.get(user=User.objects.create_superuser(username='bench-admin', password='!')).key
+
+        client = APIClient()
+        command.stdout.write('%-28s %-8s %12s %10s' % ('endpoint', 'renderer', 'encode', 'bytes'))
+        for name, prepare in endpoints.read_cases(watchlist_ids, user_ids, tokens, admin):
+            method, path, data, token = prepare(0)
+            client.credentials(HTTP_AUTHORIZATION='Token %s' % token)
+            response = client.get(path)
+            # Streaming exports have no response data to re-encode.
+            if response.streaming:
+                continue
+
+            expected = JSONRenderer().render(response.data)
+            for label, renderer in available():
+                if label == 'orjson' and renderer.render(response.data) != expected:
+                    command.stderr.write('%s: orjson output differs from JSONRenderer' % name)
+
+                encode = lambda: renderer.render(response.data, renderer.media_type, {})  # noqa: E731
+                elapsed = median(measure(encode, repeat))
+                command.stdout.write('%-28s %-8s %12s %10s' % (name, label, format_ms(elapsed), len(encode())))
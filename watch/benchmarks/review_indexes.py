@@ -0,0 +1,28 @@
+from statistics import median
+
+from watch.benchmarks import format_ms, measure, rollback, seed
+from watch.models import Review, WatchList
+
+
+def run(command, rows, repeat, keep):
+    with rollback(keep):
+        watchlist_ids = seed.seed_catalog(platforms=10, watchlists=max(1, rows // 50))
+        user_ids = seed.seed_users(50)
+        seed.seed_reviews(rows, watchlist_ids, user_ids)
+        seed.analyze()
+
+        watchlist_id = watchlist_ids[len(watchlist_ids) // 2]
+        user_id = user_ids[len(user_ids) // 2]
+        queries = {
+            'review-list': Review.objects.filter(watchlist=watchlist_id, active=True).order_by('created'),
+            'review-list by username': Review.objects.filter(watchlist=watchlist_id,
+                                                             review_user__username='bench1'),
+            'duplicate review check': Review.objects.filter(watchlist=watchlist_id, review_user=user_id),
+            'watch-list2 cursor page': WatchList.objects.order_by('created')[:5],
+        }
+
+        command.stdout.write('Seeded %s reviews over %s watchlists.' % (rows, len(watchlist_ids)))
+        for label, queryset in queries.items():
+            timings = measure(lambda: list(queryset.all()), repeat)
+            command.stdout.write('\n%s: median %s' % (label, format_ms(median(timings))))
+            command.stdout.write(queryset.explain())
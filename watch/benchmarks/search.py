@@ -0,0 +1,27 @@
+from statistics import median
+
+from watch import search
+from watch.benchmarks import format_ms, measure, rollback, seed
+
+
+def run(command, rows, repeat, keep):
+    backend = search.get_backend()
+    fallback = search.FallbackBackend()
+
+    with rollback(keep):
+        sizes = sorted({max(1, rows // 100), max(1, rows // 10), rows})
+        command.stdout.write('Backend: %s' % type(backend).__name__)
+        command.stdout.write('%12s %-16s %16s %16s' % ('titles', 'query', 'index', 'icontains'))
+
+        seeded = 0
+        for size in sizes:
+            seed.seed_catalog(platforms=10 if not seeded else 0, watchlists=size - seeded, offset=seeded)
+            seeded = size
+            seed.analyze()
+
+            # Selective queries: an exact title number and a three-digit prefix.
+            for query in (str(size // 2), str(size // 3)[:3]):
+                words = search.terms(query)
+                indexed = median(measure(lambda: backend.search(words, 20, 0), repeat))
+                scanned = median(measure(lambda: fallback.search(words, 20, 0), repeat))
+                command.stdout.write('%12s %-16s %16s %16s' % (size, query, format_ms(indexed), format_ms(scanned)))
@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from rest_framework.authtoken.models import Token
+
+from watch import ratings, statistics
+from watch.models import Review, StreamPlatform, WatchList
+
+BATCH_SIZE = 5000
+
+
+def seed_catalog(platforms, watchlists, offset=0):
+    StreamPlatform.objects.bulk_create(
+        [StreamPlatform(name='Platform %s' % i, about='Benchmark platform', website='https://example.com/%s' % i)
+         for i in range(platforms)],
+        batch_size=BATCH_SIZE,
+    )
+    platform_ids = list(StreamPlatform.objects.values_list('pk', flat=True))
+
+    for start in range(offset, offset + watchlists, BATCH_SIZE):
+        WatchList.objects.bulk_create([
+            WatchList(title='Title %s' % i, storyline='Storyline of title %s' % i,
+                      platform_id=platform_ids[i % len(platform_ids)])
+            for i in range(start, min(start + BATCH_SIZE, offset + watchlists))
+        ])
+    return list(WatchList.objects.values_list('pk', flat=True))
+
+
+def seed_users(count, prefix='bench'):
+    for start in range(0, count, BATCH_SIZE):
+        User.objects.bulk_create([
+            User(username='%s%s' % (prefix, i), password='!')
+            for i in range(start, min(start + BATCH_SIZE, count))
+        ])
+    return list(User.objects.filter(username__startswith=prefix).values_list('pk', flat=True))
+
+
+def seed_tokens(user_ids):
+    tokens = {user_id: Token.generate_key() for user_id in user_ids}
+    Token.objects.bulk_create([Token(key=key, user_id=user_id) for user_id, key in tokens.items()],
+                              batch_size=BATCH_SIZE)
+    return tokens
+
+
+def seed_reviews(count, watchlist_ids, user_ids):
+    if count > len(watchlist_ids) * len(user_ids):
+        raise ValueError('Not enough watchlists and users for %s unique reviews.' % count)
+
+    for start in range(0, count, BATCH_SIZE):
+        Review.objects.bulk_create([
+            Review(watchlist_id=watchlist_ids[i % len(watchlist_ids)],
+                   review_user_id=user_ids[i // len(watchlist_ids)],
+                   rating=i % 5 + 1, description='Review %s' % i, active=i % 10 != 0)
+            for i in range(start, min(start + BATCH_SIZE, count))
+        ])
+
+
+def analyze():
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def seed_dataset(platforms, watchlists, reviews, users):
+    # Users need enough (watchlist, user) pairs for the unique review constraint.
+    users = max(users, -(-reviews // max(1, watchlists)))
+
+    watchlist_ids = seed_catalog(platforms=platforms, watchlists=watchlists)
+    user_ids = seed_users(users)
+    tokens = seed_tokens(user_ids)
+    seed_reviews(reviews, watchlist_ids, user_ids)
+
+    ratings.recompute_ratings()
+    statistics.rebuild()
+    analyze()
+    return watchlist_ids, user_ids, tokens
@@ -0,0 +1,42 @@
+from statistics import median
+
+from rest_framework.renderers import JSONRenderer
+
+from watch.api import readers, serializers
+from watch.benchmarks import format_ms, measure, rollback, seed
+from watch.models import Review, WatchList
+
+PAGE_SIZE = 1000
+
+
+def cases():
+    watchlists = WatchList.objects.select_related('platform').order_by('pk')[:PAGE_SIZE]
+    reviews = Review.objects.select_related('review_user').order_by('pk')[:PAGE_SIZE]
+    return [
+        ('watchlist', serializers.WatchListSerializer, readers.watchlist_reader, watchlists),
+        ('review', serializers.ReviewSerializer, readers.review_reader, reviews),
+    ]
+
+
+def run(command, rows, repeat, keep):
+    with rollback(keep):
+        watchlist_ids = seed.seed_catalog(platforms=10, watchlists=max(1, rows // 10))
+        user_ids = seed.seed_users(10)
+        seed.seed_reviews(rows, watchlist_ids, user_ids)
+
+        renderer = JSONRenderer()
+        command.stdout.write('%-10s %-16s %12s %14s' % ('case', 'path', 'median', 'rows/s'))
+        for label, serializer_class, reader, queryset in cases():
+            model_data = serializer_class(queryset, many=True).data
+            fast_data = reader.many(reader.values(queryset))
+            if renderer.render(model_data) != renderer.render(fast_data):
+                command.stderr.write('%s: fast path output differs from %s' % (label, serializer_class.__name__))
+
+            paths = {
+                'serializer': lambda: serializer_class(queryset.all(), many=True).data,
+                'values reader': lambda: reader.many(reader.values(queryset.all())),
+            }
+            for path, func in paths.items():
+                elapsed = median(measure(func, repeat))
+                command.stdout.write('%-10s %-16s %12s %14.0f' % (label, path, format_ms(elapsed),
+                                                                 len(fast_data) / elapsed))
@@ -0,0 +1,62 @@
+from statistics import median
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test.utils import override_settings
+from rest_framework.throttling import UserRateThrottle
+
+from watch.api import throttling
+from watch.benchmarks import format_ms, measure
+
+
+# A throwaway cache, so clearing it between rounds leaves the shared one alone.
+ALIAS = 'benchmark-throttle'
+
+
+class HistoryThrottle(UserRateThrottle):
+    rate = '1000/min'
+
+    @property
+    def cache(self):
+        return caches[ALIAS]
+
+
+class CounterThrottle(throttling.UserCounterThrottle):
+    rate = '1000/min'
+
+
+def requests(count):
+    return [SimpleNamespace(user=SimpleNamespace(is_authenticated=True, pk=pk)) for pk in range(count)]
+
+
+def run(command, rows, repeat, keep):
+    with override_settings(CACHES=dict(settings.CACHES, **{ALIAS: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': ALIAS,
+    }})):
+        # Each key sees up to 100 hits per round, so keep the key count modest.
+        compare(command, users=requests(min(rows, 1000)), repeat=repeat)
+        caches[ALIAS].clear()
+
+
+def compare(command, users, repeat):
+    command.stdout.write('Time per 1000 throttle checks')
+    command.stdout.write('%12s %-10s %16s %16s' % ('keys', 'hits/key', 'history', 'counter'))
+
+    for hits in (1, 10, 100):
+        results = []
+        for throttle_class in (HistoryThrottle, CounterThrottle):
+            def check():
+                throttle = throttle_class()
+                for _ in range(hits):
+                    for request in users:
+                        throttle.allow_request(request, None)
+
+            with override_settings(WATCH_THROTTLE={'ALGORITHM': throttling.SLIDING_WINDOW, 'CACHE_ALIAS': ALIAS}):
+                timings = []
+                for _ in range(repeat):
+                    caches[ALIAS].clear()
+                    timings.extend(measure(check, 1))
+            results.append(median(timings) * 1000 / (hits * len(users)))
+        command.stdout.write('%12s %-10s %16s %16s' % (len(users), hits, *map(format_ms, results)))
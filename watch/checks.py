@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+# Backends whose entries live in one process: invalidations written there
+# never reach the other web workers or the job worker.
+PROCESS_LOCAL_BACKENDS = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+def process_local(alias):
+    return settings.CACHES.get(alias, {}).get('BACKEND') in PROCESS_LOCAL_BACKENDS
+
+
+@register()
+def check_jobs_cache(app_configs, **kwargs):
+    alias = getattr(settings, 'WATCH_RESPONSE_CACHE', {}).get('ALIAS', 'default')
+    if getattr(settings, 'WATCH_JOBS', {}).get('ENABLED') and process_local(alias):
+        return [Error(
+            'JOBS=1 needs a shared cache backend.',
+            hint='The job worker invalidates and warms the %r cache from its own process; set REDIS_URL.' % alias,
+            id='watch.E001',
+        )]
+    return []
+
+
+@register()
+def check_response_cache(app_configs, **kwargs):
+    config = getattr(settings, 'WATCH_RESPONSE_CACHE', {})
+    if config.get('ENABLED', True) and process_local(config.get('ALIAS', 'default')):
+        return [Error(
+            'The response cache needs a shared cache backend.',
+            hint='Invalidations on a %r process-local cache do not reach other workers; set REDIS_URL, or silence '
+                 'watch.E002 when serving from a single process.' % config.get('ALIAS', 'default'),
+            id='watch.E002',
+        )]
+    return []
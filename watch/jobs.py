@@ -0,0 +1,115 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from watch.models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def config():
+    return getattr(settings, 'WATCH_JOBS', {})
+
+
+def enabled():
+    return config().get('ENABLED', False)
+
+
+def task(name):
+    # Handlers receive the payloads of every job of that name claimed together.
+
+    def decorator(handler):
+        TASKS[name] = handler
+        return handler
+
+    return decorator
+
+
+def enqueue_many(name, payloads, keys=None, delay=0):
+    # Inserted once the caller's transaction commits. A job whose key matches
+    # one that is still pending is dropped then: the pending job has not been
+    # claimed yet, so it will see the committed rows.
+    keys = keys or [None] * len(payloads)
+
+    def insert():
+        run_after = timezone.now() + timedelta(seconds=delay)
+        Job.objects.bulk_create([Job(name=name, payload=payload, key=key, run_after=run_after)
+                                 for payload, key in zip(payloads, keys)], ignore_conflicts=True)
+
+    transaction.on_commit(insert)
+
+
+def enqueue(name, payload=None, key=None, delay=0):
+    enqueue_many(name, [payload or {}], [key], delay)
+
+
+def _requeue(pk, **fields):
+    try:
+        with transaction.atomic():
+            Job.objects.filter(pk=pk).update(status=Job.PENDING, updated=timezone.now(), **fields)
+    except IntegrityError:
+        # A newer job with the same key is pending and covers this one.
+        Job.objects.filter(pk=pk).delete()
+
+
+def requeue_stale():
+    # Jobs left running by a worker that died go back to the queue.
+    cutoff = timezone.now() - timedelta(seconds=config().get('STALE_AFTER', 300))
+    stale = list(Job.objects.filter(status=Job.RUNNING, updated__lt=cutoff).values_list('pk', flat=True))
+    for pk in stale:
+        _requeue(pk)
+    return len(stale)
+
+
+def claim(limit):
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(Job.objects.select_for_update(skip_locked=True)
+                    .filter(status=Job.PENDING, run_after__lte=now)
+                    .order_by('run_after', 'pk')[:limit])
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=Job.RUNNING, attempts=F('attempts') + 1, updated=now)
+
+    for job in jobs:
+        job.attempts += 1
+    return jobs
+
+
+def retry(jobs, error):
+    now = timezone.now()
+    for job in jobs:
+        if job.attempts >= config().get('MAX_ATTEMPTS', 5):
+            Job.objects.filter(pk=job.pk).update(status=Job.FAILED, last_error=error, updated=now)
+            continue
+
+        _requeue(job.pk, last_error=error,
+                 run_after=now + timedelta(seconds=config().get('RETRY_DELAY', 10) * 2 ** (job.attempts - 1)))
+
+
+def run_pending(limit=None):
+    requeue_stale()
+    jobs = claim(limit or config().get('BATCH_SIZE', 100))
+
+    batches = {}
+    for job in jobs:
+        batches.setdefault(job.name, []).append(job)
+
+    for name, batch in batches.items():
+        try:
+            if name not in TASKS:
+                raise LookupError('No task named %r.' % name)
+            with transaction.atomic():
+                TASKS[name]([job.payload for job in batch])
+        except Exception as error:
+            logger.exception('Job %s failed for %s jobs', name, len(batch))
+            retry(batch, repr(error))
+        else:
+            Job.objects.filter(pk__in=[job.pk for job in batch]).delete()
+
+    return len(jobs)
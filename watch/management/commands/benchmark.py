@@ -0,0 +1,52 @@
+from importlib import import_module
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from watch import benchmarks
+
+BENCHMARKS = ['review-indexes', 'pagination', 'ingest', 'serializers', 'search', 'throttle', 'async-views',
+              'endpoints', 'renderers']
+
+
+class Command(BaseCommand):
+    help = 'Seed a throwaway dataset and run one of the watch benchmarks against it.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=BENCHMARKS)
+        parser.add_argument('--rows', type=int, default=100000, help='Size of the seeded dataset.')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per measurement.')
+        parser.add_argument('--keep', action='store_true', help='Commit the seeded rows instead of rolling back.')
+        parser.add_argument('--save-baseline', metavar='PATH', help='Write the results to a JSON baseline.')
+        parser.add_argument('--baseline', metavar='PATH', help='Compare the results with a JSON baseline.')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Allowed latency/throughput change against the baseline, as a fraction.')
+
+    def handle(self, *args, **options):
+        module = import_module('watch.benchmarks.%s' % options['name'].replace('-', '_'))
+
+        # Benchmarks issue in-process requests against the 'testserver' host.
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            results = module.run(self, rows=options['rows'], repeat=options['repeat'], keep=options['keep'])
+
+        if not (options['save_baseline'] or options['baseline']):
+            return
+        if results is None:
+            raise CommandError('The %s benchmark does not produce results for baselines.' % options['name'])
+
+        if options['save_baseline']:
+            benchmarks.save_baseline(options['save_baseline'], options['name'], options['rows'],
+                                     options['repeat'], results)
+            self.stdout.write('Saved baseline to %s.' % options['save_baseline'])
+
+        if options['baseline']:
+            baseline = benchmarks.load_baseline(options['baseline'])
+            if baseline['benchmark'] != options['name']:
+                raise CommandError('%s is a baseline for %s.' % (options['baseline'], baseline['benchmark']))
+
+            found = benchmarks.regressions(baseline['results'], results, options['threshold'])
+            for case, metric, previous, current in found:
+                self.stdout.write(self.style.ERROR('REGRESSION %s %s: %.6g -> %.6g' % (case, metric, previous, current)))
+            if found:
+                raise CommandError('%s regressions against %s.' % (len(found), options['baseline']))
+            self.stdout.write(self.style.SUCCESS('No regressions against %s.' % options['baseline']))
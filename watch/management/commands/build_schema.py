@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from config import schema
+
+
+class Command(BaseCommand):
+    help = 'Write the OpenAPI schema to the versioned swagger.yaml artifact, or check that it is up to date.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=str(settings.SCHEMA['ARTIFACT']))
+        parser.add_argument('--check', action='store_true',
+                            help='Fail if the artifact differs from the generated schema instead of writing it.')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            self.check_artifact(options['output'])
+            return
+
+        data = schema.to_data()
+        with open(options['output'], 'wb') as fh:
+            schema.dump_artifact(data, fh)
+        self.stdout.write(self.style.SUCCESS('Wrote %s (%s).' % (options['output'], data['info']['version'])))
+
+    def check_artifact(self, path):
+        try:
+            with open(path) as fh:
+                artifact = schema.load_artifact(fh)
+        except FileNotFoundError:
+            raise CommandError('%s does not exist; run build_schema to write it.' % path)
+
+        # Compared as data, so formatting-only edits to the file are fine.
+        generated = schema.to_data()
+        if artifact == generated:
+            self.stdout.write(self.style.SUCCESS('%s is up to date.' % path))
+            return
+
+        artifact_paths, generated_paths = set(artifact.get('paths', {})), set(generated['paths'])
+        for name in sorted(generated_paths - artifact_paths):
+            self.stdout.write('missing path %s' % name)
+        for name in sorted(artifact_paths - generated_paths):
+            self.stdout.write('stale path %s' % name)
+        raise CommandError('%s is out of date; run build_schema to regenerate it.' % path)
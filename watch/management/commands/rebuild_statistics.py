@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from watch import statistics
+from watch.models import StreamPlatform
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-platform statistics (title and review counts, average rating, top titles).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('ids', nargs='*', type=int, help='Only rebuild these StreamPlatform ids.')
+
+    def handle(self, *args, **options):
+        platforms = StreamPlatform.objects.values_list('pk', flat=True)
+        if options['ids']:
+            platforms = platforms.filter(pk__in=options['ids'])
+
+        rebuilt = statistics.rebuild(platforms)
+        self.stdout.write(self.style.SUCCESS('Rebuilt statistics for %s platforms.' % rebuilt))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from watch import ratings, statistics
+from watch.api import cache
+from watch.models import WatchList
+
+
+class Command(BaseCommand):
+    help = 'Rebuild rating_sum, number_rating and avg_rating of every WatchList from its reviews.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('ids', nargs='*', type=int, help='Only rebuild these WatchList ids.')
+
+    def handle(self, *args, **options):
+        watchlists = WatchList.objects.all()
+        if options['ids']:
+            watchlists = watchlists.filter(pk__in=options['ids'])
+
+        updated = ratings.recompute_ratings(watchlists)
+        statistics.rebuild(set(watchlists.values_list('platform_id', flat=True)))
+        cache.invalidate_all()
+        self.stdout.write(self.style.SUCCESS('Recomputed ratings for %s watchlists.' % updated))
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from watch import checks, jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs: rating recomputation, statistics refresh and cache warming.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit once no job is ready to run.')
+        parser.add_argument('--batch-size', type=int, help='Jobs claimed per round.')
+        parser.add_argument('--poll-interval', type=float, help='Seconds to sleep when the queue is empty.')
+
+    def handle(self, *args, **options):
+        errors = checks.check_jobs_cache(None)
+        if errors:
+            raise CommandError('%s %s' % (errors[0].msg, errors[0].hint))
+
+        poll_interval = options['poll_interval'] or jobs.config().get('POLL_INTERVAL', 1)
+        processed = 0
+
+        try:
+            while True:
+                count = jobs.run_pending(options['batch_size'])
+                processed += count
+                if not count:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Processed %s jobs.' % processed))
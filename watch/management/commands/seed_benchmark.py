@@ -0,0 +1,30 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from watch.benchmarks import seed
+
+
+class Command(BaseCommand):
+    help = 'Seed a persistent benchmark dataset: platforms, watchlists, reviews and users with tokens.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--platforms', type=int, default=100)
+        parser.add_argument('--watchlists', type=int, default=1000000)
+        parser.add_argument('--reviews', type=int, default=10000000)
+        parser.add_argument('--users', type=int, default=1000,
+                            help='Raised automatically when too low for the number of unique reviews.')
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith='bench').exists():
+            raise CommandError('The database already holds a benchmark dataset.')
+
+        with transaction.atomic():
+            watchlist_ids, user_ids, tokens = seed.seed_dataset(
+                platforms=options['platforms'],
+                watchlists=options['watchlists'],
+                reviews=options['reviews'],
+                users=options['users'],
+            )
+        self.stdout.write(self.style.SUCCESS('Seeded %s watchlists, %s reviews and %s users with tokens.' % (
+            len(watchlist_ids), options['reviews'], len(tokens))))
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+from django.db.models import Avg, Count, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def recompute_ratings(apps, schema_editor):
+    WatchList = apps.get_model('watch', 'WatchList')
+    Review = apps.get_model('watch', 'Review')
+
+    reviews = Review.objects.filter(watchlist=OuterRef('pk')).order_by().values('watchlist')
+    WatchList.objects.update(
+        rating_sum=Coalesce(Subquery(reviews.annotate(value=Sum('rating')).values('value')), Value(0)),
+        number_rating=Coalesce(Subquery(reviews.annotate(value=Count('pk')).values('value')), Value(0)),
+        avg_rating=Coalesce(Subquery(reviews.annotate(value=Avg('rating')).values('value'),
+                                     output_field=FloatField()), Value(0.0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watch', '0006_watchlist_avg_rating_watchlist_number_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='watchlist',
+            name='rating_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(recompute_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+from django.db.models import Avg, Count, FloatField, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def remove_duplicate_reviews(apps, schema_editor):
+    WatchList = apps.get_model('watch', 'WatchList')
+    Review = apps.get_model('watch', 'Review')
+
+    duplicates = (Review.objects.values('watchlist', 'review_user')
+                  .annotate(first=Min('pk'), total=Count('pk'))
+                  .filter(total__gt=1))
+    watchlist_ids = set()
+    for duplicate in duplicates:
+        Review.objects.filter(watchlist=duplicate['watchlist'], review_user=duplicate['review_user']) \
+            .exclude(pk=duplicate['first']).delete()
+        watchlist_ids.add(duplicate['watchlist'])
+
+    # The deleted reviews were counted in the aggregates of their watchlists.
+    reviews = Review.objects.filter(watchlist=OuterRef('pk')).order_by().values('watchlist')
+    WatchList.objects.filter(pk__in=watchlist_ids).update(
+        rating_sum=Coalesce(Subquery(reviews.annotate(value=Sum('rating')).values('value')), Value(0)),
+        number_rating=Coalesce(Subquery(reviews.annotate(value=Count('pk')).values('value')), Value(0)),
+        avg_rating=Coalesce(Subquery(reviews.annotate(value=Avg('rating')).values('value'),
+                                     output_field=FloatField()), Value(0.0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watch', '0007_watchlist_rating_sum'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('watchlist', 'review_user'), name='unique_review_per_user'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['watchlist', 'active', 'created'], name='review_watch_active_created'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlist',
+            index=models.Index(fields=['created'], name='watchlist_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='watchlist',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='watch.watchlist'),
+        ),
+    ]
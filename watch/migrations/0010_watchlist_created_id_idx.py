@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watch', '0009_streamplatform_updated'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='watchlist',
+            index=models.Index(fields=['created', 'id'], name='watchlist_created_id_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='watchlist',
+            name='watchlist_created_idx',
+        ),
+    ]
@@ -0,0 +1,170 @@
+from django.db import migrations
+
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE watch_watchlist_search
+    USING fts5(title, storyline, platform, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')
+    """,
+    """
+    INSERT INTO watch_watchlist_search (rowid, title, storyline, platform)
+    SELECT w.id, w.title, w.storyline, p.name
+    FROM watch_watchlist w INNER JOIN watch_streamplatform p ON p.id = w.platform_id
+    """,
+    """
+    CREATE TRIGGER watch_watchlist_search_insert AFTER INSERT ON watch_watchlist BEGIN
+        INSERT INTO watch_watchlist_search (rowid, title, storyline, platform)
+        SELECT NEW.id, NEW.title, NEW.storyline, name FROM watch_streamplatform WHERE id = NEW.platform_id;
+    END
+    """,
+    """
+    CREATE TRIGGER watch_watchlist_search_update AFTER UPDATE OF title, storyline, platform_id ON watch_watchlist
+    BEGIN
+        DELETE FROM watch_watchlist_search WHERE rowid = OLD.id;
+        INSERT INTO watch_watchlist_search (rowid, title, storyline, platform)
+        SELECT NEW.id, NEW.title, NEW.storyline, name FROM watch_streamplatform WHERE id = NEW.platform_id;
+    END
+    """,
+    """
+    CREATE TRIGGER watch_watchlist_search_delete AFTER DELETE ON watch_watchlist BEGIN
+        DELETE FROM watch_watchlist_search WHERE rowid = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER watch_streamplatform_search_update AFTER UPDATE OF name ON watch_streamplatform BEGIN
+        UPDATE watch_watchlist_search SET platform = NEW.name
+        WHERE rowid IN (SELECT id FROM watch_watchlist WHERE platform_id = NEW.id);
+    END
+    """,
+]
+
+SQLITE_BACKWARDS = [
+    'DROP TRIGGER IF EXISTS watch_streamplatform_search_update',
+    'DROP TRIGGER IF EXISTS watch_watchlist_search_delete',
+    'DROP TRIGGER IF EXISTS watch_watchlist_search_update',
+    'DROP TRIGGER IF EXISTS watch_watchlist_search_insert',
+    'DROP TABLE IF EXISTS watch_watchlist_search',
+]
+
+POSTGRESQL_FORWARDS = [
+    """
+    CREATE TABLE watch_watchlist_search (
+        watchlist_id bigint PRIMARY KEY,
+        document tsvector NOT NULL
+    )
+    """,
+    'CREATE INDEX watch_watchlist_search_document ON watch_watchlist_search USING GIN (document)',
+    """
+    CREATE FUNCTION watch_watchlist_search_document(title text, storyline text, platform text)
+    RETURNS tsvector AS $$
+        SELECT setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(platform, '')), 'B')
+            || setweight(to_tsvector('simple', coalesce(storyline, '')), 'C')
+    $$ LANGUAGE SQL IMMUTABLE
+    """,
+    """
+    INSERT INTO watch_watchlist_search (watchlist_id, document)
+    SELECT w.id, watch_watchlist_search_document(w.title, w.storyline, p.name)
+    FROM watch_watchlist w INNER JOIN watch_streamplatform p ON p.id = w.platform_id
+    """,
+    """
+    CREATE FUNCTION watch_watchlist_search_refresh() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO watch_watchlist_search (watchlist_id, document)
+        SELECT NEW.id, watch_watchlist_search_document(NEW.title, NEW.storyline, p.name)
+        FROM watch_streamplatform p WHERE p.id = NEW.platform_id
+        ON CONFLICT (watchlist_id) DO UPDATE SET document = EXCLUDED.document;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER watch_watchlist_search_refresh
+    AFTER INSERT OR UPDATE OF title, storyline, platform_id ON watch_watchlist
+    FOR EACH ROW EXECUTE FUNCTION watch_watchlist_search_refresh()
+    """,
+    """
+    CREATE FUNCTION watch_watchlist_search_delete() RETURNS trigger AS $$
+    BEGIN
+        DELETE FROM watch_watchlist_search WHERE watchlist_id = OLD.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER watch_watchlist_search_delete
+    AFTER DELETE ON watch_watchlist
+    FOR EACH ROW EXECUTE FUNCTION watch_watchlist_search_delete()
+    """,
+    # No foreign key, so "manage.py flush" can truncate watch_watchlist
+    # without knowing about this table; the index is emptied along with it.
+    """
+    CREATE FUNCTION watch_watchlist_search_truncate() RETURNS trigger AS $$
+    BEGIN
+        TRUNCATE watch_watchlist_search;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER watch_watchlist_search_truncate
+    AFTER TRUNCATE ON watch_watchlist
+    FOR EACH STATEMENT EXECUTE FUNCTION watch_watchlist_search_truncate()
+    """,
+    """
+    CREATE FUNCTION watch_streamplatform_search_refresh() RETURNS trigger AS $$
+    BEGIN
+        UPDATE watch_watchlist_search s
+        SET document = watch_watchlist_search_document(w.title, w.storyline, NEW.name)
+        FROM watch_watchlist w
+        WHERE w.platform_id = NEW.id AND s.watchlist_id = w.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER watch_streamplatform_search_refresh
+    AFTER UPDATE OF name ON watch_streamplatform
+    FOR EACH ROW EXECUTE FUNCTION watch_streamplatform_search_refresh()
+    """,
+]
+
+POSTGRESQL_BACKWARDS = [
+    'DROP TRIGGER IF EXISTS watch_streamplatform_search_refresh ON watch_streamplatform',
+    'DROP FUNCTION IF EXISTS watch_streamplatform_search_refresh()',
+    'DROP TRIGGER IF EXISTS watch_watchlist_search_truncate ON watch_watchlist',
+    'DROP FUNCTION IF EXISTS watch_watchlist_search_truncate()',
+    'DROP TRIGGER IF EXISTS watch_watchlist_search_delete ON watch_watchlist',
+    'DROP FUNCTION IF EXISTS watch_watchlist_search_delete()',
+    'DROP TRIGGER IF EXISTS watch_watchlist_search_refresh ON watch_watchlist',
+    'DROP FUNCTION IF EXISTS watch_watchlist_search_refresh()',
+    'DROP TABLE IF EXISTS watch_watchlist_search',
+    'DROP FUNCTION IF EXISTS watch_watchlist_search_document(text, text, text)',
+]
+
+STATEMENTS = {
+    'sqlite': (SQLITE_FORWARDS, SQLITE_BACKWARDS),
+    'postgresql': (POSTGRESQL_FORWARDS, POSTGRESQL_BACKWARDS),
+}
+
+
+def create_search_index(apps, schema_editor):
+    forwards, backwards = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for statement in forwards:
+        schema_editor.execute(statement, params=None)
+
+
+def drop_search_index(apps, schema_editor):
+    forwards, backwards = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for statement in backwards:
+        schema_editor.execute(statement, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watch', '0011_export_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
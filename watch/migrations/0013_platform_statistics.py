@@ -0,0 +1,59 @@
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+TOP_TITLES = 10
+
+
+def build_statistics(apps, schema_editor):
+    StreamPlatform = apps.get_model('watch', 'StreamPlatform')
+    WatchList = apps.get_model('watch', 'WatchList')
+    PlatformStatistics = apps.get_model('watch', 'PlatformStatistics')
+
+    totals = {row['platform']: row for row in WatchList.objects.order_by().values('platform').annotate(
+        title_count=Count('pk'), review_count=Sum('number_rating'), rating_sum=Sum('rating_sum'))}
+
+    rows = []
+    for platform_id in StreamPlatform.objects.values_list('pk', flat=True):
+        row = totals.get(platform_id, {})
+        review_count = row.get('review_count') or 0
+        rating_sum = row.get('rating_sum') or 0
+        top_titles = list(WatchList.objects.filter(platform=platform_id, active=True)
+                          .order_by('-avg_rating', '-number_rating', '-id')
+                          .values('id', 'title', 'avg_rating', 'number_rating')[:TOP_TITLES])
+        rows.append(PlatformStatistics(
+            platform_id=platform_id,
+            title_count=row.get('title_count', 0),
+            review_count=review_count,
+            rating_sum=rating_sum,
+            avg_rating=rating_sum / review_count if review_count else 0.0,
+            top_titles=top_titles,
+        ))
+    PlatformStatistics.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watch', '0012_watchlist_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStatistics',
+            fields=[
+                ('platform', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics', serialize=False, to='watch.streamplatform')),
+                ('title_count', models.IntegerField(default=0)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('avg_rating', models.FloatField(default=0)),
+                ('top_titles', models.JSONField(default=list)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='watchlist',
+            index=models.Index(fields=['platform', '-avg_rating', '-number_rating', '-id'], name='watchlist_platform_top_idx'),
+        ),
+        migrations.RunPython(build_statistics, migrations.RunPython.noop),
+    ]
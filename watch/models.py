@@ -1,5 +1,6 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
@@ -7,6 +8,7 @@ class StreamPlatform(models.Model):
     name = models.CharField(max_length=30)
     about = models.CharField(max_length=150)
     website = models.URLField(max_length=100)
+    updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -19,23 +21,80 @@ class WatchList(models.Model):
     active = models.BooleanField(default=True)
     avg_rating = models.FloatField(default=0)
     number_rating = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created', 'id'], name='watchlist_created_id_idx'),
+            models.Index(fields=['updated'], name='watchlist_updated_idx'),
+            models.Index(fields=['platform', '-avg_rating', '-number_rating', '-id'], name='watchlist_platform_top_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 
 class Review(models.Model):
-    review_user = models.ForeignKey(User, on_delete=models.CASCADE)
+    review_user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     rating = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     description = models.CharField(max_length=200, null=True)
-    watchlist = models.ForeignKey(WatchList, on_delete=models.CASCADE, related_name='reviews')
+    watchlist = models.ForeignKey(WatchList, on_delete=models.CASCADE, related_name='reviews', db_index=False)
     active = models.BooleanField(default=True)
     created = models.DateTimeField(auto_now_add=True)
     update = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['watchlist', 'active', 'created'], name='review_watch_active_created'),
+            models.Index(fields=['update'], name='review_update_idx'),
+            models.Index(fields=['review_user', 'created'], name='review_user_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['watchlist', 'review_user'], name='unique_review_per_user'),
+        ]
+
     def __str__(self):
         return str(self.rating) + " | " + self.watchlist.title + " | " + str(self.review_user)
 
 
+class PlatformStatistics(models.Model):
+    platform = models.OneToOneField(StreamPlatform, on_delete=models.CASCADE, primary_key=True, related_name='statistics')
+    title_count = models.IntegerField(default=0)
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    avg_rating = models.FloatField(default=0)
+    top_titles = models.JSONField(default=list)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return str(self.platform_id)
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (RUNNING, 'Running'), (FAILED, 'Failed')]
+
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=200, null=True, blank=True)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['key'], condition=models.Q(status='pending'), name='job_pending_key_unique'),
+        ]
+
+    def __str__(self):
+        return '%s | %s' % (self.name, self.status)
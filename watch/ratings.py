@@ -0,0 +1,71 @@
+from django.db.models import Avg, Count, F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Now
+
+from django.dispatch import Signal
+
+from watch import jobs
+from watch.models import Review, WatchList
+
+RECOMPUTE = 'ratings.recompute'
+
+# Sent with watchlist_id, delta_sum and delta_count after a single review changed a rating.
+rating_changed = Signal()
+
+
+def average(total, count):
+    return Coalesce(Cast(total, FloatField()) / NullIf(count, Value(0)), Value(0.0))
+
+
+def schedule_recompute(watchlist_id):
+    # Coalesced by key: a burst of reviews on one title queues one recompute.
+    jobs.enqueue(RECOMPUTE, {'watchlist_id': watchlist_id}, key='%s:%s' % (RECOMPUTE, watchlist_id))
+    return 1
+
+
+def _apply(watchlist_id, delta_sum, delta_count):
+    if jobs.enabled():
+        return schedule_recompute(watchlist_id)
+
+    rating_sum = F('rating_sum') + delta_sum
+    number_rating = F('number_rating') + delta_count
+
+    updated = WatchList.objects.filter(pk=watchlist_id).update(
+        rating_sum=rating_sum,
+        number_rating=number_rating,
+        avg_rating=average(rating_sum, number_rating),
+        updated=Now(),
+    )
+    if updated:
+        rating_changed.send(sender=WatchList, watchlist_id=watchlist_id, delta_sum=delta_sum, delta_count=delta_count)
+    return updated
+
+
+def add_rating(watchlist_id, rating):
+    return _apply(watchlist_id, rating, 1)
+
+
+def change_rating(watchlist_id, old_rating, new_rating):
+    if old_rating == new_rating:
+        return 0
+    return _apply(watchlist_id, new_rating - old_rating, 0)
+
+
+def remove_rating(watchlist_id, rating):
+    return _apply(watchlist_id, -rating, -1)
+
+
+def recompute_ratings(watchlists=None):
+    if watchlists is None:
+        watchlists = WatchList.objects.all()
+
+    reviews = Review.objects.filter(watchlist=OuterRef('pk')).order_by().values('watchlist')
+    rating_sum = reviews.annotate(value=Sum('rating')).values('value')
+    number_rating = reviews.annotate(value=Count('pk')).values('value')
+    avg_rating = reviews.annotate(value=Avg('rating')).values('value')
+
+    return watchlists.update(
+        rating_sum=Coalesce(Subquery(rating_sum), Value(0)),
+        number_rating=Coalesce(Subquery(number_rating), Value(0)),
+        avg_rating=Coalesce(Subquery(avg_rating, output_field=FloatField()), Value(0.0)),
+        updated=Now(),
+    )
@@ -0,0 +1,63 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from watch.models import WatchList
+
+TERM = re.compile(r'\w+', re.UNICODE)
+
+
+def terms(query):
+    return TERM.findall(query.lower())
+
+
+class SQLiteBackend:
+    sql = ("SELECT rowid FROM watch_watchlist_search WHERE watch_watchlist_search MATCH %s "
+           "ORDER BY bm25(watch_watchlist_search, 10.0, 1.0, 4.0), rowid LIMIT %s OFFSET %s")
+
+    def search(self, words, limit, offset):
+        match = ' '.join('"%s"*' % word for word in words)
+        with connection.cursor() as cursor:
+            cursor.execute(self.sql, [match, limit, offset])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgreSQLBackend:
+    sql = ("SELECT watchlist_id FROM watch_watchlist_search, to_tsquery('simple', %s) query "
+           "WHERE document @@ query ORDER BY ts_rank(document, query) DESC, watchlist_id LIMIT %s OFFSET %s")
+
+    def search(self, words, limit, offset):
+        query = ' & '.join('%s:*' % word for word in words)
+        with connection.cursor() as cursor:
+            cursor.execute(self.sql, [query, limit, offset])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class FallbackBackend:
+
+    def search(self, words, limit, offset):
+        queryset = WatchList.objects.all()
+        for word in words:
+            queryset = queryset.filter(Q(title__icontains=word) | Q(storyline__icontains=word) |
+                                       Q(platform__name__icontains=word))
+        return list(queryset.order_by('pk').values_list('pk', flat=True)[offset:offset + limit])
+
+
+BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'postgresql': PostgreSQLBackend,
+}
+
+
+def get_backend():
+    return BACKENDS.get(connection.vendor, FallbackBackend)()
+
+
+def search(query, limit, offset=0):
+    # Returns the ids of matching watchlists, best match first. Every term
+    # must match the title, storyline or platform name, as a prefix.
+    words = terms(query)
+    if not words:
+        return []
+    return get_backend().search(words, limit, offset)
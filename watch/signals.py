@@ -0,0 +1,92 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from watch import ratings, statistics
+from watch.api import cache
+from watch.models import PlatformStatistics, Review, StreamPlatform, WatchList
+
+
+# Columns behind the platform statistics: the totals and the top titles.
+STATISTICS_FIELDS = ('platform_id', 'rating_sum', 'number_rating', 'avg_rating', 'title', 'active')
+
+
+@receiver(pre_save, sender=WatchList)
+@receiver(pre_delete, sender=WatchList)
+def remember_watchlist(sender, instance, **kwargs):
+    # The stored row, not the possibly stale instance, is what the platform
+    # statistics counted.
+    instance._previous = None
+    if instance.pk is not None:
+        instance._previous = WatchList.objects.filter(pk=instance.pk).values(*STATISTICS_FIELDS).first()
+    instance._previous_platform_id = instance._previous['platform_id'] if instance._previous else None
+
+
+@receiver(post_save, sender=WatchList)
+@receiver(post_delete, sender=WatchList)
+def invalidate_watchlist(sender, instance, **kwargs):
+    tags = cache.watchlist_tags(instance.pk, instance.platform_id)
+    previous_platform_id = getattr(instance, '_previous_platform_id', None)
+    if previous_platform_id not in (None, instance.platform_id):
+        tags.append('platform:%s' % previous_platform_id)
+    cache.invalidate_on_commit(*tags)
+
+
+def stored_row(instance, previous, update_fields):
+    # save(update_fields=...) leaves the other columns as they were stored.
+    return {field: previous[field] if update_fields is not None and field not in update_fields
+            and field.replace('_id', '') not in update_fields else getattr(instance, field)
+            for field in STATISTICS_FIELDS}
+
+
+@receiver(post_save, sender=WatchList)
+def count_watchlist(sender, instance, update_fields=None, **kwargs):
+    previous = instance._previous
+    if previous is None:
+        statistics.add_title({field: getattr(instance, field) for field in STATISTICS_FIELDS})
+        return
+
+    current = stored_row(instance, previous, update_fields)
+    if current['platform_id'] != previous['platform_id']:
+        statistics.remove_title(previous)
+        statistics.add_title(current)
+    elif current != previous:
+        statistics.apply(current['platform_id'], delta_sum=current['rating_sum'] - previous['rating_sum'],
+                         delta_count=current['number_rating'] - previous['number_rating'],
+                         top=previous['active'] or current['active'])
+
+
+@receiver(post_delete, sender=WatchList)
+def uncount_watchlist(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous', None)
+    if previous is not None:
+        statistics.remove_title(previous)
+
+
+@receiver(ratings.rating_changed)
+def update_platform_statistics(sender, watchlist_id, delta_sum, delta_count, **kwargs):
+    statistics.apply_rating(watchlist_id, delta_sum, delta_count)
+
+
+@receiver(post_save, sender=StreamPlatform)
+def create_platform_statistics(sender, instance, created=False, **kwargs):
+    if created:
+        PlatformStatistics.objects.get_or_create(platform=instance)
+
+
+@receiver(post_save, sender=StreamPlatform)
+@receiver(post_delete, sender=StreamPlatform)
+def invalidate_platform(sender, instance, created=False, **kwargs):
+    tags = ['platform:%s' % instance.pk, 'platforms', 'watchlists']
+    if not created and kwargs['signal'] is post_save:
+        watchlist_ids = WatchList.objects.filter(platform=instance.pk).values_list('pk', flat=True)
+        tags.extend('watchlist:%s' % pk for pk in watchlist_ids)
+    cache.invalidate_on_commit(*tags)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review(sender, instance, **kwargs):
+    platform_id = (WatchList.objects.filter(pk=instance.watchlist_id)
+                   .values_list('platform_id', flat=True).first())
+    cache.invalidate_on_commit('reviews:%s' % instance.watchlist_id,
+                               *cache.watchlist_tags(instance.watchlist_id, platform_id))
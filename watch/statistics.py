@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Now
+
+from watch.models import PlatformStatistics, StreamPlatform, WatchList
+from watch.ratings import average
+
+BATCH_SIZE = 500
+
+
+def top_size():
+    return getattr(settings, 'WATCH_STATISTICS', {}).get('TOP_TITLES', 10)
+
+
+def top_titles(platform_id):
+    # Served by watchlist_platform_top_idx: reads at most a handful of index entries.
+    return list(WatchList.objects.filter(platform=platform_id, active=True)
+                .order_by('-avg_rating', '-number_rating', '-id')
+                .values('id', 'title', 'avg_rating', 'number_rating')[:top_size()])
+
+
+def _totals(watchlists):
+    return watchlists.order_by().values('platform').annotate(
+        title_count=Count('pk'),
+        review_count=Sum('number_rating'),
+        rating_sum=Sum('rating_sum'),
+    )
+
+
+def apply(platform_id, titles=0, delta_sum=0, delta_count=0, top=True):
+    review_count = F('review_count') + delta_count
+    rating_sum = F('rating_sum') + delta_sum
+    fields = {
+        'title_count': F('title_count') + titles,
+        'review_count': review_count,
+        'rating_sum': rating_sum,
+        'avg_rating': average(rating_sum, review_count),
+        'updated': Now(),
+    }
+    if top:
+        fields['top_titles'] = top_titles(platform_id)
+    return PlatformStatistics.objects.filter(platform=platform_id).update(**fields)
+
+
+def apply_rating(watchlist_id, delta_sum, delta_count):
+    platform_id = WatchList.objects.filter(pk=watchlist_id).values_list('platform_id', flat=True).first()
+    if platform_id is None:
+        return 0
+    return apply(platform_id, delta_sum=delta_sum, delta_count=delta_count)
+
+
+def add_title(row):
+    return apply(row['platform_id'], 1, row['rating_sum'], row['number_rating'], top=row['active'])
+
+
+def remove_title(row):
+    return apply(row['platform_id'], -1, -row['rating_sum'], -row['number_rating'], top=row['active'])
+
+
+def refresh(platform_id):
+    # Only ever updates existing rows, so it is safe to call while the
+    # platform itself is being deleted by a cascade.
+    totals = WatchList.objects.filter(platform=platform_id).aggregate(
+        title_count=Count('pk'),
+        review_count=Sum('number_rating'),
+        rating_sum=Sum('rating_sum'),
+    )
+    review_count = totals['review_count'] or 0
+    rating_sum = totals['rating_sum'] or 0
+
+    return PlatformStatistics.objects.filter(platform=platform_id).update(
+        title_count=totals['title_count'],
+        review_count=review_count,
+        rating_sum=rating_sum,
+        avg_rating=rating_sum / review_count if review_count else 0.0,
+        top_titles=top_titles(platform_id),
+        updated=Now(),
+    )
+
+
+def rebuild(platform_ids=None):
+    if platform_ids is None:
+        platform_ids = StreamPlatform.objects.values_list('pk', flat=True)
+    platform_ids = sorted(platform_ids)
+
+    for start in range(0, len(platform_ids), BATCH_SIZE):
+        batch = platform_ids[start:start + BATCH_SIZE]
+        totals = {row['platform']: row for row in _totals(WatchList.objects.filter(platform__in=batch))}
+
+        rows = []
+        for platform_id in batch:
+            row = totals.get(platform_id, {})
+            review_count = row.get('review_count') or 0
+            rating_sum = row.get('rating_sum') or 0
+            rows.append(PlatformStatistics(
+                platform_id=platform_id,
+                title_count=row.get('title_count', 0),
+                review_count=review_count,
+                rating_sum=rating_sum,
+                avg_rating=rating_sum / review_count if review_count else 0.0,
+                top_titles=top_titles(platform_id),
+            ))
+
+        with transaction.atomic():
+            PlatformStatistics.objects.filter(platform__in=batch).delete()
+            PlatformStatistics.objects.bulk_create(rows)
+
+    return len(platform_ids)
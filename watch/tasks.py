@@ -0,0 +1,40 @@
+from django.urls import reverse
+
+from watch import jobs, ratings, statistics
+from watch.api import cache
+from watch.models import WatchList
+
+WARM = 'cache.warm'
+
+
+def schedule_warm(watchlist_ids):
+    watchlist_ids = sorted(set(watchlist_ids))
+    jobs.enqueue_many(WARM, [{'watchlist_id': pk} for pk in watchlist_ids],
+                      ['%s:%s' % (WARM, pk) for pk in watchlist_ids])
+
+
+@jobs.task(ratings.RECOMPUTE)
+def recompute(payloads):
+    watchlist_ids = {payload['watchlist_id'] for payload in payloads}
+    watchlists = WatchList.objects.filter(pk__in=watchlist_ids)
+    ratings.recompute_ratings(watchlists)
+
+    tags = set()
+    platform_ids = set()
+    for pk, platform_id in watchlists.values_list('pk', 'platform_id'):
+        tags.update(cache.watchlist_tags(pk, platform_id))
+        tags.add('reviews:%s' % pk)
+        platform_ids.add(platform_id)
+    for platform_id in platform_ids:
+        statistics.refresh(platform_id)
+
+    cache.invalidate_on_commit(*tags)
+    schedule_warm(watchlist_ids)
+
+
+@jobs.task(WARM)
+def warm(payloads):
+    existing = WatchList.objects.filter(pk__in={payload['watchlist_id'] for payload in payloads})
+    for pk in existing.order_by('pk').values_list('pk', flat=True):
+        cache.warm(reverse('watch-detail', args=(pk,)))
+        cache.warm(reverse('review-list', args=(pk,)))
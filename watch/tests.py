@@ -1,12 +1,47 @@
+import gzip
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
+from django.utils.http import http_date
 
-from rest_framework import status
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 from rest_framework.authtoken.models import Token
 
-from watch.api import serializers
-from watch import models
+from config import compression, db, metrics, schema
+from watch.api import cache as api_cache, pagination, readers, renderers, serializers, sparse, throttling, views
+from watch import benchmarks, checks, jobs, models, ratings, search, statistics, tasks
+
+
+class QueryCountMixin:
+
+    def assertConstantQueries(self, url, grow, rounds=2):
+        # Warm up per-process caches (e.g. token authentication) before counting.
+        self.client.get(url)
+        counts = []
+        for _ in range(rounds + 1):
+            grow()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(context.captured_queries))
+        self.assertEqual(len(set(counts)), 1, 'Query count grows with rows: %s' % counts)
 
 
 class StreamPlatformTestCaseAdmin(APITestCase):
@@ -180,3 +215,1619 @@ class ReviewTestCase(APITestCase):
     def test_review_user(self):
         response = self.client.get('/watch/reviews/?username' + self.user.username)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class QueryCountTestCase(QueryCountMixin, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="example", password="Password@123")
+        self.token = Token.objects.get(user__username=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.stream = models.StreamPlatform.objects.create(name="Netflix",
+                                                           about="#1 Platform", website="https://www.netflix.com")
+        self.watchlist = models.WatchList.objects.create(platform=self.stream, title="Example Movie",
+                                                         storyline="Example Movie", active=True)
+        self.counter = 0
+
+    def add_catalog_rows(self):
+        self.counter += 1
+        stream = models.StreamPlatform.objects.create(name="Platform %s" % self.counter,
+                                                      about="Tests", website="https://www.tests.com")
+        for i in range(3):
+            models.WatchList.objects.create(platform=stream, title="Movie %s" % i,
+                                            storyline="Story", active=True)
+
+    def add_reviews(self):
+        self.counter += 1
+        for i in range(3):
+            user = User.objects.create_user(username="reviewer%s-%s" % (self.counter, i), password="Password@123")
+            models.Review.objects.create(review_user=user, rating=4, description="Good",
+                                         watchlist=self.watchlist, active=True)
+
+    def test_stream_list_queries(self):
+        self.assertConstantQueries(reverse('stream-platform-list'), self.add_catalog_rows)
+
+    def test_stream_detail_queries(self):
+        def grow():
+            models.WatchList.objects.create(platform=self.stream, title="Another", storyline="Story")
+        self.assertConstantQueries(reverse('stream-platform-detail', args=(self.stream.id,)), grow)
+
+    def test_stream_expand_queries(self):
+        self.assertConstantQueries(reverse('stream-platform-list') + '?expand=watchlist', self.add_catalog_rows)
+
+    def test_watch_list_queries(self):
+        self.assertConstantQueries(reverse('watch-list'), self.add_catalog_rows)
+
+    def test_watch_list2_queries(self):
+        self.assertConstantQueries(reverse('watch-list2'), self.add_catalog_rows)
+
+    def test_review_list_queries(self):
+        self.assertConstantQueries(reverse('review-list', args=(self.watchlist.id,)), self.add_reviews)
+
+
+class RatingTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="example", password="Password@123")
+        self.token = Token.objects.get(user__username=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.stream = models.StreamPlatform.objects.create(name="Netflix",
+                                                           about="#1 Platform", website="https://www.netflix.com")
+        self.watchlist = models.WatchList.objects.create(platform=self.stream, title="Example Movie",
+                                                         storyline="Example Movie", active=True)
+        for i, rating in enumerate([5, 3]):
+            user = User.objects.create_user(username="reviewer%s" % i, password="Password@123")
+            review = models.Review.objects.create(review_user=user, rating=rating, watchlist=self.watchlist)
+            ratings.add_rating(self.watchlist.id, review.rating)
+
+    def assertRatings(self, number_rating, rating_sum, avg_rating):
+        self.watchlist.refresh_from_db()
+        self.assertEqual(self.watchlist.number_rating, number_rating)
+        self.assertEqual(self.watchlist.rating_sum, rating_sum)
+        self.assertAlmostEqual(self.watchlist.avg_rating, avg_rating)
+
+    def test_review_create(self):
+        data = {"rating": 1, "description": "Bad Movie", "active": True}
+        response = self.client.post(reverse('review-create', args=(self.watchlist.id,)), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertRatings(3, 9, 3.0)
+
+    def test_review_update(self):
+        review = models.Review.objects.create(review_user=self.user, rating=4, watchlist=self.watchlist)
+        ratings.add_rating(self.watchlist.id, review.rating)
+
+        data = {"rating": 1, "description": "Changed my mind", "active": True}
+        response = self.client.put(reverse('review-detail', args=(review.id,)), data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRatings(3, 9, 3.0)
+
+    def test_review_delete(self):
+        review = models.Review.objects.create(review_user=self.user, rating=4, watchlist=self.watchlist)
+        ratings.add_rating(self.watchlist.id, review.rating)
+
+        response = self.client.delete(reverse('review-detail', args=(review.id,)))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertRatings(2, 8, 4.0)
+
+    def test_stale_delete_and_update(self):
+        review = models.Review.objects.create(review_user=self.user, rating=4, watchlist=self.watchlist)
+        ratings.add_rating(self.watchlist.id, review.rating)
+        first, second = models.Review.objects.get(pk=review.pk), models.Review.objects.get(pk=review.pk)
+
+        data = {"rating": 2, "description": "Changed my mind", "active": True}
+        self.client.put(reverse('review-detail', args=(review.id,)), data)
+        serializer = serializers.ReviewSerializer(first, data=dict(data, rating=1))
+        serializer.is_valid(raise_exception=True)
+        views.ReviewDetail().perform_update(serializer)
+        self.assertRatings(3, 9, 3.0)
+
+        views.ReviewDetail().perform_destroy(first)
+        with self.assertRaises(exceptions.NotFound):
+            views.ReviewDetail().perform_destroy(second)
+        self.assertRatings(2, 8, 4.0)
+
+    def test_remove_last_rating(self):
+        models.Review.objects.all().delete()
+        ratings.remove_rating(self.watchlist.id, 5)
+        ratings.remove_rating(self.watchlist.id, 3)
+        self.assertRatings(0, 0, 0.0)
+
+    def test_recompute_ratings(self):
+        models.WatchList.objects.update(number_rating=7, rating_sum=1, avg_rating=0.5)
+        empty = models.WatchList.objects.create(platform=self.stream, title="Empty", storyline="Empty",
+                                                avg_rating=2, number_rating=1)
+
+        call_command('recompute_ratings', stdout=StringIO())
+        self.assertRatings(2, 8, 4.0)
+        empty.refresh_from_db()
+        self.assertEqual((empty.number_rating, empty.rating_sum, empty.avg_rating), (0, 0, 0.0))
+
+
+class BenchmarkTestCase(APITestCase):
+
+    def test_ingest(self):
+        out = StringIO()
+        call_command('benchmark', 'ingest', rows=20, repeat=1, stdout=out)
+        self.assertIn('speedup', out.getvalue())
+
+    def test_pagination(self):
+        out = StringIO()
+        call_command('benchmark', 'pagination', rows=50, repeat=1, stdout=out)
+        self.assertIn('cursor', out.getvalue())
+
+    def test_search(self):
+        out = StringIO()
+        call_command('benchmark', 'search', rows=100, repeat=1, stdout=out)
+        self.assertIn('SQLiteBackend', out.getvalue())
+
+    def test_serializers(self):
+        out = StringIO()
+        err = StringIO()
+        call_command('benchmark', 'serializers', rows=30, repeat=1, stdout=out, stderr=err)
+        self.assertIn('values reader', out.getvalue())
+        self.assertEqual(err.getvalue(), '')
+
+    def test_renderers(self):
+        out = StringIO()
+        err = StringIO()
+        call_command('benchmark', 'renderers', rows=20, repeat=1, stdout=out, stderr=err)
+        self.assertIn('watch-list', out.getvalue())
+        self.assertEqual(err.getvalue(), '')
+
+    def test_async_views(self):
+        out = StringIO()
+        call_command('benchmark', 'async-views', rows=20, repeat=1, stdout=out)
+        self.assertIn('async', out.getvalue())
+
+    def test_endpoints(self):
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            call_command('benchmark', 'endpoints', rows=20, repeat=1, save_baseline=path, stdout=out)
+            with open(path) as fh:
+                baseline = json.load(fh)
+            call_command('benchmark', 'endpoints', rows=20, repeat=1, baseline=path, threshold=1000, stdout=out)
+
+        self.assertEqual(baseline['benchmark'], 'endpoints')
+        self.assertEqual(set(baseline['results']['watch-list']), {'throughput', 'p50', 'p99', 'queries'})
+        self.assertIn('review-bulk', baseline['results'])
+        self.assertIn('No regressions', out.getvalue())
+        self.assertFalse(User.objects.filter(username__startswith='bench').exists())
+
+    def test_regressions(self):
+        baseline = {'watch-list': {'throughput': 100.0, 'p50': 0.010, 'p99': 0.020, 'queries': 2}}
+        results = {'watch-list': {'throughput': 90.0, 'p50': 0.011, 'p99': 0.030, 'queries': 3},
+                   'new-endpoint': {'throughput': 1.0, 'p50': 1.0, 'p99': 1.0, 'queries': 1}}
+        found = benchmarks.regressions(baseline, results, threshold=0.25)
+        self.assertEqual([(case, metric) for case, metric, *_ in found], [('watch-list', 'p99'), ('watch-list', 'queries')])
+
+    def test_baseline_requires_results(self):
+        with self.assertRaisesMessage(CommandError, 'does not produce results'):
+            call_command('benchmark', 'throttle', rows=5, repeat=1, save_baseline='unused.json', stdout=StringIO())
+
+    def test_seed_benchmark(self):
+        out = StringIO()
+        call_command('seed_benchmark', platforms=2, watchlists=10, reviews=25, users=1, stdout=out)
+        self.assertEqual(models.WatchList.objects.count(), 10)
+        self.assertEqual(models.Review.objects.count(), 25)
+        self.assertEqual(Token.objects.filter(user__username__startswith='bench').count(), 3)
+        self.assertEqual(models.PlatformStatistics.objects.count(), 2)
+        self.assertEqual(models.PlatformStatistics.objects.aggregate(total=Sum('review_count'))['total'], 25)
+        with self.assertRaises(CommandError):
+            call_command('seed_benchmark', platforms=1, watchlists=1, reviews=1, users=1, stdout=out)
+
+    def test_throttle(self):
+        cache.set('shared', 1)
+        self.addCleanup(cache.clear)
+        out = StringIO()
+        call_command('benchmark', 'throttle', rows=10, repeat=1, stdout=out)
+        self.assertIn('counter', out.getvalue())
+        self.assertEqual(cache.get('shared'), 1)
+
+    def test_review_indexes(self):
+        out = StringIO()
+        call_command('benchmark', 'review-indexes', rows=100, repeat=1, stdout=out)
+        self.assertIn('duplicate review check', out.getvalue())
+        self.assertEqual(models.Review.objects.count(), 0)
+
+
+class ResponseCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        api_cache.reset_stats()
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_user(username="example", password="Password@123")
+        self.token = Token.objects.get(user__username=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.stream = models.StreamPlatform.objects.create(name="Netflix",
+                                                           about="#1 Platform", website="https://www.netflix.com")
+        self.watchlist = models.WatchList.objects.create(platform=self.stream, title="Example Movie",
+                                                         storyline="Example Movie", active=True)
+
+    def test_watch_detail_hit(self):
+        url = reverse('watch-detail', args=(self.watchlist.id,))
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data['title'], 'Example Movie')
+        self.assertEqual(api_cache.stats()['watch-detail'], {'hit': 1, 'miss': 1})
+
+    def test_query_params_in_key(self):
+        url = reverse('watch-list')
+        self.client.get(url)
+        self.client.get(url, {'record': 'abc'})
+        self.assertEqual(api_cache.stats()['watch-list'], {'hit': 0, 'miss': 2})
+
+    def test_scheme_in_key(self):
+        models.WatchList.objects.bulk_create([
+            models.WatchList(platform=self.stream, title="Movie %s" % i, storyline="Story") for i in range(30)
+        ])
+        url = reverse('watch-list')
+        self.client.get(url)
+        response = self.client.get(url, secure=True)
+        self.assertTrue(response.data['next'].startswith('https://'))
+        self.assertEqual(api_cache.stats()['watch-list'], {'hit': 0, 'miss': 2})
+
+    def test_watchlist_update_invalidates(self):
+        url = reverse('watch-detail', args=(self.watchlist.id,))
+        self.client.get(url)
+        self.client.get(reverse('stream-platform-list'), {'expand': 'watchlist'})
+
+        self.watchlist.title = "Renamed Movie"
+        self.watchlist.save()
+
+        self.assertEqual(self.client.get(url).data['title'], 'Renamed Movie')
+        response = self.client.get(reverse('stream-platform-list'), {'expand': 'watchlist'})
+        self.assertEqual(response.data['results'][0]['watchlist'][0]['title'], 'Renamed Movie')
+
+    def test_platform_update_invalidates(self):
+        url = reverse('watch-detail', args=(self.watchlist.id,))
+        self.client.get(url)
+
+        self.stream.name = "Renamed Platform"
+        self.stream.save()
+
+        self.assertEqual(self.client.get(url).data['platform'], 'Renamed Platform')
+
+    def test_review_create_invalidates(self):
+        url = reverse('watch-detail', args=(self.watchlist.id,))
+        self.client.get(url)
+
+        data = {"rating": 4, "description": "Good Movie", "active": True}
+        self.client.post(reverse('review-create', args=(self.watchlist.id,)), data)
+
+        self.assertEqual(self.client.get(url).data['avg_rating'], 4.0)
+
+    def test_other_entries_survive(self):
+        other = models.WatchList.objects.create(platform=self.stream, title="Other Movie", storyline="Other")
+        url = reverse('watch-detail', args=(other.id,))
+        self.client.get(url)
+
+        self.watchlist.title = "Renamed Movie"
+        self.watchlist.save()
+
+        self.client.get(url)
+        self.assertEqual(api_cache.stats()['watch-detail'], {'hit': 1, 'miss': 1})
+
+    def test_stats_admin_only(self):
+        response = self.client.get(reverse('cache-stats'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_requires_shared_backend(self):
+        self.assertEqual([error.id for error in checks.check_response_cache(None)], ['watch.E002'])
+        with self.settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}):
+            self.assertEqual(checks.check_response_cache(None), [])
+        with self.settings(WATCH_RESPONSE_CACHE={'ENABLED': False}):
+            self.assertEqual(checks.check_response_cache(None), [])
+
+
+class ConditionalGetTestCase(APITestCase):
+    def setUp(self):
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_user(username="example", password="Password@123")
+        self.token = Token.objects.get(user__username=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.stream = models.StreamPlatform.objects.create(name="Netflix",
+                                                           about="#1 Platform", website="https://www.netflix.com")
+        self.watchlist = models.WatchList.objects.create(platform=self.stream, title="Example Movie",
+                                                         storyline="Example Movie", active=True)
+        self.review = models.Review.objects.create(review_user=self.user, rating=5, description="Great Movie",
+                                                   watchlist=self.watchlist, active=True)
+
+    def assertNotModified(self, url, last_modified=False):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual('Last-Modified' in response, last_modified)
+
+        etag = response['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        return etag
+
+    def test_watch_detail(self):
+        url = reverse('watch-detail', args=(self.watchlist.id,))
+        etag = self.assertNotModified(url, last_modified=True)
+
+        self.watchlist.title = "Renamed Movie"
+        self.watchlist.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_review_list(self):
+        url = reverse('review-list', args=(self.watchlist.id,))
+        etag = self.assertNotModified(url)
+
+        self.review.delete()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_platform_list(self):
+        url = reverse('stream-platform-list')
+        etag = self.assertNotModified(url)
+
+        self.stream.about = "Changed"
+        self.stream.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_platform_detail(self):
+        self.assertNotModified(reverse('stream-platform-detail', args=(self.stream.id,)))
+
+    def test_platform_list_joins_titles_only_when_expanded(self):
+        url = reverse('stream-platform-list')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertFalse([query for query in queries if 'watch_watchlist' in query['sql']])
+
+        etag = self.client.get(url, {'expand': 'watchlist'})['ETag']
+        self.watchlist.title = "Renamed Movie"
+        self.watchlist.save()
+        self.assertNotEqual(self.client.get(url, {'expand': 'watchlist'})['ETag'], etag)
+
+    def test_if_modified_since(self):
+        url = reverse('watch-detail', args=(self.watchlist.id,))
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_review_list_delete_older(self):
+        other = User.objects.create_user(username="other", password="Password@123")
+        models.Review.objects.create(review_user=other, rating=1, watchlist=self.watchlist)
+        url = reverse('review-list', args=(self.watchlist.id,))
+        self.client.get(url)
+
+        self.review.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_missing_watchlist(self):
+        response = self.client.get(reverse('watch-detail', args=(self.watchlist.id + 100,)))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
+
+
+class PaginationTestCase(APITestCase):
+    def setUp(self):
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_user(username="example", password="Password@123")
+        self.token = Token.objects.get(user__username=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.stream = models.StreamPlatform.objects.create(name="Netflix",
+                                                           about="#1 Platform", website="https://www.netflix.com")
+        models.WatchList.objects.bulk_create([
+            models.WatchList(platform=self.stream, title="Movie %s" % i, storyline="Story") for i in range(7)
+        ])
+        # Identical timestamps must still page deterministically through the id tie-breaker.
+        models.WatchList.objects.update(created=models.WatchList.objects.first().created)
+
+    def collect(self, url, size):
+        titles = []
+        response = self.client.get(url, {'size': size})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), size)
+            titles.extend(item['title'] for item in response.data['results'])
+            if not response.data['next']:
+                return titles
+            response = self.client.get(response.data['next'])
+
+    def test_watch_list_pages(self):
+        titles = self.collect(reverse('watch-list'), 3)
+        self.assertEqual(titles, ["Movie %s" % i for i in range(7)])
+
+    def test_stream_list_pages(self):
+        models.StreamPlatform.objects.create(name="Other", about="Other", website="https://www.other.com")
+        response = self.client.get(reverse('stream-platform-list'), {'size': 1})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_max_page_size(self):
+        response = self.client.get(reverse('watch-list'), {'size': 10000})
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertLessEqual(pagination.WatchListCPagination.max_page_size, 100)
+
+
+class ExportTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='TestAdmin@123')
+        self.token = Token.objects.get(user__username=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.stream = models.StreamPlatform.objects.create(name="Netflix",
+                                                           about="#1 Platform", website="https://www.netflix.com")
+        self.watchlist = models.WatchList.objects.create(platform=self.stream, title="Example Movie",
+                                                         storyline="Example Movie", active=True)
+        self.review = models.Review.objects.create(review_user=self.user, rating=5, description="Great Movie",
+                                                   watchlist=self.watchlist, active=True)
+
+    def export(self, name, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def test_watchlists(self):
+        models.WatchList.objects.create(platform=self.stream, title="Other Movie", storyline="Other")
+        rows = self.export('export-watchlists')
+        self.assertEqual([row['title'] for row in rows], ["Example Movie", "Other Movie"])
+        self.assertEqual(rows[0], json.loads(JSONRenderer().render(
+            serializers.WatchListSerializer(self.watchlist).data)))
+
+    def test_reviews(self):
+        rows = self.export('export-reviews')
+        self.assertEqual(rows[0]['review_user'], 'admin')
+        self.assertEqual(rows[0]['watchlist'], self.watchlist.id)
+
+    def test_since(self):
+        since = self.watchlist.updated.isoformat()
+        other = models.WatchList.objects.create(platform=self.stream, title="Other Movie", storyline="Other")
+        rows = self.export('export-watchlists', since=since)
+        self.assertEqual([row['id'] for row in rows], [other.id])
+
+    def test_invalid_since(self):
+        response = self.client.get(reverse('export-watchlists'), {'since': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_only(self):
+        user = User.objects.create_user(username='user', password='TestUser@123')
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('export-reviews'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BulkTestCase(APITestCase):
+    def setUp(self):
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_superuser(username='admin', password='TestAdmin@123')
+        self.token = Token.objects.get(user__username=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.stream = models.StreamPlatform.objects.create(name="Netflix",
+                                                           about="#1 Platform", website="https://www.netflix.com")
+        self.other = models.StreamPlatform.objects.create(name="Prime",
+                                                          about="#2 Platform", website="https://www.prime.com")
+
+    def test_watchlist_create(self):
+        data = [{"title": "Movie %s" % i, "storyline": "Story", "platform": platform.name, "active": True}
+                for i, platform in enumerate([self.stream, self.other] * 5)]
+        # 5 for the ingest, 7 for rebuilding the statistics of both platforms.
+        with self.assertNumQueries(12):
+            response = self.client.post(reverse('watch-list-bulk'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(models.WatchList.objects.count(), 10)
+        self.assertEqual(response.data[1]['platform'], "Prime")
+
+    def test_watchlist_create_errors(self):
+        data = [
+            {"title": "Good Movie", "storyline": "Story", "platform": "Netflix"},
+            {"title": "Bad Movie", "storyline": "Story", "platform": "Unknown"},
+            {"storyline": "Story", "platform": "Netflix"},
+        ]
+        response = self.client.post(reverse('watch-list-bulk'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('platform', response.data[1])
+        self.assertIn('title', response.data[2])
+        self.assertEqual(models.WatchList.objects.count(), 0)
+
+    def test_watchlist_update(self):
+        first = models.WatchList.objects.create(platform=self.stream, title="First", storyline="Story")
+        second = models.WatchList.objects.create(platform=self.stream, title="Second", storyline="Story")
+        self.client.get(reverse('watch-detail', args=(first.id,)))
+
+        data = [{"id": first.id, "title": "First Renamed"}, {"id": second.id, "platform": "Prime"}]
+        response = self.client.patch(reverse('watch-list-bulk'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.title, "First Renamed")
+        self.assertEqual(second.platform, self.other)
+        response = self.client.get(reverse('watch-detail', args=(first.id,)))
+        self.assertEqual(response.data['title'], "First Renamed")
+
+    def test_watchlist_update_unknown_id(self):
+        response = self.client.patch(reverse('watch-list-bulk'), [{"id": 999, "title": "Ghost"}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('id', response.data[0])
+
+    def test_review_create(self):
+        watchlist = models.WatchList.objects.create(platform=self.stream, title="Movie", storyline="Story")
+        users = [User.objects.create_user(username="reviewer%s" % i, password="Password@123") for i in range(3)]
+        data = [{"watchlist": watchlist.id, "review_user": user.id, "rating": i + 2, "description": "Review"}
+                for i, user in enumerate(users)]
+        data.append(dict(data[0]))
+
+        response = self.client.post(reverse('review-bulk'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[:3], [{}, {}, {}])
+
+        response = self.client.post(reverse('review-bulk'), data[:3], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        watchlist.refresh_from_db()
+        self.assertEqual((watchlist.number_rating, watchlist.rating_sum, watchlist.avg_rating), (3, 9, 3.0))
+
+    def test_admin_only(self):
+        user = User.objects.create_user(username='user', password='TestUser@123')
+        self.client.force_authenticate(user=user)
+        response = self.client.post(reverse('watch-list-bulk'), [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ValuesReaderTestCase(APITestCase):
+    def setUp(self):
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_user(username="example", password="Password@123")
+        self.token = Token.objects.get(user__username=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.stream = models.StreamPlatform.objects.create(name="Netflix",
+                                                           about="#1 Platform", website="https://www.netflix.com")
+        self.watchlist = models.WatchList.objects.create(platform=self.stream, title="Example Movie ☆",
+                                                         storyline="Example Movie", active=False, avg_rating=3.5)
+        for i in range(3):
+            user = User.objects.create_user(username="reviewer%s" % i, password="Password@123")
+            models.Review.objects.create(review_user=user, rating=i + 1, watchlist=self.watchlist,
+                                         description=None if i else "Great Movie")
+
+    def assertSameBytes(self, serializer_class, reader, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        self.assertEqual(JSONRenderer().render(reader.many(reader.values(queryset))), expected)
+
+    def test_watchlist_reader(self):
+        self.assertSameBytes(serializers.WatchListSerializer, readers.watchlist_reader, models.WatchList.objects.all())
+
+    def test_review_reader(self):
+        self.assertSameBytes(serializers.ReviewSerializer, readers.review_reader, models.Review.objects.all())
+
+    def test_review_list_endpoint(self):
+        url = reverse('review-list', args=(self.watchlist.id,))
+        expected = self.client.get(url).content
+        with self.settings(WATCH_FAST_READ=True):
+            cache.clear()
+            with self.assertNumQueries(2):
+                self.assertEqual(self.client.get(url).content, expected)
+
+    def test_watch_list_endpoint(self):
+        url = reverse('watch-list')
+        expected = self.client.get(url).content
+        with self.settings(WATCH_FAST_READ=True):
+            cache.clear()
+            self.assertEqual(self.client.get(url).content, expected)
+
+
+class SearchTestCase(APITestCase):
+    def setUp(self):
+        self.stream = models.StreamPlatform.objects.create(name="Netflix",
+                                                           about="#1 Platform", website="https://www.netflix.com")
+        self.other = models.StreamPlatform.objects.create(name="Prime",
+                                                          about="#2 Platform", website="https://www.prime.com")
+        self.space = models.WatchList.objects.create(platform=self.stream, title="Space Odyssey",
+                                                     storyline="A voyage to Jupiter")
+        self.jupiter = models.WatchList.objects.create(platform=self.other, title="Jupiter Ascending",
+                                                       storyline="Space opera")
+        models.WatchList.objects.create(platform=self.other, title="Cooking Show", storyline="Recipes")
+
+    def search(self, q, **params):
+        response = self.client.get(reverse('watch-search'), dict(q=q, **params))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def titles(self, q):
+        return [item['title'] for item in self.search(q).data['results']]
+
+    def test_ranking(self):
+        self.assertEqual(self.titles("jupiter"), ["Jupiter Ascending", "Space Odyssey"])
+        self.assertEqual(self.titles("space"), ["Space Odyssey", "Jupiter Ascending"])
+
+    def test_prefix_and_all_terms(self):
+        self.assertEqual(self.titles("jup asc"), ["Jupiter Ascending"])
+        self.assertEqual(self.titles("odys"), ["Space Odyssey"])
+        self.assertEqual(self.titles(""), [])
+
+    def test_platform_name(self):
+        self.assertEqual(set(self.titles("prime")), {"Jupiter Ascending", "Cooking Show"})
+
+        self.other.name = "Galaxy"
+        self.other.save()
+        self.assertEqual(self.titles("prime"), [])
+        self.assertEqual(len(self.titles("galaxy")), 2)
+
+    def test_incremental_updates(self):
+        self.space.title = "Moon Landing"
+        self.space.save()
+        self.assertEqual(self.titles("moon"), ["Moon Landing"])
+        self.assertEqual(self.titles("odyssey"), [])
+
+        self.jupiter.delete()
+        self.assertEqual(self.titles("ascending"), [])
+
+    def test_pages(self):
+        response = self.search("prime", size=1)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['previous'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+        self.assertIsNotNone(response.data['previous'])
+
+    def test_fallback_backend(self):
+        backend = search.FallbackBackend()
+        ids = backend.search(search.terms("space"), limit=10, offset=0)
+        self.assertEqual(set(ids), {self.space.id, self.jupiter.id})
+
+
+class ThrottleTestCase(APITestCase):
+
+    class Throttle(throttling.UserCounterThrottle):
+        rate = '3/min'
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.request = SimpleNamespace(user=SimpleNamespace(is_authenticated=True, pk=1))
+
+    def check(self, now):
+        throttle = self.Throttle()
+        throttle.timer = lambda: now
+        return throttle.allow_request(self.request, None), throttle
+
+    @override_settings(WATCH_THROTTLE={'ALGORITHM': throttling.FIXED_WINDOW})
+    def test_fixed_window(self):
+        self.assertEqual([self.check(60)[0] for _ in range(4)], [True, True, True, False])
+        allowed, throttle = self.check(90)
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 30)
+        self.assertTrue(self.check(120)[0])
+
+    @override_settings(WATCH_THROTTLE={'ALGORITHM': throttling.SLIDING_WINDOW})
+    def test_sliding_window(self):
+        for _ in range(3):
+            self.assertTrue(self.check(60)[0])
+
+        # Halfway through the next window, the previous one still counts for 1.5 requests.
+        self.assertTrue(self.check(150)[0])
+        allowed, throttle = self.check(150)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 10)
+        self.assertTrue(self.check(160)[0])
+
+    @override_settings(WATCH_THROTTLE={'ALGORITHM': throttling.FIXED_WINDOW})
+    def test_rejections_are_not_counted(self):
+        for _ in range(10):
+            self.check(60)
+        self.assertEqual(cache.get('throttle_user_1:1'), 3)
+
+    @override_settings(WATCH_THROTTLE={'ALGORITHM': throttling.FIXED_WINDOW})
+    def test_counter_expires_before_decrement(self):
+        for _ in range(3):
+            self.check(60)
+        with mock.patch.object(cache, 'decr', side_effect=ValueError):
+            allowed, throttle = self.check(60)
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.current, 3)
+        self.assertEqual(cache.get('throttle_user_1:1'), 4)
+
+        cache.delete('throttle_user_1:1')
+        with mock.patch.object(cache, 'decr', side_effect=ValueError):
+            throttle = self.Throttle()
+            self.assertEqual(throttle.decrement('throttle_user_1:1', 4), 3)
+        self.assertEqual(cache.get('throttle_user_1:1'), 3)
+
+    @override_settings(WATCH_THROTTLE={'ALGORITHM': throttling.FIXED_WINDOW})
+    def test_concurrent_requests(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: self.check(60)[0], range(50)))
+        self.assertEqual(results.count(True), 3)
+
+    def test_view_retry_after(self):
+        user = User.objects.create_user(username='example', password='Password@123')
+        self.client.force_authenticate(user)
+        platform = models.StreamPlatform.objects.create(name='Netflix', about='#1 Platform', website='https://www.netflix.com')
+        watchlist = models.WatchList.objects.create(platform=platform, title='Example Movie', storyline='Example Movie', active=True)
+        url = reverse('review-create', args=(watchlist.id,))
+
+        self.client.post(url, {'rating': 5, 'description': 'Great', 'active': True})
+        self.client.post(url, {'rating': 5, 'description': 'Great', 'active': True})
+        response = self.client.post(url, {'rating': 5, 'description': 'Great', 'active': True})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+
+class AsyncViewTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_user(username="example", password="Password@123")
+        self.token = Token.objects.get(user__username=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.stream = models.StreamPlatform.objects.create(name="Netflix", about="#1 Platform", website="https://www.netflix.com")
+        self.watchlist = models.WatchList.objects.create(platform=self.stream, title="Example Movie", storyline="Example Movie", active=True)
+        models.Review.objects.create(review_user=self.user, rating=5, description="Great Movie", watchlist=self.watchlist, active=True)
+
+    async def get(self, name, *args, **params):
+        return await self.async_client.get(reverse(name, args=args), params, AUTHORIZATION='Token ' + self.token.key)
+
+    async def test_watch_detail(self):
+        response = await self.get('watch-detail-async', self.watchlist.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['title'], 'Example Movie')
+        self.assertEqual(response.json()['platform'], 'Netflix')
+
+        response = await self.get('watch-detail-async', self.watchlist.id + 100)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_review_list(self):
+        response = await self.get('review-list-async', self.watchlist.id, active='true')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([review['review_user'] for review in response.json()['results']], ['example'])
+
+        response = await self.get('review-list-async', self.watchlist.id, active='false')
+        self.assertEqual(response.json()['results'], [])
+
+    async def test_platform_list(self):
+        response = await self.get('stream-platform-list-async', expand='watchlist')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        platform, = response.json()['results']
+        self.assertEqual(platform['watchlist'][0]['title'], 'Example Movie')
+
+    def test_matches_sync_views(self):
+        pairs = [
+            (reverse('watch-detail', args=(self.watchlist.id,)), reverse('watch-detail-async', args=(self.watchlist.id,))),
+            (reverse('review-list', args=(self.watchlist.id,)), reverse('review-list-async', args=(self.watchlist.id,))),
+            (reverse('stream-platform-list'), reverse('stream-platform-list-async')),
+        ]
+        for sync_url, async_url in pairs:
+            self.assertEqual(self.client.get(async_url).json(), self.client.get(sync_url).json())
+            params = {'expand': 'watchlist'}
+            self.assertEqual(self.client.get(async_url, params).json(), self.client.get(sync_url, params).json())
+
+    async def test_permissions(self):
+        url = reverse('watch-detail-async', args=(self.watchlist.id,))
+        response = await self.async_client.put(url, {'title': 'Changed'}, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = await self.async_client.put(url, {'title': 'Changed'}, content_type='application/json',
+                                               AUTHORIZATION='Token ' + self.token.key)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @mock.patch.object(throttling.ReviewListThrottle, 'rate', '1/min', create=True)
+    async def test_throttle(self):
+        response = await self.get('review-list-async', self.watchlist.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = await self.get('review-list-async', self.watchlist.id)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+
+class StatisticsTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_user(username="example", password="Password@123")
+        self.other_user = User.objects.create_user(username="other", password="Password@123")
+        self.stream = models.StreamPlatform.objects.create(name="Netflix", about="#1 Platform", website="https://www.netflix.com")
+        self.other = models.StreamPlatform.objects.create(name="Prime", about="#2 Platform", website="https://www.prime.com")
+        self.first = models.WatchList.objects.create(platform=self.stream, title="First", storyline="Story")
+        self.second = models.WatchList.objects.create(platform=self.stream, title="Second", storyline="Story")
+
+    def review(self, user, watchlist, rating):
+        self.client.force_authenticate(user)
+        response = self.client.post(reverse('review-create', args=(watchlist.id,)), {'rating': rating, 'description': 'Review'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return models.Review.objects.get(pk=response.data['id'])
+
+    def statistics(self, platform):
+        return models.PlatformStatistics.objects.get(platform=platform)
+
+    def assertRebuildMatches(self, platform):
+        incremental = self.statistics(platform)
+        statistics.rebuild([platform.pk])
+        rebuilt = self.statistics(platform)
+        for field in ('title_count', 'review_count', 'rating_sum', 'avg_rating', 'top_titles'):
+            self.assertEqual(getattr(incremental, field), getattr(rebuilt, field), field)
+
+    def test_titles(self):
+        stats = self.statistics(self.stream)
+        self.assertEqual(stats.title_count, 2)
+        self.assertEqual([title['title'] for title in stats.top_titles], ['Second', 'First'])
+        self.assertEqual(self.statistics(self.other).title_count, 0)
+
+        self.second.platform = self.other
+        self.second.save()
+        self.assertEqual(self.statistics(self.stream).title_count, 1)
+        self.assertEqual(self.statistics(self.other).top_titles[0]['title'], 'Second')
+
+        self.first.active = False
+        self.first.save()
+        self.assertEqual(self.statistics(self.stream).top_titles, [])
+        self.assertRebuildMatches(self.stream)
+
+    def test_reviews(self):
+        self.review(self.user, self.first, 5)
+        self.review(self.other_user, self.first, 3)
+        review = self.review(self.user, self.second, 2)
+
+        stats = self.statistics(self.stream)
+        self.assertEqual(stats.review_count, 3)
+        self.assertEqual(stats.avg_rating, 10 / 3)
+        self.assertEqual([(title['title'], title['avg_rating']) for title in stats.top_titles],
+                         [('First', 4.0), ('Second', 2.0)])
+
+        self.client.force_authenticate(self.user)
+        self.client.put(reverse('review-detail', args=(review.id,)), {'rating': 5, 'description': 'Better'})
+        self.assertEqual(self.statistics(self.stream).top_titles[0]['title'], 'Second')
+
+        self.client.delete(reverse('review-detail', args=(review.id,)))
+        stats = self.statistics(self.stream)
+        self.assertEqual(stats.review_count, 2)
+        self.assertEqual(stats.avg_rating, 4.0)
+        self.assertRebuildMatches(self.stream)
+
+    @override_settings(WATCH_STATISTICS={'TOP_TITLES': 1})
+    def test_top_size(self):
+        self.review(self.user, self.first, 4)
+        self.assertEqual([title['title'] for title in self.statistics(self.stream).top_titles], ['First'])
+
+    def test_delete(self):
+        self.review(self.user, self.first, 4)
+        self.second.delete()
+        self.assertEqual(self.statistics(self.stream).title_count, 1)
+
+        self.stream.delete()
+        self.assertFalse(models.PlatformStatistics.objects.filter(platform=self.stream.pk).exists())
+
+    def test_incremental(self):
+        self.review(self.user, self.first, 4)
+        with CaptureQueriesContext(connection) as queries:
+            models.WatchList.objects.create(platform=self.stream, title="Third", storyline="Story")
+            self.second.storyline = "Changed"
+            self.second.save()
+            self.second.delete()
+        sql = ' '.join(query['sql'] for query in queries).upper()
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('SUM(', sql)
+        self.assertEqual(self.statistics(self.stream).title_count, 2)
+
+        stale = models.WatchList.objects.get(pk=self.first.pk)
+        self.review(self.other_user, self.first, 5)
+        stale.title = "Renamed"
+        stale.save(update_fields=['title'])
+        stats = self.statistics(self.stream)
+        self.assertEqual(stats.top_titles[0]['title'], 'Renamed')
+        self.assertEqual(stats.review_count, 2)
+
+        stale.platform = self.other
+        stale.save(update_fields=['platform'])
+        self.assertEqual(self.statistics(self.other).review_count, 2)
+        self.assertEqual(self.statistics(self.stream).review_count, 0)
+
+    def test_bulk_reviews(self):
+        admin = User.objects.create_superuser(username='admin', password='TestAdmin@123')
+        self.client.force_authenticate(admin)
+        data = [{"watchlist": self.first.id, "review_user": user.id, "rating": 4} for user in (self.user, self.other_user)]
+        response = self.client.post(reverse('review-bulk'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        stats = self.statistics(self.stream)
+        self.assertEqual(stats.review_count, 2)
+        self.assertEqual(stats.top_titles[0]['title'], 'First')
+
+    def test_rebuild_command(self):
+        self.review(self.user, self.first, 4)
+        models.PlatformStatistics.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_statistics', stdout=out)
+        self.assertIn('2 platforms', out.getvalue())
+        self.assertEqual(self.statistics(self.stream).review_count, 1)
+
+    def test_endpoints(self):
+        self.review(self.user, self.first, 4)
+        self.client.force_authenticate(None)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('platform-stats-detail', args=(self.stream.id,)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Netflix')
+        self.assertEqual(response.data['review_count'], 1)
+        self.assertEqual(response.data['top_titles'][0]['title'], 'First')
+
+        response = self.client.get(reverse('platform-stats-list'))
+        self.assertEqual([row['name'] for row in response.data['results']], ['Netflix', 'Prime'])
+
+        response = self.client.post(reverse('platform-stats-list'), {})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class SparseFieldsTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.stream = models.StreamPlatform.objects.create(name="Netflix", about="#1 Platform", website="https://www.netflix.com")
+        self.other = models.StreamPlatform.objects.create(name="Prime", about="#2 Platform", website="https://www.prime.com")
+        for i in range(5):
+            models.WatchList.objects.create(platform=self.stream, title="Movie %s" % i, storyline="Story")
+        models.WatchList.objects.create(platform=self.other, title="Other Movie", storyline="Story")
+
+    def test_platform_list_is_flat_by_default(self):
+        response = self.client.get(reverse('stream-platform-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('watchlist', response.data['results'][0])
+
+        response = self.client.get(reverse('stream-platform-detail', args=(self.stream.id,)))
+        self.assertNotIn('watchlist', response.data)
+
+    def test_expand(self):
+        response = self.client.get(reverse('stream-platform-list'), {'expand': 'watchlist'})
+        first, second = response.data['results']
+        self.assertEqual([watchlist['title'] for watchlist in first['watchlist']], ['Movie %s' % i for i in range(5)])
+        self.assertEqual(first['watchlist'][0]['platform'], 'Netflix')
+        self.assertEqual([watchlist['title'] for watchlist in second['watchlist']], ['Other Movie'])
+
+        response = self.client.get(reverse('stream-platform-detail', args=(self.stream.id,)), {'expand': 'watchlist'})
+        self.assertEqual(len(response.data['watchlist']), 5)
+
+    def test_expand_limit(self):
+        with mock.patch.dict(pagination.PAGINATION, {'NESTED_PAGE_SIZE': 2}):
+            response = self.client.get(reverse('stream-platform-list'), {'expand': 'watchlist'})
+        first, second = response.data['results']
+        self.assertEqual([watchlist['title'] for watchlist in first['watchlist']], ['Movie 0', 'Movie 1'])
+        self.assertEqual(len(second['watchlist']), 1)
+
+    def test_prefetch_watchlists(self):
+        with mock.patch.dict(pagination.PAGINATION, {'NESTED_PAGE_SIZE': 2}), self.assertNumQueries(2):
+            first, second = sparse.prefetch_watchlists(models.StreamPlatform.objects.order_by('id'))
+            self.assertEqual([watchlist.title for watchlist in first.limited_watchlist], ['Movie 0', 'Movie 1'])
+            self.assertIs(second.limited_watchlist[0].platform, second)
+        self.assertEqual(first.watchlist.count(), 5)
+
+    def test_fields(self):
+        response = self.client.get(reverse('stream-platform-list'), {'fields': 'id,name'})
+        self.assertEqual(response.data['results'][0], {'id': self.stream.id, 'name': 'Netflix'})
+
+        response = self.client.get(reverse('stream-platform-list'), {'fields': 'name,watchlist', 'expand': 'watchlist'})
+        self.assertEqual(set(response.data['results'][0]), {'name', 'watchlist'})
+        self.assertIn('storyline', response.data['results'][0]['watchlist'][0])
+
+        response = self.client.get(reverse('watch-list'), {'fields': 'title'})
+        self.assertEqual(response.data['results'][0], {'title': 'Movie 0'})
+
+        watchlist = models.WatchList.objects.get(title='Other Movie')
+        response = self.client.get(reverse('watch-detail', args=(watchlist.id,)), {'fields': 'id,title'})
+        self.assertEqual(response.data, {'id': watchlist.id, 'title': 'Other Movie'})
+
+    @override_settings(WATCH_FAST_READ=True)
+    def test_fields_fast_read(self):
+        response = self.client.get(reverse('watch-list2'), {'fields': 'title,platform'})
+        self.assertEqual(response.data['results'][0], {'title': 'Movie 0', 'platform': 'Netflix'})
+
+
+class MetricsTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.addCleanup(cache.clear)
+
+        self.admin = User.objects.create_superuser(username='admin', password='TestAdmin@123')
+        self.stream = models.StreamPlatform.objects.create(name="Netflix", about="#1 Platform", website="https://www.netflix.com")
+        self.watchlist = models.WatchList.objects.create(platform=self.stream, title="Example Movie", storyline="Story")
+
+    def scrape(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('metrics'))
+        self.client.force_authenticate(None)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        return response.content.decode()
+
+    def sample(self, text, name):
+        for line in text.splitlines():
+            if line.startswith(name + ' '):
+                return float(line.split()[-1])
+        self.fail('%s not found in:\n%s' % (name, text))
+
+    def test_request_metrics(self):
+        self.client.get(reverse('watch-list'))
+        self.client.get(reverse('watch-list'))
+        self.client.get(reverse('watch-detail', args=(self.watchlist.id + 100,)))
+        text = self.scrape()
+
+        self.assertEqual(self.sample(text, 'http_requests_total{view="watch-list",method="GET",status="200"}'), 2)
+        self.assertEqual(self.sample(text, 'http_requests_total{view="watch-detail",method="GET",status="404"}'), 1)
+        self.assertEqual(self.sample(text, 'http_request_duration_seconds_count{view="watch-list"}'), 2)
+        self.assertEqual(self.sample(text, 'http_request_duration_seconds_bucket{view="watch-list",le="+Inf"}'), 2)
+        self.assertGreater(self.sample(text, 'http_request_queries_sum{view="watch-list"}'), 0)
+        self.assertGreater(self.sample(text, 'http_request_query_duration_seconds_sum{view="watch-list"}'), 0)
+        self.assertGreater(self.sample(text, 'http_request_serializer_duration_seconds_sum{view="watch-list"}'), 0)
+        self.assertGreater(self.sample(text, 'http_response_size_bytes_sum{view="watch-list"}'), 0)
+        self.assertEqual(self.sample(text, 'response_cache_requests_total{view="watch-list",outcome="hit"}'), 1)
+        self.assertIn('token_auth_cache_requests_total{outcome="hit"}', text)
+
+    def test_streaming_size(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('export-watchlists'))
+        body = b''.join(response.streaming_content)
+        text = self.scrape()
+        self.assertEqual(self.sample(text, 'http_response_size_bytes_sum{view="export-watchlists"}'), len(body))
+
+    async def test_async_view_queries(self):
+        await self.async_client.get(reverse('watch-detail-async', args=(self.watchlist.id,)))
+        queries = [line for line in metrics.request_queries.collect() if line.startswith('http_request_queries_sum')]
+        self.assertEqual(queries, ['http_request_queries_sum{view="watch-detail-async"} 1'])
+
+    def test_admin_only(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(METRICS={'N_PLUS_ONE': True, 'N_PLUS_ONE_THRESHOLD': 3})
+    def test_n_plus_one(self):
+        for i in range(3):
+            models.Review.objects.create(review_user=User.objects.create_user(username='user%s' % i), rating=4,
+                                         watchlist=self.watchlist)
+        request = SimpleNamespace(resolver_match=None, method='GET', path='/test/')
+        response = SimpleNamespace(status_code=200, streaming=False, content=b'')
+
+        current = metrics.start()
+        for review in models.Review.objects.all():
+            str(review.review_user)
+        with self.assertLogs('config.metrics', 'WARNING') as logs:
+            metrics.finish(request, response, current)
+        self.assertIn('3 queries of shape', logs.output[0])
+        self.assertIn('"auth_user"."id" = %s', logs.output[0])
+        self.assertIn('http_request_repeated_queries_total{view="unmatched"} 1', metrics.render())
+
+    def test_query_shape(self):
+        self.assertEqual(metrics.query_shape("SELECT a FROM t WHERE id IN (%s, %s, %s) AND b = 'x' LIMIT 21"),
+                         "SELECT a FROM t WHERE id IN (...) AND b = ? LIMIT ?")
+
+
+class ReplicaRoutingTestCase(APITestCase):
+    # The replica alias is "default" itself so routed queries still run; a
+    # read routed to it returns "default" instead of None from the router.
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_user(username="example", password="Password@123")
+        self.token = Token.objects.get(user__username=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.stream = models.StreamPlatform.objects.create(name="Netflix", about="#1 Platform", website="https://www.netflix.com")
+        self.watchlist = models.WatchList.objects.create(platform=self.stream, title="Example Movie", storyline="Example Movie", active=True)
+
+        self.reads = []
+        read = db.ReplicaRouter.db_for_read
+
+        def db_for_read(router, model, **hints):
+            alias = read(router, model, **hints)
+            self.reads.append((model._meta.label, alias))
+            return alias
+
+        for patcher in (mock.patch.object(db, 'replicas', return_value=['default']),
+                        mock.patch.object(db.ReplicaRouter, 'db_for_read', db_for_read)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def routed(self):
+        return [label for label, alias in self.reads if alias == 'default']
+
+    def test_safe_watch_request_reads_replica(self):
+        response = self.client.get(reverse('watch-detail', args=(self.watchlist.id,)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('watch.WatchList', self.routed())
+        self.assertNotIn('authtoken.Token', self.routed())
+        self.assertIsNone(db.current())
+
+    def test_streamed_export_reads_replica(self):
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        response = self.client.get(reverse('export-watchlists'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.routed(), [])
+        self.assertEqual(db.current(), 'default')
+
+        rows = b''.join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(row)['title'] for row in rows], [self.watchlist.title])
+        self.assertIn('watch.WatchList', self.routed())
+        self.assertIsNone(db.current())
+        response.close()
+        self.assertIsNone(db.current())
+
+        response = self.client.get(reverse('export-watchlists'))
+        self.assertEqual(next(iter(response.streaming_content)).count(b'\n'), 1)
+        self.assertEqual(db.current(), 'default')
+        response.close()
+        self.assertIsNone(db.current())
+
+    def test_unlisted_views_use_primary(self):
+        routing = dict(settings.DATABASE_ROUTING, VIEW_MODULES=('watch.api.async_views',))
+        with override_settings(DATABASE_ROUTING=routing):
+            response = self.client.get(reverse('watch-detail', args=(self.watchlist.id,)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.routed(), [])
+
+    def test_write_pins_client_to_primary(self):
+        response = self.client.post(reverse('review-create', args=(self.watchlist.id,)),
+                                    {'rating': 5, 'description': 'Great Movie'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.client.get(reverse('review-list', args=(self.watchlist.id,)))
+        self.assertEqual(self.routed(), [])
+
+        other = User.objects.create_user(username="other", password="Password@123")
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.get(user=other).key)
+        self.client.get(reverse('review-list', args=(self.watchlist.id,)))
+        self.assertIn('watch.Review', self.routed())
+
+    async def test_async_view_reads_replica(self):
+        response = await self.async_client.get(reverse('watch-detail-async', args=(self.watchlist.id,)),
+                                               AUTHORIZATION='Token ' + self.token.key)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('watch.WatchList', self.routed())
+
+    def test_router(self):
+        router = db.ReplicaRouter()
+        with mock.patch.object(db, 'replicas', return_value=['replica0']):
+            self.assertEqual(router.db_for_write(models.WatchList), 'default')
+            self.assertFalse(router.allow_migrate('replica0', 'watch'))
+            self.assertIsNone(router.allow_migrate('default', 'watch'))
+
+
+@override_settings(WATCH_JOBS=dict(settings.WATCH_JOBS, ENABLED=True, RETRY_DELAY=60, MAX_ATTEMPTS=2),
+                   WATCH_RESPONSE_CACHE=dict(settings.WATCH_RESPONSE_CACHE, WARM_HOSTS=['testserver']))
+class JobQueueTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        api_cache.reset_stats()
+
+        self.users = [User.objects.create_user(username="user%s" % i, password="Password@123") for i in range(3)]
+        self.stream = models.StreamPlatform.objects.create(name="Netflix", about="#1 Platform", website="https://www.netflix.com")
+        self.watchlist = models.WatchList.objects.create(platform=self.stream, title="Example Movie", storyline="Example Movie")
+
+    def review(self, user, rating):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.get(user=user).key)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('review-create', args=(self.watchlist.id,)), {'rating': rating, 'description': 'Review'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def run_pending(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return jobs.run_pending()
+
+    def test_recompute_is_coalesced_and_off_the_request(self):
+        for user, rating in zip(self.users, (5, 4, 3)):
+            self.review(user, rating)
+
+        self.assertEqual(models.Job.objects.filter(name=ratings.RECOMPUTE).count(), 1)
+        self.watchlist.refresh_from_db()
+        self.assertEqual(self.watchlist.number_rating, 0)
+
+        self.assertEqual(self.run_pending(), 1)
+        self.watchlist.refresh_from_db()
+        self.assertEqual((self.watchlist.number_rating, self.watchlist.avg_rating), (3, 4.0))
+        stats = models.PlatformStatistics.objects.get(platform=self.stream)
+        self.assertEqual((stats.review_count, stats.rating_sum), (3, 12))
+
+        self.assertEqual(list(models.Job.objects.values_list('name', flat=True)), [tasks.WARM])
+        self.assertEqual(self.run_pending(), 1)
+        self.assertFalse(models.Job.objects.exists())
+
+        api_cache.reset_stats()
+        self.client.get(reverse('watch-detail', args=(self.watchlist.id,)), secure=True)
+        response = self.client.get(reverse('review-list', args=(self.watchlist.id,)), secure=True)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(api_cache.stats(), {'watch-detail': {'hit': 1, 'miss': 0}, 'review-list': {'hit': 1, 'miss': 0}})
+
+        # Warmed for https only: absolute URLs in the body carry the scheme.
+        self.client.get(reverse('review-list', args=(self.watchlist.id,)))
+        self.assertEqual(api_cache.stats()['review-list'], {'hit': 1, 'miss': 1})
+
+    def test_enqueued_after_commit(self):
+        self.review(self.users[0], 5)
+        job = models.Job.objects.get()
+
+        # A worker claims the pending job while the next review is still
+        # uncommitted: the recompute cannot see it, so another is queued.
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.get(user=self.users[1]).key)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse('review-create', args=(self.watchlist.id,)), {'rating': 3, 'description': 'Review'})
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(list(models.Job.objects.values_list('pk', flat=True)), [job.pk])
+            self.assertEqual(jobs.claim(10), [job])
+
+        for callback in callbacks:
+            callback()
+        pending = models.Job.objects.get(status=models.Job.PENDING)
+        self.assertEqual((pending.name, pending.payload), (ratings.RECOMPUTE, {'watchlist_id': self.watchlist.id}))
+
+    def test_retry_then_fail(self):
+        handler = mock.Mock(side_effect=ValueError('boom'))
+        jobs.task('test.failing')(handler)
+        self.addCleanup(jobs.TASKS.pop, 'test.failing')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue('test.failing', {'n': 1}, key='failing')
+            jobs.enqueue('test.failing', {'n': 2}, key='failing')
+        with self.assertLogs('watch.jobs', 'ERROR'):
+            self.assertEqual(jobs.run_pending(), 1)
+        handler.assert_called_once_with([{'n': 1}])
+
+        job = models.Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (models.Job.PENDING, 1))
+        self.assertIn('boom', job.last_error)
+        self.assertEqual(jobs.run_pending(), 0)
+
+        models.Job.objects.update(run_after=job.created)
+        with self.assertLogs('watch.jobs', 'ERROR'):
+            jobs.run_pending()
+        self.assertEqual(models.Job.objects.get().status, models.Job.FAILED)
+
+    def test_stale_jobs_requeued(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue('test.stale', key='stale')
+        jobs.claim(10)
+        models.Job.objects.update(updated=self.watchlist.created.replace(year=2000))
+        self.assertEqual(jobs.requeue_stale(), 1)
+        self.assertEqual(models.Job.objects.get().status, models.Job.PENDING)
+
+    def test_run_jobs_command(self):
+        self.review(self.users[0], 5)
+        with self.assertRaisesMessage(CommandError, 'shared cache'):
+            call_command('run_jobs', once=True, stdout=StringIO())
+        self.assertEqual(checks.check_jobs_cache(None)[0].id, 'watch.E001')
+
+        out = StringIO()
+        with mock.patch.object(checks, 'PROCESS_LOCAL_BACKENDS', ()), self.captureOnCommitCallbacks(execute=True):
+            call_command('run_jobs', once=True, stdout=out)
+        # The test transaction never commits, so the warm job is only queued
+        # once the captured callbacks run, after the command has exited.
+        self.assertIn('Processed 1 jobs.', out.getvalue())
+        self.assertEqual(list(models.Job.objects.values_list('name', flat=True)), [tasks.WARM])
+
+
+class RendererTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_superuser(username="admin", password="Password@123")
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.get(user=self.user).key)
+        self.stream = models.StreamPlatform.objects.create(name="Netflix", about="#1 Platform", website="https://www.netflix.com")
+        self.watchlist = models.WatchList.objects.create(platform=self.stream, title="Ünïcode Movie", storyline="Story")
+
+    def test_orjson_matches_json(self):
+        data = {
+            'when': self.watchlist.created,
+            'price': Decimal('1.50'),
+            'text': 'line\u2028separator',
+            1: [1.5, None, True],
+            'nested': serializers.WatchListSerializer(self.watchlist).data,
+        }
+        self.assertEqual(renderers.ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(renderers.ORJSONRenderer().render(data, 'application/json; indent=2'),
+                         JSONRenderer().render(data, 'application/json; indent=2'))
+
+    def test_non_finite_floats(self):
+        data = {'avg_rating': float('nan'), 'scores': [float('inf'), None]}
+        with self.assertRaises(ValueError):
+            renderers.ORJSONRenderer().render(data)
+
+        class Lenient(renderers.ORJSONRenderer):
+            strict = False
+
+        self.assertEqual(Lenient().render(data), b'{"avg_rating":NaN,"scores":[Infinity,null]}')
+        self.assertEqual(renderers.orjson_dumps(data), b'{"avg_rating":NaN,"scores":[Infinity,null]}')
+
+    def test_negotiated_json(self):
+        response = self.client.get(reverse('watch-detail', args=(self.watchlist.id,)))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_json_parse_error(self):
+        response = self.client.post(reverse('watch-list'), '{"title": NaN}', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('JSON parse error', response.data['detail'])
+
+    @skipUnless(renderers.msgpack, 'msgpack is not installed')
+    def test_msgpack(self):
+        response = self.client.get(reverse('watch-detail', args=(self.watchlist.id,)), HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(renderers.msgpack.unpackb(response.content), json.loads(JSONRenderer().render(response.data)))
+
+        data = {'title': 'Packed', 'storyline': 'Story', 'platform': 'Netflix', 'active': True}
+        response = self.client.post(reverse('watch-list'), renderers.msgpack.packb(data), content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(reverse('export-watchlists'), HTTP_ACCEPT='application/msgpack')
+        rows = list(renderers.msgpack.Unpacker(BytesIO(b''.join(response.streaming_content))))
+        self.assertEqual([row['title'] for row in rows], [self.watchlist.title, 'Packed'])
+
+
+class CompressionTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_superuser(username="admin", password="Password@123")
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.get(user=self.user).key)
+        self.stream = models.StreamPlatform.objects.create(name="Netflix", about="#1 Platform", website="https://www.netflix.com")
+        models.WatchList.objects.bulk_create([
+            models.WatchList(platform=self.stream, title="Movie %s" % i, storyline="Storyline %s" % i) for i in range(30)
+        ])
+
+    def test_gzip(self):
+        plain = self.client.get(reverse('watch-list'))
+        response = self.client.get(reverse('watch-list'), HTTP_ACCEPT_ENCODING='deflate, gzip;q=0.8')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_small_and_refused(self):
+        response = self.client.get(reverse('stream-platform-detail', args=(self.stream.id,)), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.client.get(reverse('watch-list'), HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_negotiate(self):
+        self.assertIsNone(compression.negotiate(''))
+        self.assertIsNone(compression.negotiate('*;q=0'))
+        self.assertEqual(compression.negotiate('gzip, unknown').name, 'gzip')
+        self.assertEqual(compression.negotiate('*').name, list(compression.CODECS)[0])
+
+    def test_weak_etag(self):
+        url = reverse('stream-platform-list')
+        response = self.client.get(url, {'expand': 'watchlist'}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response['ETag'].startswith('W/"'))
+
+        etag = response['ETag']
+        response = self.client.get(url, {'expand': 'watchlist'}, HTTP_ACCEPT_ENCODING='gzip',
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        response = self.client.get(url, {'expand': 'watchlist'}, HTTP_IF_NONE_MATCH=etag[2:])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag[2:])
+
+    def test_streaming(self):
+        plain = b''.join(self.client.get(reverse('export-watchlists')).streaming_content)
+        response = self.client.get(reverse('export-watchlists'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), plain)
+
+    def test_cached_variant(self):
+        codec = compression.CODECS['gzip']
+        with mock.patch.object(codec, 'compress', wraps=codec.compress) as compress:
+            first = self.client.get(reverse('watch-list'), HTTP_ACCEPT_ENCODING='gzip')
+            second = self.client.get(reverse('watch-list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first.content, second.content)
+
+        models.WatchList.objects.create(platform=self.stream, title="New", storyline="New")
+        with mock.patch.object(codec, 'compress', wraps=codec.compress) as compress:
+            self.client.get(reverse('watch-list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compress.call_count, 1)
+
+
+class SchemaTestCase(APITestCase):
+
+    def setUp(self):
+        schema.clear()
+        self.addCleanup(schema.clear)
+
+    def test_spec_cached(self):
+        first = self.client.get('/', {'format': 'openapi'})
+        with mock.patch.object(schema.OpenAPISchemaGenerator, 'get_schema') as generate:
+            second = self.client.get('/', {'format': 'openapi'})
+        generate.assert_not_called()
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+        self.assertIn('/watch/list/', json.loads(first.content)['paths'])
+
+        response = self.client.get('/', {'format': 'openapi'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_ui(self):
+        schema.warm()
+        with mock.patch.object(schema.OpenAPISchemaGenerator, 'get_schema') as generate:
+            first = self.client.get('/', HTTP_ACCEPT='text/html')
+            self.assertEqual(first.status_code, status.HTTP_200_OK)
+            self.client.cookies.clear()
+            second = self.client.get('/', HTTP_ACCEPT='text/html')
+            self.assertIn(settings.CSRF_COOKIE_NAME, second.cookies)
+            self.assertNotEqual(first.content, second.content)
+
+            user = User.objects.create_user(username="example", password="Password@123")
+            self.client.force_authenticate(user)
+            self.assertEqual(self.client.get('/redoc/').status_code, status.HTTP_200_OK)
+        generate.assert_not_called()
+
+    def test_build_schema_check(self):
+        call_command('build_schema', '--check', stdout=StringIO())
+
+        with tempfile.NamedTemporaryFile('w', suffix='.yaml', delete=False) as fh:
+            fh.write('swagger: "2.0"\npaths: {}\n')
+        self.addCleanup(os.remove, fh.name)
+        with self.assertRaises(CommandError):
+            call_command('build_schema', '--check', '--output', fh.name, stdout=StringIO())
+
+
+class ReviewFeedTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_user(username="example", password="Password@123")
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.get(user=self.user).key)
+        self.stream = models.StreamPlatform.objects.create(name="Netflix", about="#1 Platform", website="https://www.netflix.com")
+        watchlists = models.WatchList.objects.bulk_create([
+            models.WatchList(platform=self.stream, title="Movie %s" % i, storyline="Storyline %s" % i) for i in range(6)
+        ])
+        self.users = [User.objects.create_user(username="friend%s" % i, password="Password@123") for i in range(3)]
+        for i, user in enumerate(self.users):
+            for watchlist in watchlists[:i * 2 + 1]:
+                models.Review.objects.create(review_user=user, rating=i + 1, watchlist=watchlist)
+
+    def test_user_feed(self):
+        user = self.users[2]
+        by_id = self.client.get(reverse('user-review-detail'), {'user': user.pk, 'size': 2})
+        self.assertEqual(by_id.status_code, status.HTTP_200_OK)
+        expected = list(models.Review.objects.filter(review_user=user).order_by('-id').values_list('pk', flat=True))
+        self.assertEqual([review['id'] for review in by_id.data['results']], expected[:2])
+        self.assertEqual({review['review_user'] for review in by_id.data['results']}, {user.username})
+        self.assertIsNotNone(by_id.data['next'])
+
+        by_name = self.client.get(reverse('user-review-detail'), {'username': user.username, 'size': 2})
+        self.assertEqual(by_name.data['results'], by_id.data['results'])
+        with self.settings(WATCH_FAST_READ=True):
+            self.assertEqual(self.client.get(reverse('user-review-detail'), {'user': user.pk, 'size': 2}).content,
+                             by_id.content)
+
+        with self.assertNumQueries(2):
+            self.client.get(reverse('user-review-detail'), {'user': user.pk})
+
+    def test_user_feed_unknown(self):
+        response = self.client.get(reverse('user-review-detail'), {'username': 'nobody'})
+        self.assertEqual(response.data['results'], [])
+
+        response = self.client.get(reverse('user-review-detail'), {'user': 'nobody'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch(self):
+        ids = '%s,999999,%s,%s' % (self.users[2].pk, self.users[0].pk, self.users[2].pk)
+        self.client.get(reverse('user-review-batch'), {'ids': ids})
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('user-review-batch'), {'ids': ids, 'limit': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual([entry['user'] for entry in response.data['results']], [self.users[2].pk, self.users[0].pk])
+        self.assertEqual(response.data['missing'], [999999])
+        latest, first = response.data['results']
+        expected = list(models.Review.objects.filter(review_user=self.users[2]).order_by('-id').values_list('pk', flat=True))
+        self.assertEqual([review['id'] for review in latest['reviews']], expected[:2])
+        self.assertEqual([review['review_user'] for review in first['reviews']], [self.users[0].username])
+
+        detail = self.client.get(reverse('review-detail', args=(expected[0],)))
+        self.assertEqual(latest['reviews'][0], detail.data)
+
+    def test_batch_invalid(self):
+        self.assertEqual(self.client.get(reverse('user-review-batch')).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse('user-review-batch'), {'ids': '1,x'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        with self.settings(WATCH_REVIEW_FEED={'MAX_USERS': 1}):
+            response = self.client.get(reverse('user-review-batch'), {'ids': '1,2'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class WatchBatchTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        api_cache.reset_stats()
+        self.addCleanup(api_cache.reset_stats)
+
+        self.user = User.objects.create_superuser(username="admin", password="Password@123")
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.get(user=self.user).key)
+        self.stream = models.StreamPlatform.objects.create(name="Netflix", about="#1 Platform", website="https://www.netflix.com")
+        self.watchlists = models.WatchList.objects.bulk_create([
+            models.WatchList(platform=self.stream, title="Movie %s" % i, storyline="Storyline %s" % i) for i in range(5)
+        ])
+
+    def test_batch(self):
+        ids = [self.watchlists[3].pk, 999999, self.watchlists[0].pk, self.watchlists[3].pk]
+        response = self.client.get(reverse('watch-batch'), {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [ids[0], ids[2]])
+        self.assertEqual(response.data['missing'], [999999])
+
+        detail = self.client.get(reverse('watch-detail', args=(ids[0],)))
+        self.assertEqual(response.data['results'][0], detail.data)
+
+        response = self.client.post(reverse('watch-batch'), {'ids': ids}, format='json')
+        self.assertEqual([item['id'] for item in response.data['results']], [ids[0], ids[2]])
+
+    def test_shares_detail_cache(self):
+        self.client.get(reverse('watch-detail', args=(self.watchlists[0].pk,)))
+        ids = ','.join(str(watchlist.pk) for watchlist in self.watchlists)
+
+        with self.assertNumQueries(1):
+            self.client.get(reverse('watch-batch'), {'ids': ids})
+        self.assertEqual(api_cache.stats()['watch-batch'], {api_cache.HIT: 1, api_cache.MISS: 4})
+
+        with self.assertNumQueries(0):
+            first = self.client.get(reverse('watch-batch'), {'ids': ids})
+        self.assertEqual(api_cache.stats()['watch-batch'], {api_cache.HIT: 6, api_cache.MISS: 4})
+
+        self.watchlists[1].title = 'Renamed'
+        self.watchlists[1].save()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('watch-batch'), {'ids': ids})
+        self.assertEqual(response.data['results'][1]['title'], 'Renamed')
+        self.assertEqual(response.data['results'][2], first.data['results'][2])
+
+    def test_post_does_not_pin(self):
+        with mock.patch.object(db, 'pin') as pin:
+            response = self.client.post(reverse('watch-batch'), {'ids': [self.watchlists[0].pk]}, format='json')
+            self.client.post(reverse('watch-list-bulk'), [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(pin.call_count, 1)
+
+    def test_invalid(self):
+        self.assertEqual(self.client.get(reverse('watch-batch')).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(reverse('watch-batch'), {'ids': 'x'}, format='json').status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        with self.settings(WATCH_MULTI_GET_MAX_IDS=2):
+            response = self.client.get(reverse('watch-batch'), {'ids': '1,2,3'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)